@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Austauschbares Archiv-Backend
+Duplikat-Check, Artikel-Archiv und Run-Statistiken laufen über ein Backend:
+- 'supabase': newsletter_articles_archive / newsletter_runs in Supabase (wie bisher)
+- 'sqlite':   dieselben Tabellen in einer lokalen SQLite-Datei
+              (Index auf URL und first_sent_date → Lookups in Mikrosekunden)
+- 'speicher': SQLite im Arbeitsspeicher (Offline-Läufe, Benchmarks - nichts bleibt übrig)
+- 'auto':     Supabase wenn konfiguriert, sonst SQLite (Standard)
+- 'aus':      kein Archiv, kein Duplikat-Check
+
+Ein Backend ist ein Dict mit den Funktionen
+    finde_artikel(article_url) → Liste archivierter Zeilen mit dieser URL
+    speichere_artikel(daten)   → Zeile für newsletter_articles_archive einfügen
+    speichere_run(daten)       → Zeile für newsletter_runs einfügen
+Fehler werden nicht abgefangen - das übernimmt der Aufrufer.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from supabase_stream import streame_archiv
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+ARCHIV_BACKEND = os.environ.get('ARCHIV_BACKEND', 'auto')
+ARCHIV_SQLITE_DB = os.environ.get('ARCHIV_SQLITE_DB', 'artikel_archiv.sqlite')
+# Supabase: Duplikat-Spalten der letzten ARCHIV_VORLADEN_TAGE einmal seitenweise laden (opt-in).
+# Standard ist eine indizierte Abfrage pro Artikel - das ganze Archiv wächst jeden Tag
+ARCHIV_VORLADEN = os.environ.get('ARCHIV_VORLADEN', '0') == '1'
+ARCHIV_VORLADEN_TAGE = int(os.environ.get('ARCHIV_VORLADEN_TAGE', '14'))
+
+ARCHIV_TABELLE = 'newsletter_articles_archive'
+RUNS_TABELLE = 'newsletter_runs'
+
+ARCHIV_SPALTEN = ['article_url', 'article_title', 'source', 'region', 'published_date',
+                  'first_sent_date', 'relevance_score', 'summary']
+RUNS_SPALTEN = ['run_date', 'total_articles_processed', 'relevant_articles_found', 'new_articles_sent',
+                'duplicate_articles_filtered', 'sources_checked', 'run_status', 'error_message', 'timing', 'llm_verbrauch']
+# Später ergänzte Spalten (Migration: supabase_runs_telemetrie.sql) - fehlen sie in
+# Supabase noch, wird der Run ohne sie gespeichert statt gar nicht
+RUNS_OPTIONALE_SPALTEN = ['timing', 'llm_verbrauch']
+
+# Spalten, die pruefe_auf_duplikat() braucht
+DUPLIKAT_SPALTEN = 'article_url, article_title, published_date, first_sent_date'
+
+# Lokales Schema - gleiche Tabellen wie in Supabase (auch für supabase_sync.py)
+ARCHIV_SCHEMA = """
+CREATE TABLE IF NOT EXISTS newsletter_articles_archive (
+    id INTEGER PRIMARY KEY,
+    article_url TEXT NOT NULL,
+    article_title TEXT,
+    source TEXT,
+    region TEXT,
+    published_date TEXT,
+    first_sent_date TEXT,
+    relevance_score REAL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_archiv_url ON newsletter_articles_archive (article_url);
+CREATE INDEX IF NOT EXISTS idx_archiv_datum ON newsletter_articles_archive (first_sent_date);
+CREATE TABLE IF NOT EXISTS newsletter_runs (
+    id INTEGER PRIMARY KEY,
+    run_date TEXT NOT NULL,
+    total_articles_processed INTEGER,
+    relevant_articles_found INTEGER,
+    new_articles_sent INTEGER,
+    duplicate_articles_filtered INTEGER,
+    sources_checked TEXT,       -- JSON-Array
+    run_status TEXT,
+    error_message TEXT,
+    timing TEXT,                -- JSON, newsletter_trace.trace_zusammenfassung()
+    llm_verbrauch TEXT          -- JSON, claude_verbrauch.verbrauch_zusammenfassung()
+);
+CREATE INDEX IF NOT EXISTS idx_runs_datum ON newsletter_runs (run_date);
+"""
+
+
+# ============================================================================
+# HELPER
+# ============================================================================
+
+def sqlite_wert(wert):
+    """Listen/Dicts (z.B. sources_checked) als JSON-Text speichern"""
+    return json.dumps(wert, ensure_ascii=False) if isinstance(wert, (list, dict)) else wert
+
+
+def migriere_archiv_schema(conn):
+    """
+    ARCHIV_SCHEMA anlegen und in bestehenden Datenbanken fehlende Runs-Spalten ergänzen
+    Der früher gepflegte Titel-Hash-Index wurde nie abgefragt und wird entfernt
+    (die Spalte title_hash bleibt in alten Dateien, ungenutzt)
+    """
+    conn.executescript(ARCHIV_SCHEMA)
+    conn.execute('DROP INDEX IF EXISTS idx_archiv_titel')
+    vorhanden = {zeile[1] for zeile in conn.execute(f'PRAGMA table_info({RUNS_TABELLE})')}
+    for spalte in RUNS_OPTIONALE_SPALTEN:
+        if spalte not in vorhanden:
+            conn.execute(f'ALTER TABLE {RUNS_TABELLE} ADD COLUMN {spalte} TEXT')
+    conn.commit()
+
+
+def oeffne_archiv_db(pfad=ARCHIV_SQLITE_DB):
+    """Öffnet (und initialisiert) eine lokale Archiv-Datenbank"""
+    conn = sqlite3.connect(pfad, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    migriere_archiv_schema(conn)
+    return conn
+
+
+def fuege_archivzeile_ein(conn, daten, ersetzen=False):
+    """
+    Schreibt eine Zeile nach newsletter_articles_archive
+    ersetzen=True: Upsert über daten['id'] (Spiegel aus Supabase)
+    """
+    spalten = (['id'] if ersetzen else []) + ARCHIV_SPALTEN
+    werte = ([daten['id']] if ersetzen else []) + [sqlite_wert(daten.get(s)) for s in ARCHIV_SPALTEN]
+    conn.execute(
+        f"INSERT {'OR REPLACE ' if ersetzen else ''}INTO {ARCHIV_TABELLE} ({', '.join(spalten)}) "
+        f"VALUES ({', '.join('?' * len(spalten))})",
+        werte
+    )
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+def supabase_backend(client, vorladen=ARCHIV_VORLADEN, vorladen_tage=ARCHIV_VORLADEN_TAGE):
+    """
+    Archiv in Supabase (newsletter_articles_archive / newsletter_runs)
+    Standard: eine indizierte Abfrage pro URL.
+    vorladen: beim ersten Duplikat-Check werden URL, Titel und Daten der in den
+    letzten vorladen_tage Tagen versendeten Artikel per streame_archiv() geladen
+    (seitenweise, kein Row-Limit). Feeds listen meist noch die Artikel der
+    Vortage - diese Treffer kosten dann keinen Netzwerk-Aufruf. URLs außerhalb
+    des Fensters werden weiter pro URL abgefragt, ebenso alles, wenn das Laden
+    fehlschlägt. Bei einem Treffer zählen nur die Zeilen im Fenster.
+    """
+    vorgeladen = {'urls': None, 'versucht': False}
+    sperre = threading.Lock()
+
+    def lade_archiv():
+        with sperre:
+            if not vorgeladen['versucht']:
+                vorgeladen['versucht'] = True
+                try:
+                    urls = {}
+                    seit = date.today() - timedelta(days=vorladen_tage)
+                    for zeile in streame_archiv(client, DUPLIKAT_SPALTEN, seit=seit.isoformat()):
+                        urls.setdefault(zeile['article_url'], []).append(zeile)
+                    vorgeladen['urls'] = urls
+                    print(f"📦 Archiv vorgeladen (seit {seit}): "
+                          f"{sum(len(z) for z in urls.values())} Artikel, {len(urls)} URLs")
+                except Exception as e:
+                    print(f"⚠️ Archiv nicht vorgeladen - Duplikat-Check pro URL: {e}")
+            return vorgeladen['urls']
+
+    def finde_artikel(article_url):
+        urls = lade_archiv() if vorladen else None
+        if urls is not None and article_url in urls:
+            return list(urls[article_url])
+        return client.table(ARCHIV_TABELLE).select(DUPLIKAT_SPALTEN).eq('article_url', article_url).execute().data
+
+    def speichere_artikel(daten):
+        client.table(ARCHIV_TABELLE).insert(daten).execute()
+        with sperre:
+            if vorgeladen['urls'] is not None:
+                vorgeladen['urls'].setdefault(daten['article_url'], []).append(
+                    {s: daten.get(s) for s in DUPLIKAT_SPALTEN.split(', ')})
+
+    def speichere_run(daten):
+        try:
+            client.table(RUNS_TABELLE).insert(daten).execute()
+        except Exception as e:
+            ohne = {k: v for k, v in daten.items() if k not in RUNS_OPTIONALE_SPALTEN}
+            if ohne == daten:
+                raise
+            print(f"⚠️ newsletter_runs ohne {', '.join(RUNS_OPTIONALE_SPALTEN)} gespeichert "
+                  f"(supabase_runs_telemetrie.sql ausführen): {e}")
+            client.table(RUNS_TABELLE).insert(ohne).execute()
+
+    return {'name': 'supabase', 'finde_artikel': finde_artikel,
+            'speichere_artikel': speichere_artikel, 'speichere_run': speichere_run}
+
+
+def sqlite_backend(pfad=ARCHIV_SQLITE_DB):
+    """
+    Archiv in einer lokalen SQLite-Datei - eine Verbindung für den ganzen Lauf,
+    nutzbar aus mehreren Threads (Pipeline-Stufen)
+    """
+    conn = oeffne_archiv_db(pfad)
+    sperre = threading.Lock()
+
+    def finde_artikel(article_url):
+        with sperre:
+            return [dict(zeile) for zeile in conn.execute(
+                f'SELECT {DUPLIKAT_SPALTEN} FROM {ARCHIV_TABELLE} WHERE article_url = ?', (article_url,)
+            )]
+
+    def speichere_artikel(daten):
+        with sperre, conn:
+            fuege_archivzeile_ein(conn, daten)
+
+    def speichere_run(daten):
+        with sperre, conn:
+            conn.execute(
+                f"INSERT INTO {RUNS_TABELLE} ({', '.join(RUNS_SPALTEN)}) "
+                f"VALUES ({', '.join('?' * len(RUNS_SPALTEN))})",
+                [sqlite_wert(daten.get(s)) for s in RUNS_SPALTEN]
+            )
+
+    return {'name': f'sqlite ({pfad})', 'finde_artikel': finde_artikel,
+            'speichere_artikel': speichere_artikel, 'speichere_run': speichere_run}
+
+
+def waehle_archiv_backend(supabase_client=None, modus=ARCHIV_BACKEND, pfad=ARCHIV_SQLITE_DB):
+    """
+    Liefert das Archiv-Backend für den Modus ('auto', 'supabase', 'sqlite', 'speicher', 'aus')
+    Returns: None wenn kein Archiv genutzt werden soll/kann
+    """
+    if modus == 'aus':
+        return None
+    if modus == 'supabase' or (modus == 'auto' and supabase_client is not None):
+        if supabase_client is None:
+            print("⚠️ ARCHIV_BACKEND=supabase, aber Supabase ist nicht verfügbar - Archiv deaktiviert")
+            return None
+        return supabase_backend(supabase_client)
+    if modus == 'speicher':
+        return sqlite_backend(':memory:')
+    if modus in ('sqlite', 'auto'):
+        try:
+            return sqlite_backend(pfad)
+        except sqlite3.Error as e:
+            print(f"⚠️ Lokales Archiv nicht verfügbar ({pfad}): {e}")
+            return None
+    print(f"⚠️ Unbekanntes ARCHIV_BACKEND '{modus}' - Archiv deaktiviert")
+    return None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Claude-Aufrufe mit Token-, Kosten- und Latenz-Abrechnung
+Jeder Aufruf (Bewertung, Zusammenfassung) läuft über claude_anfrage():
+- Input-/Output-Tokens aus dem usage-Block der Antwort, Latenz, Versuche, Modell
+- Wiederholung bei vorübergehenden Fehlern (429, 5xx, 529 overloaded, Timeout)
+- Optionales Tages-Budget (CLAUDE_TAGESBUDGET_TOKENS): ist es erschöpft, wird
+  der Aufruf übersprungen und der Aufrufer nutzt seinen Fallback
+- Summen pro Stufe und pro Lauf → newsletter_runs.llm_verbrauch
+
+    starte_abrechnung(vorher_tokens, speichere=...)   # einmal pro Lauf
+    text = claude_anfrage('bewerten', prompt, max_tokens=1000, timeout=60, api_key=KEY)
+    verbrauch_zusammenfassung()
+"""
+
+import os
+import time
+import threading
+
+import requests
+
+from newsletter_dienste import http_post, CLAUDE_API_URL
+from newsletter_trace import span
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+CLAUDE_MODELL = os.environ.get('CLAUDE_MODELL', 'claude-opus-4-8')
+CLAUDE_API_VERSION = '2023-06-01'
+CLAUDE_VERSUCHE = int(os.environ.get('CLAUDE_VERSUCHE', '3'))
+CLAUDE_WARTEZEIT = float(os.environ.get('CLAUDE_WARTEZEIT', '2'))  # Sekunden, verdoppelt pro Versuch
+# Input + Output Tokens pro Tag über alle Läufe (0 = kein Budget)
+CLAUDE_TAGESBUDGET_TOKENS = int(os.environ.get('CLAUDE_TAGESBUDGET_TOKENS', '0'))
+
+# USD pro Million Tokens (Input, Output) nach Modell-Präfix - Listenpreise,
+# für ein bestimmtes Modell über CLAUDE_PREIS_INPUT / CLAUDE_PREIS_OUTPUT überschreibbar
+PREISE_USD_PRO_MTOK = {
+    'claude-opus': (5.0, 25.0),
+    'claude-sonnet': (3.0, 15.0),
+    'claude-haiku': (1.0, 5.0),
+}
+VORUEBERGEHENDE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+_abrechnung = {
+    'aufrufe': [],
+    'vorher_tokens': 0,
+    'speichere': None,
+    'sperre': threading.Lock(),
+}
+
+
+# ============================================================================
+# ABRECHNUNG
+# ============================================================================
+
+def starte_abrechnung(vorher_tokens=0, speichere=None):
+    """
+    Neue Abrechnung für einen Lauf
+    vorher_tokens: heute schon verbrauchte Tokens (z.B. aus einem abgebrochenen Lauf)
+    speichere(tokens_heute): wird nach jedem Aufruf mit der Tagessumme aufgerufen
+    """
+    with _abrechnung['sperre']:
+        _abrechnung['aufrufe'] = []
+        _abrechnung['vorher_tokens'] = vorher_tokens or 0
+        _abrechnung['speichere'] = speichere
+
+
+def preis_usd(modell, input_tokens, output_tokens):
+    preise = next((p for praefix, p in PREISE_USD_PRO_MTOK.items() if modell.startswith(praefix)), (0.0, 0.0))
+    preis_input = float(os.environ.get('CLAUDE_PREIS_INPUT', preise[0]))
+    preis_output = float(os.environ.get('CLAUDE_PREIS_OUTPUT', preise[1]))
+    return (input_tokens * preis_input + output_tokens * preis_output) / 1_000_000
+
+
+def tokens_heute():
+    with _abrechnung['sperre']:
+        return _abrechnung['vorher_tokens'] + sum(a['input_tokens'] + a['output_tokens'] for a in _abrechnung['aufrufe'])
+
+
+def _buche(aufruf):
+    with _abrechnung['sperre']:
+        _abrechnung['aufrufe'].append(aufruf)
+        speichere = _abrechnung['speichere']
+    if speichere and aufruf['input_tokens'] + aufruf['output_tokens']:
+        speichere(tokens_heute())
+
+
+def _summe(aufrufe):
+    return {
+        'aufrufe': len(aufrufe),
+        'input_tokens': sum(a['input_tokens'] for a in aufrufe),
+        'output_tokens': sum(a['output_tokens'] for a in aufrufe),
+        'kosten_usd': round(sum(a['kosten_usd'] for a in aufrufe), 4),
+        'latenz_s': round(sum(a['latenz_ms'] for a in aufrufe) / 1000, 2),
+        'max_latenz_s': round(max((a['latenz_ms'] for a in aufrufe), default=0) / 1000, 2),
+        'wiederholungen': sum(a['versuche'] - 1 for a in aufrufe if a['versuche']),
+        'fehler': sum(1 for a in aufrufe if a['status'] not in ('ok', 'budget')),
+        'budget_uebersprungen': sum(1 for a in aufrufe if a['status'] == 'budget'),
+    }
+
+
+def verbrauch_zusammenfassung(budget=CLAUDE_TAGESBUDGET_TOKENS):
+    """Summen für den Lauf und pro Stufe (für newsletter_runs.llm_verbrauch)"""
+    with _abrechnung['sperre']:
+        aufrufe = list(_abrechnung['aufrufe'])
+    stufen = {}
+    for aufruf in aufrufe:
+        stufen.setdefault(aufruf['stufe'], []).append(aufruf)
+    return {
+        **_summe(aufrufe),
+        'modelle': sorted({a['modell'] for a in aufrufe}),
+        'stufen': {stufe: _summe(liste) for stufe, liste in stufen.items()},
+        'tokens_heute': tokens_heute(),
+        'tagesbudget_tokens': budget or None,
+    }
+
+
+def drucke_verbrauch(zusammenfassung):
+    print(f"\n💰 CLAUDE-VERBRAUCH ({', '.join(zusammenfassung['modelle']) or '-'})")
+    print("="*70)
+    for stufe, werte in list(zusammenfassung['stufen'].items()) + [('gesamt', zusammenfassung)]:
+        print(f"   {stufe:<16}{werte['aufrufe']:>5} Aufrufe {werte['input_tokens']:>9} in {werte['output_tokens']:>7} out "
+              f"${werte['kosten_usd']:>7.3f} {werte['latenz_s']:>7.1f}s  {werte['wiederholungen']} Wdh. {werte['fehler']} Fehler")
+    if zusammenfassung['tagesbudget_tokens']:
+        print(f"   Tagesbudget: {zusammenfassung['tokens_heute']}/{zusammenfassung['tagesbudget_tokens']} Tokens"
+              + (f", {zusammenfassung['budget_uebersprungen']} Aufrufe übersprungen"
+                 if zusammenfassung['budget_uebersprungen'] else ''))
+
+
+# ============================================================================
+# AUFRUF
+# ============================================================================
+
+def _wartezeit(antwort, versuch):
+    try:
+        return float(antwort.headers.get('retry-after'))
+    except (TypeError, ValueError, AttributeError):
+        return CLAUDE_WARTEZEIT * 2 ** (versuch - 1)
+
+
+def claude_anfrage(stufe, prompt, max_tokens, timeout, api_key, modell=CLAUDE_MODELL,
+                   versuche=CLAUDE_VERSUCHE, budget=CLAUDE_TAGESBUDGET_TOKENS):
+    """
+    Ein Claude-Aufruf mit Abrechnung
+    Returns: Antwort-Text oder None (Fehler, Budget erschöpft) - Meldung wird ausgegeben
+    """
+    aufruf = {'stufe': stufe, 'modell': modell, 'input_tokens': 0, 'output_tokens': 0,
+              'kosten_usd': 0.0, 'latenz_ms': 0.0, 'versuche': 0, 'status': 'ok'}
+
+    # Grobe Schätzung (~4 Zeichen pro Token) plus maximale Antwortlänge
+    if budget and tokens_heute() + len(prompt) // 4 + max_tokens > budget:
+        print(f"       💸 Claude-Tagesbudget erschöpft ({tokens_heute()}/{budget} Tokens) - {stufe} übersprungen")
+        aufruf['status'] = 'budget'
+        _buche(aufruf)
+        return None
+
+    with span('llm', stufe, modell=modell) as aktuell:
+        start = time.perf_counter()
+        text = None
+        antwort = None
+        for versuch in range(1, versuche + 1):
+            aufruf['versuche'] = versuch
+            try:
+                antwort = http_post(
+                    CLAUDE_API_URL,
+                    headers={
+                        'x-api-key': api_key,
+                        'anthropic-version': CLAUDE_API_VERSION,
+                        'content-type': 'application/json'
+                    },
+                    json={
+                        'model': modell,
+                        'max_tokens': max_tokens,
+                        'messages': [{'role': 'user', 'content': prompt}]
+                    },
+                    timeout=timeout
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                aufruf['status'] = f"fehler: {str(e)[:100]}"
+                if versuch < versuche:
+                    print(f"       ⏳ Claude API nicht erreichbar - neuer Versuch {versuch + 1}/{versuche}")
+                    time.sleep(CLAUDE_WARTEZEIT * 2 ** (versuch - 1))
+                continue
+
+            if antwort.status_code == 200:
+                try:
+                    daten = antwort.json()
+                    usage = daten.get('usage') or {}
+                    aufruf['input_tokens'] = usage.get('input_tokens', 0)
+                    aufruf['output_tokens'] = usage.get('output_tokens', 0)
+                    aufruf['modell'] = daten.get('model') or modell
+                    text = daten['content'][0]['text']
+                    aufruf['status'] = 'ok'
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    aufruf['status'] = f"fehler: ungültige Antwort ({e})"
+                break
+
+            aufruf['status'] = f"http_{antwort.status_code}"
+            if antwort.status_code not in VORUEBERGEHENDE_STATUS or versuch == versuche:
+                break
+            print(f"       ⏳ Claude API {antwort.status_code} - neuer Versuch {versuch + 1}/{versuche}")
+            time.sleep(_wartezeit(antwort, versuch))
+
+        aufruf['latenz_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        aufruf['kosten_usd'] = preis_usd(aufruf['modell'], aufruf['input_tokens'], aufruf['output_tokens'])
+        aktuell['status'] = aufruf['status'] if aufruf['status'] == 'ok' else 'fehler'
+        aktuell['attribute'].update({k: aufruf[k] for k in ('input_tokens', 'output_tokens', 'versuche', 'kosten_usd')})
+    _buche(aufruf)
+
+    if text is None:
+        print(f"❌ Claude API Fehler ({stufe}): {aufruf['status']}")
+        if antwort is not None and antwort.status_code != 200:
+            print(f"       📄 Response: {antwort.text[:200]}")
+    return text
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - SMTP-Versand mit Verbindungs-Pool
+Statt pro Empfänger eine neue TLS-Verbindung + Login:
+- Wenige Verbindungen (SMTP_VERBINDUNGEN) werden für viele Nachrichten wiederverwendet
+- Nach SMTP_MAX_PRO_VERBINDUNG Nachrichten wird neu verbunden (Provider-Limits)
+- Vorübergehende Fehler (Verbindungsabbruch, 4xx) landen erneut in der Warteschlange
+- Host/Port/SSL konfigurierbar → lokal gegen einen SMTP-Stand-in testbar, z.B.
+    SMTP_HOST=localhost SMTP_PORT=1025 SMTP_SSL=0 python medien_newsletter_web.py
+- EMAIL_AUSGABE_VERZEICHNIS gesetzt → gar kein SMTP, jede Email als .eml-Datei (Offline-Modus)
+"""
+
+import os
+import re
+import ssl
+import time
+import queue
+import smtplib
+import threading
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '465'))
+SMTP_SSL = os.environ.get('SMTP_SSL', '1') != '0'
+SMTP_TIMEOUT = 30
+
+SMTP_VERBINDUNGEN = int(os.environ.get('SMTP_VERBINDUNGEN', '2'))
+SMTP_MAX_PRO_VERBINDUNG = int(os.environ.get('SMTP_MAX_PRO_VERBINDUNG', '50'))
+SMTP_VERSUCHE = 3
+SMTP_WARTEZEIT = 2  # Sekunden vor einem erneuten Versuch (× Versuch)
+
+EMAIL_AUSGABE_VERZEICHNIS = os.environ.get('EMAIL_AUSGABE_VERZEICHNIS', '')
+
+
+# ============================================================================
+# VERBINDUNGEN
+# ============================================================================
+
+def oeffne_smtp_verbindung(benutzer, passwort, host=SMTP_HOST, port=SMTP_PORT, mit_ssl=SMTP_SSL):
+    """Eine authentifizierte SMTP-Verbindung (Login entfällt ohne Zugangsdaten)"""
+    if mit_ssl:
+        server = smtplib.SMTP_SSL(host, port, timeout=SMTP_TIMEOUT, context=ssl.create_default_context())
+    else:
+        server = smtplib.SMTP(host, port, timeout=SMTP_TIMEOUT)
+    if benutzer and passwort:
+        server.login(benutzer, passwort)
+    return server
+
+
+def schliesse_smtp_verbindung(server):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+def ist_voruebergehend(fehler):
+    """Verbindungsprobleme und 4xx-Antworten lohnen einen neuen Versuch, 5xx/Login nicht"""
+    if isinstance(fehler, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused)):
+        return False
+    if isinstance(fehler, smtplib.SMTPResponseException):
+        return 400 <= fehler.smtp_code < 500
+    return isinstance(fehler, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+# ============================================================================
+# VERSAND
+# ============================================================================
+
+def speichere_nachrichten(nachrichten, verzeichnis=EMAIL_AUSGABE_VERZEICHNIS, bei_erfolg=None):
+    """Emails lokal ablegen statt senden. Returns: wie versende_nachrichten()"""
+    os.makedirs(verzeichnis, exist_ok=True)
+    ergebnisse = {}
+    for schluessel, nachricht in nachrichten:
+        name = re.sub(r'[^\w.-]+', '_', str(schluessel))
+        with open(os.path.join(verzeichnis, f"{name}.eml"), 'wb') as f:
+            f.write(nachricht.as_bytes())
+        ergebnisse[schluessel] = None
+        if bei_erfolg:
+            bei_erfolg(schluessel)
+    print(f"📨 {len(nachrichten)} Emails gespeichert in {verzeichnis}/ (kein SMTP)")
+    return ergebnisse
+
+
+def versende_nachrichten(nachrichten, benutzer, passwort, verbindungen=SMTP_VERBINDUNGEN,
+                         max_pro_verbindung=SMTP_MAX_PRO_VERBINDUNG, versuche=SMTP_VERSUCHE, bei_erfolg=None,
+                         **verbindung):
+    """
+    Versendet Nachrichten über einen kleinen Pool wiederverwendeter Verbindungen
+
+    nachrichten: Liste von (schluessel, email.message.Message)
+    bei_erfolg: optional, bei_erfolg(schluessel) direkt nach jeder gesendeten Nachricht
+                (aus den Versand-Threads) - z.B. Checkpoint, falls der Lauf mitten im Versand abbricht
+    verbindung: optionale host/port/mit_ssl für oeffne_smtp_verbindung()
+    Returns: {schluessel: None (gesendet) oder Fehlertext}
+    """
+    if EMAIL_AUSGABE_VERZEICHNIS:
+        return speichere_nachrichten(nachrichten, bei_erfolg=bei_erfolg)
+
+    warteschlange = queue.Queue()
+    for schluessel, nachricht in nachrichten:
+        warteschlange.put((schluessel, nachricht, 1))
+
+    ergebnisse = {}
+    sperre = threading.Lock()
+
+    def melde_erfolg(schluessel):
+        # Fehler im Callback dürfen eine gesendete Nachricht nie erneut einreihen
+        if not bei_erfolg:
+            return
+        try:
+            bei_erfolg(schluessel)
+        except Exception as e:
+            print(f"   ⚠️ {schluessel}: gesendet, aber bei_erfolg fehlgeschlagen: {e}")
+
+    def arbeiter():
+        server = None
+        gesendet = 0
+        try:
+            while True:
+                try:
+                    schluessel, nachricht, versuch = warteschlange.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    if server is None or gesendet >= max_pro_verbindung:
+                        schliesse_smtp_verbindung(server)
+                        server = None
+                        server = oeffne_smtp_verbindung(benutzer, passwort, **verbindung)
+                        gesendet = 0
+                    server.send_message(nachricht)
+                    gesendet += 1
+                    with sperre:
+                        ergebnisse[schluessel] = None
+                    print(f"   ✅ {schluessel}")
+                    melde_erfolg(schluessel)
+                except Exception as e:
+                    if isinstance(e, (smtplib.SMTPException, OSError)):
+                        # Zustand der Verbindung unklar → beim nächsten Mal neu verbinden
+                        schliesse_smtp_verbindung(server)
+                        server = None
+                    if ist_voruebergehend(e) and versuch < versuche:
+                        print(f"   🔁 {schluessel}: {e} - Versuch {versuch + 1}/{versuche}")
+                        time.sleep(SMTP_WARTEZEIT * versuch)
+                        warteschlange.put((schluessel, nachricht, versuch + 1))
+                    else:
+                        with sperre:
+                            ergebnisse[schluessel] = str(e)
+                        print(f"   ❌ {schluessel}: {e}")
+        finally:
+            schliesse_smtp_verbindung(server)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=arbeiter) for _ in range(max(1, min(verbindungen, len(nachrichten))))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    dauer = time.perf_counter() - start
+    gesendet = sum(1 for fehler in ergebnisse.values() if fehler is None)
+    print(f"📨 {gesendet}/{len(nachrichten)} Emails in {dauer:.1f}s über {len(threads)} Verbindung(en)")
+    return ergebnisse
@@ -2,14 +2,11 @@
 # -*- coding: utf-8 -*-
 """
 Zoo Medien Newsletter Automation mit Zusammenfassungen + ARCHIV
-✅ Duplikat-Erkennung via Supabase
+✅ Duplikat-Erkennung via Archiv-Backend (Supabase oder lokal SQLite)
 ✅ Automatische Archivierung aller Artikel
 ✅ Run-Statistiken für Analyse
 """
 
-import feedparser
-import requests
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -18,8 +15,27 @@ import sys
 import os
 import json
 import re
-from bs4 import BeautifulSoup
+import threading
 from urllib.parse import quote
+from html import escape
+
+from newsletter_index import aktualisiere_index, DOCS_VERZEICHNIS
+from newsletter_seiten import sicherer_link
+from newsletter_archiv import REGIONEN, region_von, baue_newsletter, serialisiere
+from newsletter_assets import veroeffentliche_assets
+from archiv_backend import waehle_archiv_backend
+from email_versand import versende_nachrichten
+from newsletter_pipeline import (starte_quelle, starte_stufe, starte_buendel, taktgeber, sammle_ergebnisse,
+                                 drucke_pipeline_bericht)
+from newsletter_checkpoint import starte_checkpoints, artikel_schluessel
+from newsletter_dienste import http_get, lade_feed, DIENSTE_MODUS
+from newsletter_parser import (parse, extrahiere_volltext, links_aus_html, texte_aus_html, starte_parser,
+                              beende_parser)
+from claude_verbrauch import claude_anfrage, starte_abrechnung, verbrauch_zusammenfassung, drucke_verbrauch
+from newsletter_profil import starte_profil, profil_stufe, beende_profil
+from newsletter_nutzer import nutzer_id
+from newsletter_trace import (starte_trace, starte_span, beende_span, im_span, span, trace_zusammenfassung,
+                              schreibe_trace, drucke_trace_zusammenfassung)
 
 # ============================================================================
 # KONFIGURATION
@@ -62,6 +78,31 @@ EMPFAENGER = {
     'Christina': 'christina@zooproductions.de'
 }
 
+# Anzahl persönlicher Top-Artikel in der Email (aus Per-User Learning Boosts)
+PERSONAL_TOP_N = 3
+
+# Ablauf: 'stream' (Stufen laufen gleichzeitig) oder 'phasen' (nacheinander, wie früher)
+PIPELINE_MODUS = os.environ.get('NEWSLETTER_PIPELINE', 'stream')
+# Threads pro Stufe - Claude-Aufrufe bewusst niedrig (Rate Limits)
+PIPELINE_WORKER = {
+    'sammeln': 6,
+    'bewerten': 2,
+    'duplikate': 1,
+    'zusammenfassen': 4,
+}
+
+# Pausen zwischen RSS-Feeds und zwischen Zusammenfassungen (Rücksicht auf Server/Rate Limits)
+QUELLEN_PAUSE_S = float(os.environ.get('NEWSLETTER_QUELLEN_PAUSE', '1'))
+ZUSAMMENFASSUNG_PAUSE_S = float(os.environ.get('NEWSLETTER_ZUSAMMENFASSUNG_PAUSE', '0.5'))
+
+# Stream: Artikel mehrerer Quellen in einem Claude-Bewertungsaufruf - ein Bündel geht los,
+# sobald es voll ist oder die Wartezeit seit der ersten Quelle im Bündel abgelaufen ist
+BEWERTUNG_BUENDEL_ARTIKEL = int(os.environ.get('NEWSLETTER_BEWERTUNG_BUENDEL', '100'))
+BEWERTUNG_BUENDEL_WARTEZEIT_S = float(os.environ.get('NEWSLETTER_BEWERTUNG_WARTEZEIT', '5'))
+
+# Checkpoint-Store des aktuellen Laufs (newsletter_checkpoint.py) - wird in main() geöffnet
+CHECKPOINTS = None
+
 # ============================================================================
 # SUPABASE CLIENT
 # ============================================================================
@@ -71,14 +112,21 @@ SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 
 try:
     from supabase import create_client, Client
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+    # Offline-Modus (newsletter_dienste.py) verbindet sich nie mit Supabase
+    verbinden = SUPABASE_URL and SUPABASE_KEY and DIENSTE_MODUS != 'offline'
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if verbinden else None
     SUPABASE_AVAILABLE = supabase is not None
     if SUPABASE_AVAILABLE:
-        print("✅ Supabase verbunden - Archiv aktiv")
+        print("✅ Supabase verbunden")
 except Exception as e:
     supabase = None
     SUPABASE_AVAILABLE = False
-    print(f"⚠️ Supabase nicht verfügbar - Archiv deaktiviert: {e}")
+    print(f"⚠️ Supabase nicht verfügbar: {e}")
+
+# Archiv-Backend (ARCHIV_BACKEND=auto|supabase|sqlite|aus) - ohne Supabase lokal in SQLite
+ARCHIV = waehle_archiv_backend(supabase)
+ARCHIV_AVAILABLE = ARCHIV is not None
+print(f"✅ Archiv aktiv: {ARCHIV['name']}" if ARCHIV_AVAILABLE else "⚠️ Archiv deaktiviert")
 
 # ============================================================================
 # ARCHIV-FUNKTIONEN
@@ -90,21 +138,18 @@ def pruefe_auf_duplikat(article_url, article_title, article_published_date=''):
     - Prüft ob exakt die gleiche URL mit gleichem Titel bereits archiviert wurde
     - Erlaubt Updates zu existierenden Artikeln (gleiche URL, aber neuer Titel oder Datum)
     """
-    if not supabase:
+    if not ARCHIV:
         return False
     try:
         # Hole alle Artikel mit dieser URL aus dem Archiv
-        result = supabase.table('newsletter_articles_archive') \
-            .select('article_url, article_title, published_date, first_sent_date') \
-            .eq('article_url', article_url) \
-            .execute()
+        archivierte = ARCHIV['finde_artikel'](article_url)
         
-        if len(result.data) == 0:
+        if len(archivierte) == 0:
             # URL existiert nicht im Archiv - definitiv kein Duplikat
             return False
         
         # URL existiert - prüfe ob es ein Update ist
-        for archived_article in result.data:
+        for archived_article in archivierte:
             archived_title = archived_article.get('article_title', '')
             archived_date = archived_article.get('published_date', '')
             first_sent = archived_article.get('first_sent_date', '')
@@ -158,7 +203,7 @@ def berechne_titel_aehnlichkeit(titel1, titel2):
 
 def speichere_artikel_im_archiv(artikel, run_date, region):
     """Speichert Artikel im Archiv"""
-    if not supabase:
+    if not ARCHIV:
         return False
     try:
         data = {
@@ -171,7 +216,7 @@ def speichere_artikel_im_archiv(artikel, run_date, region):
             'relevance_score': artikel['score'],
             'summary': artikel.get('summary', '')
         }
-        supabase.table('newsletter_articles_archive').insert(data).execute()
+        ARCHIV['speichere_artikel'](data)
         return True
     except Exception as e:
         print(f"⚠️ Archivierung Fehler: {str(e)}")
@@ -179,7 +224,7 @@ def speichere_artikel_im_archiv(artikel, run_date, region):
 
 def speichere_run_metadata(run_date, stats):
     """Speichert Newsletter-Run Statistiken"""
-    if not supabase:
+    if not ARCHIV:
         return False
     try:
         data = {
@@ -190,9 +235,11 @@ def speichere_run_metadata(run_date, stats):
             'duplicate_articles_filtered': stats['duplicates'],
             'sources_checked': stats['sources'],
             'run_status': stats['status'],
-            'error_message': stats.get('error')
+            'error_message': stats.get('error'),
+            'timing': stats.get('timing'),
+            'llm_verbrauch': stats.get('llm')
         }
-        supabase.table('newsletter_runs').insert(data).execute()
+        ARCHIV['speichere_run'](data)
         return True
     except Exception as e:
         print(f"⚠️ Metadata-Speicherung Fehler: {str(e)}")
@@ -219,6 +266,15 @@ def load_learning_rules():
 
 LEARNING_RULES = load_learning_rules()
 
+def finde_keyword_boost(title, keywords, keyword_boosts):
+    """Erster passender Keyword-Boost für Titel/Keywords (0 wenn keiner passt)"""
+    title_lower = title.lower()
+    keywords_text = ' '.join(k.lower() for k in keywords)
+    for keyword, boost in keyword_boosts.items():
+        if boost != 0 and (keyword.lower() in title_lower or keyword.lower() in keywords_text):
+            return boost
+    return 0
+
 def apply_learning_boost(score, source, title, keywords):
     """Wende Learning Boost auf Score an"""
     original_score = score
@@ -232,17 +288,32 @@ def apply_learning_boost(score, source, title, keywords):
             return score
     
     # Keyword-Boosts
-    title_lower = title.lower()
-    keywords_lower = [k.lower() for k in keywords]
-    for keyword, boost in LEARNING_RULES.get('keyword_boosts', {}).items():
-        if keyword.lower() in title_lower or keyword.lower() in ' '.join(keywords_lower):
-            score = min(10, score + boost)
-            if boost != 0:
-                print(f"    🎓 Learning: {original_score} → {score}")
-                return score
+    boost = finde_keyword_boost(title, keywords, LEARNING_RULES.get('keyword_boosts', {}))
+    if boost != 0:
+        score = min(10, score + boost)
+        print(f"    🎓 Learning: {original_score} → {score}")
     
     return score
 
+def berechne_user_score(artikel, user_email):
+    """
+    Score eines bereits bewerteten Artikels für einen Empfänger
+    Per-User Boosts (nach pseudonymer Nutzer-ID) überschreiben die Team-Boosts -
+    keine weiteren Claude-Aufrufe
+    """
+    user_boosts = LEARNING_RULES.get('user_keyword_boosts', {}).get(nutzer_id(user_email))
+    if not user_boosts:
+        return artikel['score']
+    
+    keyword_boosts = {**LEARNING_RULES.get('keyword_boosts', {}), **user_boosts}
+    basis = artikel.get('original_score', artikel['score'])
+    boost = finde_keyword_boost(artikel['title'], artikel.get('keywords', []), keyword_boosts)
+    return min(10, basis + boost)
+
+def personalisiere_ranking(artikel_liste, user_email):
+    """Sortiert die gemeinsame Artikel-Liste nach dem Score eines Empfängers (stabil)"""
+    return sorted(artikel_liste, key=lambda a: berechne_user_score(a, user_email), reverse=True)
+
 # ============================================================================
 # WEB-FETCHING + BRAVE SEARCH FALLBACK
 # ============================================================================
@@ -250,52 +321,15 @@ def apply_learning_boost(score, source, title, keywords):
 def fetch_full_article(url):
     """
     Versuche den Volltext eines Artikels zu laden
-    3-Stufen-Strategie für maximale Erfolgsrate
+    Extraktion siehe extrahiere_volltext() (newsletter_parser.py, ggf. im Prozess-Pool)
     """
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Entferne Scripte, Styles, Nav, Footer
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
-            tag.decompose()
-        
-        # Strategie 1: Suche nach <article> Tag
-        article = soup.find('article')
-        if article:
-            text = article.get_text(separator=' ', strip=True)
-            if len(text) > 200:
-                return text[:3000]
-        
-        # Strategie 2: Suche nach gängigen Content-Klassen
-        content_selectors = [
-            'div.article-content',
-            'div.post-content',
-            'div.entry-content',
-            'div.content',
-            'div.story-body',
-            'div.article-body',
-            'main'
-        ]
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                text = content.get_text(separator=' ', strip=True)
-                if len(text) > 200:
-                    return text[:3000]
-        
-        # Strategie 3: Alle <p> Tags im Body
-        paragraphs = soup.find_all('p')
-        if paragraphs:
-            text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            if len(text) > 200:
-                return text[:3000]
-        
-        return None
+        return parse(extrahiere_volltext, response.content)
         
     except Exception as e:
         return None
@@ -321,7 +355,7 @@ def search_web_for_context(title, description):
             'text_decorations': False
         }
         
-        response = requests.get(
+        response = http_get(
             'https://api.search.brave.com/res/v1/web/search',
             headers=headers,
             params=params,
@@ -426,15 +460,11 @@ def hole_kress_artikel():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get('https://kress.de/news', headers=headers, timeout=10)
+        response = http_get('https://kress.de/news', headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
         
         artikel_candidates = []
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text(separator=' ', strip=True)
-            href = link.get('href')
-            
+        for link_text, href in parse(links_aus_html, response.content):
             if len(link_text) >= 40 and href and len(href) > 5:
                 if not any(x in href.lower() for x in ['facebook', 'twitter', 'instagram', 'mailto', 'tel:', '#']):
                     full_url = href if href.startswith('http') else f"https://kress.de{href}"
@@ -491,15 +521,11 @@ def hole_meedia_artikel():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get('https://meedia.de', headers=headers, timeout=10)
+        response = http_get('https://meedia.de', headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
         
         artikel_candidates = []
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text(separator=' ', strip=True)
-            href = link.get('href')
-            
+        for link_text, href in parse(links_aus_html, response.content):
             if len(link_text) >= 35 and href and len(href) > 5:
                 if not any(x in href.lower() for x in ['facebook', 'twitter', 'instagram', 'mailto', 'tel:', '#', 'kategorie']):
                     full_url = href if href.startswith('http') else f"https://meedia.de{href}"
@@ -556,15 +582,11 @@ def hole_turi2_artikel():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get('https://turi2.de', headers=headers, timeout=10)
+        response = http_get('https://turi2.de', headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
         
         artikel_candidates = []
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text(separator=' ', strip=True)
-            href = link.get('href')
-            
+        for link_text, href in parse(links_aus_html, response.content):
             if len(link_text) >= 40 and href and len(href) > 5:
                 if not any(x in href.lower() for x in ['facebook', 'twitter', 'instagram', 'mailto', 'tel:', '#', 'werben', 'themenwochen', 'termine']):
                     if not any(x in link_text.lower() for x in ['werben bei turi2', 'themenwochen', 'termine der kommunikation']):
@@ -642,39 +664,15 @@ Artikel:
 Antworte NUR mit JSON:
 {{"scores": [score1, score2, ...]}}"""
 
+    text = claude_anfrage('bewerten', prompt, max_tokens=1000, timeout=60, api_key=ANTHROPIC_API_KEY)
+    if text is None:
+        return []
+    
     try:
-        response = requests.post(
-            'https://api.anthropic.com/v1/messages',
-            headers={
-                'x-api-key': ANTHROPIC_API_KEY,
-                'anthropic-version': '2023-06-01',
-                'content-type': 'application/json'
-            },
-            json={
-                'model': 'claude-opus-4-8',
-                'max_tokens': 1000,
-                'messages': [{
-                    'role': 'user',
-                    'content': prompt
-                }]
-            },
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            text = data['content'][0]['text'].strip()
-            
-            text = text.replace('```json', '').replace('```', '').strip()
-            result = json.loads(text)
-            
-            return result.get('scores', [])
-        else:
-            print(f"❌ Claude API Fehler: {response.status_code}")
-            return []
-            
+        text = text.strip().replace('```json', '').replace('```', '').strip()
+        return json.loads(text).get('scores', [])
     except Exception as e:
-        print(f"❌ Fehler bei Claude API: {e}")
+        print(f"❌ Claude-Bewertung nicht lesbar: {e}")
         return []
 
 # ============================================================================
@@ -698,123 +696,137 @@ Volltext:
 
 Antworte NUR mit der Zusammenfassung, keine Einleitung."""
 
-    try:
-        print(f"       🔄 Sende Anfrage an Claude API...")
-        response = requests.post(
-            'https://api.anthropic.com/v1/messages',
-            headers={
-                'x-api-key': ANTHROPIC_API_KEY,
-                'anthropic-version': '2023-06-01',
-                'content-type': 'application/json'
-            },
-            json={
-                'model': 'claude-opus-4-8',
-                'max_tokens': 300,
-                'messages': [{
-                    'role': 'user',
-                    'content': prompt
-                }]
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            summary = data['content'][0]['text'].strip()
-            print(f"       ✅ Claude API Antwort erhalten!")
-            return summary
-        else:
-            print(f"       ❌ Claude API Fehler: Status {response.status_code}")
-            print(f"       📄 Response: {response.text[:200]}")
-            return "Zusammenfassung nicht verfügbar."
-            
-    except Exception as e:
-        print(f"       ❌ Zusammenfassung fehlgeschlagen: {str(e)[:100]}")
+    print(f"       🔄 Sende Anfrage an Claude API...")
+    summary = claude_anfrage('zusammenfassen', prompt, max_tokens=300, timeout=30, api_key=ANTHROPIC_API_KEY)
+    if summary is None:
         return "Zusammenfassung nicht verfügbar."
+    
+    print(f"       ✅ Claude API Antwort erhalten!")
+    return summary.strip()
 
 # ============================================================================
 # NEWSLETTER LOGIK
 # ============================================================================
 
-def sammle_artikel():
-    """Sammle Artikel von allen RSS-Feeds und Web-Scraping Quellen"""
-    alle_artikel = []
-    
-    for source_name, feed_url in RSS_FEEDS.items():
-        print(f"📡 Hole Artikel von {source_name}...")
-        try:
-            feed = feedparser.parse(feed_url)
-            artikel_count = 0
-            
-            for entry in feed.entries[:20]:
-                titel = entry.get('title', 'Kein Titel')
-                link = entry.get('link', '')
-                beschreibung = entry.get('summary', entry.get('description', ''))
-                
-                if beschreibung:
-                    soup = BeautifulSoup(beschreibung, 'html.parser')
-                    beschreibung = soup.get_text(separator=' ', strip=True)
-                
-                keywords = []
-                if beschreibung:
-                    words = beschreibung.lower().split()
-                    keywords = [w for w in words if len(w) > 5][:10]
-                
-                alle_artikel.append({
-                    'source': source_name,
-                    'title': titel,
-                    'link': link,
-                    'description': beschreibung,
-                    'keywords': keywords,
-                    'score': 5
-                })
-                artikel_count += 1
+def hole_rss_artikel(source_name, feed_url):
+    """Artikel eines RSS-Feeds (max. 20)"""
+    print(f"📡 Hole Artikel von {source_name}...")
+    artikel_liste = []
+    try:
+        feed = lade_feed(feed_url)
+        eintraege = feed.entries[:20]
+        
+        # HTML der Beschreibungen in einem Aufruf (ggf. im Parser-Prozess)
+        beschreibungen = parse(texte_aus_html, [e.get('summary', e.get('description', '')) for e in eintraege])
+        
+        for entry, beschreibung in zip(eintraege, beschreibungen):
+            titel = entry.get('title', 'Kein Titel')
+            link = entry.get('link', '')
             
-            print(f"   ✅ {artikel_count} Artikel gefunden\n")
-            time.sleep(1)
+            keywords = []
+            if beschreibung:
+                words = beschreibung.lower().split()
+                keywords = [w for w in words if len(w) > 5][:10]
             
-        except Exception as e:
-            print(f"   ❌ Fehler bei {source_name}: {e}\n")
-    
-    print("="*70)
-    print("🌐 WEB-SCRAPING DEUTSCHE QUELLEN")
-    print("="*70 + "\n")
-    
-    kress_artikel = hole_kress_artikel()
-    if kress_artikel:
-        alle_artikel.extend(kress_artikel)
+            artikel_liste.append({
+                'source': source_name,
+                'title': titel,
+                'link': link,
+                'description': beschreibung,
+                'keywords': keywords,
+                'score': 5
+            })
+        
+        print(f"   ✅ {len(artikel_liste)} Artikel von {source_name} gefunden\n")
+        
+    except Exception as e:
+        print(f"   ❌ Fehler bei {source_name}: {e}\n")
     
-    meedia_artikel = hole_meedia_artikel()
-    if meedia_artikel:
-        alle_artikel.extend(meedia_artikel)
+    return artikel_liste
+
+def hole_quelle(name, aufgabe):
+    """Artikel einer Quelle - aus dem Checkpoint, falls dieser Lauf sie schon geladen hat"""
+    with span('quelle', name) as aktuell:
+        if CHECKPOINTS:
+            gespeichert = CHECKPOINTS['lade']('quelle', name)
+            if gespeichert:
+                print(f"♻️ {name}: {len(gespeichert)} Artikel aus Checkpoint")
+                aktuell['status'] = 'checkpoint'
+                aktuell['attribute']['artikel'] = len(gespeichert)
+                return gespeichert
+        
+        artikel_liste = aufgabe() or []
+        aktuell['attribute']['artikel'] = len(artikel_liste)
+        if not artikel_liste:
+            aktuell['status'] = 'leer'
+        if CHECKPOINTS and artikel_liste:
+            CHECKPOINTS['speichere']('quelle', name, artikel_liste)
+        return artikel_liste
+
+def quellen_aufgaben():
+    """Alle Quellen als Funktionen ohne Argumente, die eine Artikel-Liste liefern"""
+    quellen = [
+        (name, lambda name=name, url=url: hole_rss_artikel(name, url))
+        for name, url in RSS_FEEDS.items()
+    ]
+    quellen += [('kress', hole_kress_artikel), ('meedia', hole_meedia_artikel), ('turi2', hole_turi2_artikel)]
+    return [lambda name=name, aufgabe=aufgabe: hole_quelle(name, aufgabe) for name, aufgabe in quellen]
+
+def sammle_artikel():
+    """Sammle Artikel von allen RSS-Feeds und Web-Scraping Quellen"""
+    alle_artikel = []
+    aufgaben = quellen_aufgaben()
     
-    turi2_artikel = hole_turi2_artikel()
-    if turi2_artikel:
-        alle_artikel.extend(turi2_artikel)
+    with span('stufe', 'sammeln'), profil_stufe('sammeln'):
+        for aufgabe in aufgaben[:len(RSS_FEEDS)]:
+            alle_artikel.extend(aufgabe())
+            time.sleep(QUELLEN_PAUSE_S)
+        
+        print("="*70)
+        print("🌐 WEB-SCRAPING DEUTSCHE QUELLEN")
+        print("="*70 + "\n")
+        
+        for aufgabe in aufgaben[len(RSS_FEEDS):]:
+            alle_artikel.extend(aufgabe())
     
     return alle_artikel
 
-def verarbeite_artikel(artikel_liste):
-    """Bewerte Artikel und erstelle Zusammenfassungen"""
-    
-    print(f"\n🤖 BEWERTE {len(artikel_liste)} ARTIKEL MIT CLAUDE")
-    print("="*70)
-    
-    # Batch-Bewertung
-    scores = bewerte_artikel_mit_claude(artikel_liste)
+def bewerte_und_booste(artikel_liste, nummer_start=1):
+    """
+    Claude-Bewertung (ein Aufruf für die Liste) plus Learning Boosts
+    Bereits bewertete Artikel dieses Laufs kommen aus dem Checkpoint
+    """
+    bekannt = {}
+    if CHECKPOINTS:
+        for artikel in artikel_liste:
+            score = CHECKPOINTS['lade']('score', artikel_schluessel(artikel))
+            if score is not None:
+                bekannt[artikel_schluessel(artikel)] = score
+    
+    offen = [a for a in artikel_liste if artikel_schluessel(a) not in bekannt]
+    if bekannt:
+        print(f"♻️ {len(bekannt)} Scores aus Checkpoint, {len(offen)} neu zu bewerten")
+    
+    if offen:
+        with span('bewertung', f"{len(offen)} Artikel", artikel=len(offen)) as aktuell:
+            scores = bewerte_artikel_mit_claude(offen)
+            if len(scores) != len(offen):
+                aktuell['status'] = 'fehler'
+        if len(scores) == len(offen):
+            for artikel, score in zip(offen, scores):
+                bekannt[artikel_schluessel(artikel)] = score
+                if CHECKPOINTS:
+                    CHECKPOINTS['speichere']('score', artikel_schluessel(artikel), score)
     
-    if len(scores) == len(artikel_liste):
-        for artikel, score in zip(artikel_liste, scores):
+    for artikel in artikel_liste:
+        score = bekannt.get(artikel_schluessel(artikel))
+        if score is not None:
             artikel['original_score'] = score
             artikel['score'] = score
     
-    # Wende Learning Boosts an und zeige Ergebnisse
-    relevante_artikel = []
-    
-    for idx, artikel in enumerate(artikel_liste, 1):
+    for idx, artikel in enumerate(artikel_liste, nummer_start):
         print(f"\n[{idx}] {artikel['source']}: {artikel['title'][:60]}...")
         
-        original_score = artikel['score']
         artikel['score'] = apply_learning_boost(
             artikel['score'],
             artikel['source'],
@@ -824,10 +836,97 @@ def verarbeite_artikel(artikel_liste):
         
         if artikel['score'] >= 7:
             print(f"   ✅ Score: {artikel['score']}/10 - RELEVANT!")
-            relevante_artikel.append(artikel)
         else:
             print(f"   ⏭️ Score: {artikel['score']}/10 - übersprungen")
     
+    return artikel_liste
+
+def ist_duplikat(artikel):
+    """Duplikat-Check - Artikel, die dieser Lauf selbst schon archiviert hat, zählen nicht"""
+    if CHECKPOINTS and CHECKPOINTS['lade']('archiviert', artikel_schluessel(artikel)):
+        return False
+    return pruefe_auf_duplikat(artikel['link'], artikel['title'], artikel.get('published', ''))
+
+def fasse_artikel_zusammen(artikel):
+    """
+    Volltext laden (Fallback: Web-Recherche, RSS-Beschreibung) und mit Claude zusammenfassen
+    Volltext und Zusammenfassung werden pro Artikel im Checkpoint gespeichert
+    """
+    with span('artikel', artikel['title'][:80], quelle=artikel['source'], link=artikel['link']) as aktuell:
+        _fasse_artikel_zusammen(artikel)
+        if not artikel.get('summary') or artikel['summary'].startswith('Zusammenfassung nicht verfügbar'):
+            aktuell['status'] = 'ohne_zusammenfassung'
+    return artikel
+
+def _fasse_artikel_zusammen(artikel):
+    schluessel = artikel_schluessel(artikel)
+    if CHECKPOINTS:
+        summary = CHECKPOINTS['lade']('zusammenfassung', schluessel)
+        if summary:
+            print(f"       ♻️ Zusammenfassung aus Checkpoint")
+            artikel['summary'] = summary
+            return artikel
+    
+    full_text = CHECKPOINTS['lade']('volltext', schluessel) if CHECKPOINTS else None
+    
+    if full_text:
+        print(f"       ♻️ Text aus Checkpoint: {len(full_text)} Zeichen")
+    else:
+        print(f"       🌐 Lade vollständigen Artikel von URL...")
+        full_text = fetch_full_article(artikel['link'])
+    
+    if full_text and len(full_text) > 200:
+        print(f"       ✅ Artikel geladen: {len(full_text)} Zeichen")
+    else:
+        print(f"       ⚠️ Volltext konnte nicht geladen werden (Paywall/Login?)")
+        print(f"       🔍 Versuche Web-Recherche als Fallback...")
+        web_context = search_web_for_context(artikel['title'], artikel['description'])
+        
+        if web_context:
+            full_text = web_context
+            print(f"       ✅ Kontext-Recherche erfolgreich: {len(full_text)} Zeichen")
+        else:
+            full_text = artikel['description']
+            print(f"       ⚠️ Fallback auf RSS-Beschreibung: {len(full_text)} Zeichen")
+    
+    if CHECKPOINTS and full_text:
+        CHECKPOINTS['speichere']('volltext', schluessel, full_text)
+    
+    if full_text and len(full_text) >= 50:
+        print(f"       🤖 Erstelle Zusammenfassung mit Claude...")
+        
+        artikel['summary'] = erstelle_zusammenfassung_mit_claude(
+            artikel['title'],
+            artikel['link'],
+            full_text
+        )
+        
+        if artikel['summary'] and artikel['summary'] != "Zusammenfassung nicht verfügbar.":
+            print(f"       ✅ Zusammenfassung erstellt: {artikel['summary'][:100]}...")
+            if CHECKPOINTS:
+                CHECKPOINTS['speichere']('zusammenfassung', schluessel, artikel['summary'])
+        else:
+            print(f"       ⚠️ Claude gab keine gültige Zusammenfassung zurück!")
+    else:
+        if not full_text:
+            print(f"       ❌ Keine Zusammenfassung möglich - kein Text geladen!")
+        else:
+            print(f"       ❌ Keine Zusammenfassung möglich - Text zu kurz: {len(full_text)} Zeichen")
+        artikel['summary'] = "Zusammenfassung nicht verfügbar - Artikel konnte nicht geladen werden."
+    
+    return artikel
+
+def verarbeite_artikel(artikel_liste):
+    """Bewerte Artikel und erstelle Zusammenfassungen"""
+    
+    print(f"\n🤖 BEWERTE {len(artikel_liste)} ARTIKEL MIT CLAUDE")
+    print("="*70)
+    
+    # Batch-Bewertung + Learning Boosts
+    with span('stufe', 'bewerten'), profil_stufe('bewerten'):
+        bewerte_und_booste(artikel_liste)
+    relevante_artikel = [a for a in artikel_liste if a['score'] >= 7]
+    
     # DUPLIKAT-CHECK VOR ZUSAMMENFASSUNGEN
     print(f"\n\n🔍 PRÜFE AUF DUPLIKATE")
     print("="*70)
@@ -835,13 +934,13 @@ def verarbeite_artikel(artikel_liste):
     relevante_ohne_duplikate = []
     duplikat_count = 0
     
-    for artikel in relevante_artikel:
-        artikel_datum = artikel.get('published', '')
-        if pruefe_auf_duplikat(artikel['link'], artikel['title'], artikel_datum):
-            duplikat_count += 1
-            print(f"⏭️ Duplikat: {artikel['title'][:60]}...")
-        else:
-            relevante_ohne_duplikate.append(artikel)
+    with span('stufe', 'duplikate'), profil_stufe('duplikate'):
+        for artikel in relevante_artikel:
+            if ist_duplikat(artikel):
+                duplikat_count += 1
+                print(f"⏭️ Duplikat: {artikel['title'][:60]}...")
+            else:
+                relevante_ohne_duplikate.append(artikel)
     
     print(f"\n✅ {len(relevante_ohne_duplikate)} neue Artikel")
     print(f"⏭️ {duplikat_count} Duplikate übersprungen")
@@ -852,52 +951,84 @@ def verarbeite_artikel(artikel_liste):
     print(f"\n\n📝 ERSTELLE ZUSAMMENFASSUNGEN FÜR {len(relevante_artikel)} RELEVANTE ARTIKEL")
     print("="*70)
     
-    for idx, artikel in enumerate(relevante_artikel, 1):
-        print(f"\n[{idx}/{len(relevante_artikel)}] {artikel['title'][:60]}...")
-        
-        full_text = None
-        
-        print(f"       🌐 Lade vollständigen Artikel von URL...")
-        full_text = fetch_full_article(artikel['link'])
-        
-        if full_text and len(full_text) > 200:
-            print(f"       ✅ Artikel geladen: {len(full_text)} Zeichen")
-        else:
-            print(f"       ⚠️ Volltext konnte nicht geladen werden (Paywall/Login?)")
-            print(f"       🔍 Versuche Web-Recherche als Fallback...")
-            web_context = search_web_for_context(artikel['title'], artikel['description'])
-            
-            if web_context:
-                full_text = web_context
-                print(f"       ✅ Kontext-Recherche erfolgreich: {len(full_text)} Zeichen")
-            else:
-                full_text = artikel['description']
-                print(f"       ⚠️ Fallback auf RSS-Beschreibung: {len(full_text)} Zeichen")
-        
-        if full_text and len(full_text) >= 50:
-            print(f"       🤖 Erstelle Zusammenfassung mit Claude...")
-            
-            artikel['summary'] = erstelle_zusammenfassung_mit_claude(
-                artikel['title'],
-                artikel['link'],
-                full_text
-            )
-            
-            if artikel['summary'] and artikel['summary'] != "Zusammenfassung nicht verfügbar.":
-                print(f"       ✅ Zusammenfassung erstellt: {artikel['summary'][:100]}...")
-            else:
-                print(f"       ⚠️ Claude gab keine gültige Zusammenfassung zurück!")
-        else:
-            if not full_text:
-                print(f"       ❌ Keine Zusammenfassung möglich - kein Text geladen!")
-            else:
-                print(f"       ❌ Keine Zusammenfassung möglich - Text zu kurz: {len(full_text)} Zeichen")
-            artikel['summary'] = "Zusammenfassung nicht verfügbar - Artikel konnte nicht geladen werden."
-        
-        time.sleep(0.5)
+    with span('stufe', 'zusammenfassen'), profil_stufe('zusammenfassen'):
+        for idx, artikel in enumerate(relevante_artikel, 1):
+            print(f"\n[{idx}/{len(relevante_artikel)}] {artikel['title'][:60]}...")
+            fasse_artikel_zusammen(artikel)
+            time.sleep(ZUSAMMENFASSUNG_PAUSE_S)
     
     return relevante_artikel
 
+def verarbeite_artikel_stream():
+    """
+    Sammeln → Bündeln → Bewerten/Boost → Duplikat-Check → Volltext/Zusammenfassung
+    als Streaming-Pipeline: geladene Quellen werden gebündelt bewertet (ein
+    Claude-Aufruf pro BEWERTUNG_BUENDEL_ARTIKEL Artikel bzw. BEWERTUNG_BUENDEL_WARTEZEIT_S),
+    jeder relevante Artikel zusammengefasst, sobald er den Duplikat-Check passiert hat -
+    Starts der Zusammenfassungen über alle Worker mindestens ZUSAMMENFASSUNG_PAUSE_S auseinander
+    Returns: (alle_artikel, relevante_artikel in Regionen-Reihenfolge, Pipeline-Bericht)
+    """
+    print(f"\n🌊 STREAMING-PIPELINE ({len(RSS_FEEDS) + len(WEB_SCRAPING_SOURCES)} Quellen)")
+    print("="*70)
+    
+    alle_artikel = []
+    reihenfolge = {}  # id(artikel) → (Position der Quelle, Position im Feed)
+    sperre = threading.Lock()
+    aufgaben = quellen_aufgaben()
+    naechste_zusammenfassung = taktgeber(ZUSAMMENFASSUNG_PAUSE_S)
+    
+    def nummeriere(position):
+        def aufgabe():
+            artikel_liste = aufgaben[position]() or []
+            with sperre:
+                for idx, artikel in enumerate(artikel_liste):
+                    reihenfolge[id(artikel)] = (position, idx)
+                alle_artikel.extend(artikel_liste)
+            return artikel_liste
+        return aufgabe
+    
+    def bewerten(artikel_liste):
+        if not artikel_liste:
+            return []
+        return [a for a in bewerte_und_booste(artikel_liste) if a['score'] >= 7]
+    
+    def duplikate_filtern(artikel):
+        if ist_duplikat(artikel):
+            print(f"⏭️ Duplikat: {artikel['title'][:60]}...")
+            return []
+        return [artikel]
+    
+    def zusammenfassen(artikel):
+        naechste_zusammenfassung()
+        print(f"\n📝 {artikel['title'][:60]}...")
+        return [fasse_artikel_zusammen(artikel)]
+    
+    # Ein Trace-Span pro Stufe - ihre Worker-Threads erben ihn als Eltern-Span
+    spans = {name: starte_span('stufe', name, worker=worker)
+             for name, worker in {**PIPELINE_WORKER, 'buendeln': 1}.items()}
+    with im_span(spans['sammeln']):
+        quelle = starte_quelle('sammeln', [nummeriere(i) for i in range(len(aufgaben))], PIPELINE_WORKER['sammeln'])
+    with im_span(spans['buendeln']):
+        buendel = starte_buendel('buendeln', quelle, BEWERTUNG_BUENDEL_ARTIKEL, BEWERTUNG_BUENDEL_WARTEZEIT_S)
+    with im_span(spans['bewerten']):
+        bewertet = starte_stufe('bewerten', bewerten, buendel, PIPELINE_WORKER['bewerten'])
+    with im_span(spans['duplikate']):
+        neu = starte_stufe('duplikate', duplikate_filtern, bewertet, PIPELINE_WORKER['duplikate'])
+    with im_span(spans['zusammenfassen']):
+        fertig = starte_stufe('zusammenfassen', zusammenfassen, neu, PIPELINE_WORKER['zusammenfassen'])
+    
+    relevante_artikel = list(sammle_ergebnisse(fertig))
+    bericht = drucke_pipeline_bericht([quelle, buendel, bewertet, neu, fertig])
+    for stufe in (quelle, buendel, bewertet, neu, fertig):
+        beende_span(spans[stufe['name']], 'fehler' if stufe['fehler'] else None, stufe['ende'],
+                    eingang=stufe['eingang_anzahl'], ausgang=stufe['ausgang_anzahl'])
+    
+    # Feste Reihenfolge unabhängig davon, welche Quelle zuerst fertig war
+    relevante_artikel.sort(key=lambda a: reihenfolge[id(a)])
+    print(f"\n✅ {len(relevante_artikel)} neue Artikel, "
+          f"{bewertet['ausgang_anzahl'] - neu['ausgang_anzahl']} Duplikate übersprungen")
+    return alle_artikel, sortiere_nach_region(relevante_artikel), bericht
+
 # ============================================================================
 # SORTIERUNG NACH REGION
 # ============================================================================
@@ -905,12 +1036,6 @@ def verarbeite_artikel(artikel_liste):
 def sortiere_nach_region(artikel_liste):
     """Sortiere Artikel nach Region: 🇩🇪 Deutschland → 🇬🇧 UK → 🇺🇸 USA"""
     
-    regionen = {
-        'deutschland': ['DWDL', 'Horizont Medien', 'W&V', 'Quotenmeter', 'kress', 'meedia', 'turi2'],
-        'uk': ['Guardian Media'],
-        'usa': ['Variety', 'Deadline', 'Hollywood Reporter']
-    }
-    
     deutschland = []
     uk = []
     usa = []
@@ -918,11 +1043,11 @@ def sortiere_nach_region(artikel_liste):
     for artikel in artikel_liste:
         source = artikel['source']
         
-        if source in regionen['deutschland']:
+        if source in REGIONEN['deutschland']:
             deutschland.append(artikel)
-        elif source in regionen['uk']:
+        elif source in REGIONEN['uk']:
             uk.append(artikel)
-        elif source in regionen['usa']:
+        elif source in REGIONEN['usa']:
             usa.append(artikel)
     
     deutschland.sort(key=lambda x: x['source'])
@@ -936,29 +1061,33 @@ def sortiere_nach_region(artikel_liste):
 # ============================================================================
 
 def speichere_als_json(artikel_liste):
-    """Speichere relevante Artikel als JSON - sortiert nach Region"""
+    """
+    Speichere relevante Artikel als JSON - sortiert nach Region
+    Schema und Format-Version aus newsletter_archiv.py: stabile Artikel-IDs, Region
+    pro Artikel und vorberechnete Statistiken, minifiziert
+    """
     
     heute = datetime.now().strftime('%Y-%m-%d')
-    filename = f'newsletter-{heute}.json'
+    os.makedirs(DOCS_VERZEICHNIS, exist_ok=True)
+    filename = os.path.join(DOCS_VERZEICHNIS, f'newsletter-{heute}.json')
     
     artikel_liste_sortiert = sortiere_nach_region(artikel_liste)
     
-    data = {
-        'date': heute,
-        'articles': []
-    }
+    data = baue_newsletter(heute, artikel_liste_sortiert, datetime.now().isoformat(timespec='seconds'))
     
-    for artikel in artikel_liste_sortiert:
-        data['articles'].append({
-            'source': artikel['source'],
-            'title': artikel['title'],
-            'link': artikel['link'],
-            'summary': artikel.get('summary', 'Keine Zusammenfassung verfügbar'),
-            'score': artikel['score']
-        })
+    # Per-Empfänger Reihenfolge (Indizes in 'articles') aus den Per-User Boosts,
+    # unter der pseudonymen Nutzer-ID (newsletter_nutzer.py) - die Datei ist öffentlich
+    if LEARNING_RULES.get('user_keyword_boosts'):
+        data['personalisiert'] = {}
+        positionen = {id(artikel): idx for idx, artikel in enumerate(artikel_liste_sortiert)}
+        for email in EMPFAENGER.values():
+            user_id = nutzer_id(email)
+            if user_id in LEARNING_RULES['user_keyword_boosts']:
+                ranking = personalisiere_ranking(artikel_liste_sortiert, email)
+                data['personalisiert'][user_id] = [positionen[id(a)] for a in ranking]
     
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(serialisiere(data))
     
     print(f"✅ JSON gespeichert: {filename}")
     
@@ -966,64 +1095,61 @@ def speichere_als_json(artikel_liste):
 
 def aktualisiere_newsletter_index():
     """
-    Aktualisiert die Index-Dateien für die Webseite:
+    Aktualisiert die Index-Dateien für die Webseite (inkrementell, siehe newsletter_index.py):
     - newsletter-index.json: Liste aller verfügbaren Daten  
-    - newsletter-data.json: Kombinierte Daten aller Newsletter
+    - data/newsletter-YYYY-MM.json: Monats-Shards mit allen Newslettern eines Monats
+    - archiv-manifest.json: Daten, Artikelzahlen und Shard-Pfade
+    - suche/: Invertierter Suchindex für die Volltextsuche im Archiv
+    - d/YYYY-MM-DD.html: Vorgerenderte statische Seite pro Tag (inkl. der heute gespeicherten JSON)
+    Nur neue/geänderte Tage werden geparst, unveränderte Dateien nicht neu geschrieben
+    Danach: Assets und Daten mit Content-Hash veröffentlichen (newsletter_assets.py)
     """
-    import glob
-    
-    # Finde alle Newsletter-JSON-Dateien
-    newsletter_dateien = sorted(glob.glob('newsletter-20*.json'), reverse=True)
-    
-    if not newsletter_dateien:
-        print("⚠️ Keine Newsletter-Dateien gefunden")
-        return
-    
-    # Erstelle newsletter-index.json (Liste aller Daten)
-    index_data = {
-        'dates': []
-    }
-    
-    # Erstelle newsletter-data.json (alle Artikel kombiniert)
-    all_data = {
-        'newsletters': []
-    }
-    
-    for datei in newsletter_dateien:
-        # Extrahiere Datum aus Dateiname (z.B. newsletter-2025-11-25.json -> 2025-11-25)
-        datum = datei.replace('newsletter-', '').replace('.json', '')
-        index_data['dates'].append(datum)
-        
-        # Lade Newsletter-Daten
-        try:
-            with open(datei, 'r', encoding='utf-8') as f:
-                newsletter_data = json.load(f)
-                all_data['newsletters'].append(newsletter_data)
-        except Exception as e:
-            print(f"⚠️ Fehler beim Laden von {datei}: {e}")
-    
-    # Speichere newsletter-index.json
     try:
-        with open('newsletter-index.json', 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=2)
-        print(f"✅ Index aktualisiert: {len(index_data['dates'])} Newsletter")
+        aktualisiere_index(DOCS_VERZEICHNIS)
     except Exception as e:
-        print(f"❌ Fehler beim Speichern von newsletter-index.json: {e}")
-    
-    # Speichere newsletter-data.json
+        print(f"❌ Fehler beim Aktualisieren des Newsletter-Index: {e}")
+
     try:
-        with open('newsletter-data.json', 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=2)
-        print(f"✅ Daten-Archiv aktualisiert: {len(all_data['newsletters'])} Newsletter")
+        veroeffentliche_assets(DOCS_VERZEICHNIS)
     except Exception as e:
-        print(f"❌ Fehler beim Speichern von newsletter-data.json: {e}")
+        print(f"❌ Fehler beim Veröffentlichen der Assets: {e}")
 
 # ============================================================================
 # EMAIL VERSAND
 # ============================================================================
 
-def erstelle_html_email(anzahl_artikel, empfaenger_name, datum):
-    """Sendet kurze Email mit Link zur Webseite"""
+# Platzhalter in der Email-Vorlage - pro Empfänger ersetzt
+PLATZHALTER_NAME = '{{empfaenger_name}}'
+PLATZHALTER_TOP = '{{top_artikel}}'
+
+def erstelle_top_html(top_artikel):
+    """
+    Block mit den persönlichen Top-Artikeln (leer ohne Personalisierung)
+    Titel, Link und Quelle kommen aus fremden Feeds - alles wird escaped, Links nur http(s)
+    """
+    if not top_artikel:
+        return ""
+    eintraege = ''.join(
+        f'<li><a href="{escape(sicherer_link(a.get("link")), quote=True)}">{escape(a.get("title") or "", quote=True)}</a> '
+        f'<span class="top-source">{escape(a.get("source") or "", quote=True)}</span></li>'
+        for a in top_artikel
+    )
+    return f'''
+                <div class="top-box">
+                    <div class="top-title">Deine Top-Artikel heute</div>
+                    <ol>{eintraege}</ol>
+                </div>'''
+
+def personalisiere_email(vorlage, empfaenger_name, top_artikel=None):
+    """Setzt Name und Top-Artikel in die einmal gerenderte Vorlage ein"""
+    return vorlage.replace(PLATZHALTER_NAME, empfaenger_name).replace(PLATZHALTER_TOP, erstelle_top_html(top_artikel))
+
+def erstelle_html_email(anzahl_artikel, empfaenger_name, datum, top_artikel=None):
+    """Sendet kurze Email mit Link zur Webseite (optional mit persönlichen Top-Artikeln)"""
+    return personalisiere_email(erstelle_email_vorlage(anzahl_artikel, datum), empfaenger_name, top_artikel)
+
+def erstelle_email_vorlage(anzahl_artikel, datum):
+    """Email-HTML mit Platzhaltern für Name und Top-Artikel - einmal pro Versand gerendert"""
     
     # Link OHNE date-Parameter -> lädt automatisch die heutige JSON-Datei
     newsletter_link = f"{NEWSLETTER_URL}"
@@ -1103,6 +1229,24 @@ def erstelle_html_email(anzahl_artikel, empfaenger_name, datum):
                 margin: 20px 0;
                 transition: background 0.3s;
             }}
+            .top-box {{
+                margin: 30px 0;
+            }}
+            .top-title {{
+                font-weight: bold;
+                color: #181716;
+                margin-bottom: 10px;
+            }}
+            .top-box li {{
+                margin-bottom: 8px;
+            }}
+            .top-box a {{
+                color: #181716;
+            }}
+            .top-source {{
+                color: #999;
+                font-size: 12px;
+            }}
             .tip {{
                 background: #fff9e6;
                 border-left: 3px solid #ffd01d;
@@ -1129,7 +1273,7 @@ def erstelle_html_email(anzahl_artikel, empfaenger_name, datum):
             
             <div class="content">
                 <div class="greeting">
-                    Guten Morgen {empfaenger_name}! 👋
+                    Guten Morgen {PLATZHALTER_NAME}! 👋
                 </div>
                 
                 <div class="stats-box">
@@ -1138,6 +1282,7 @@ def erstelle_html_email(anzahl_artikel, empfaenger_name, datum):
                 </div>
                 
                 <p>Dein personalisierter Newsletter ist bereit! Alle Artikel wurden intelligent zusammengefasst und warten auf dich.</p>
+                {PLATZHALTER_TOP}
                 
                 <center>
                     <a href="{newsletter_link}" class="button">
@@ -1162,59 +1307,115 @@ def erstelle_html_email(anzahl_artikel, empfaenger_name, datum):
     return html
 
 def versende_newsletter(artikel_liste):
-    """Versende kurze Newsletter-Email mit Link zur Website"""
+    """
+    Versende kurze Newsletter-Email mit Link zur Website
+    Vorlage einmal rendern, pro Empfänger nur Name/Top-Artikel einsetzen,
+    Versand über wiederverwendete SMTP-Verbindungen (email_versand.py)
+    Empfänger, die dieser Lauf schon erreicht hat (Checkpoint), werden übersprungen
+    Returns: Anzahl erfolgreich gesendeter Emails (inkl. bereits gesendeter)
+    """
     
     if not artikel_liste:
         print("⚠️ Keine relevanten Artikel - kein Newsletter versendet")
-        return
+        return 0
     
     print(f"\n📧 VERSENDE EMAILS")
     print("="*70)
     
     heute = datetime.now().strftime('%Y-%m-%d')
     anzahl_artikel = len(artikel_liste)
+    vorlage = erstelle_email_vorlage(anzahl_artikel, heute)
+    betreff = f"🎬 Zoo Medien Newsletter · {anzahl_artikel} Artikel · {datetime.now().strftime('%d.%m.%Y')}"
+    user_boosts = LEARNING_RULES.get('user_keyword_boosts', {})
     
+    nachrichten = []
+    bereits_gesendet = 0
     for name, email in EMPFAENGER.items():
-        print(f"📧 Sende an {name}...")
+        if CHECKPOINTS and CHECKPOINTS['lade']('email', email):
+            print(f"   ♻️ {name}: bereits gesendet")
+            bereits_gesendet += 1
+            continue
         
-        try:
-            html_content = erstelle_html_email(anzahl_artikel, name, heute)
-            
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"🎬 Zoo Medien Newsletter · {anzahl_artikel} Artikel · {datetime.now().strftime('%d.%m.%Y')}"
-            msg['From'] = GMAIL_USER
-            msg['To'] = email
-            
-            msg.attach(MIMEText(html_content, 'html', 'utf-8'))
-            
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-                server.send_message(msg)
-            
-            print(f"   ✅ Gesendet!\n")
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"   ❌ Fehler: {e}\n")
+        # Persönliches Ranking aus der gemeinsamen bewerteten Liste
+        top_artikel = None
+        if nutzer_id(email) in user_boosts:
+            top_artikel = personalisiere_ranking(artikel_liste, email)[:PERSONAL_TOP_N]
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = betreff
+        msg['From'] = GMAIL_USER
+        msg['To'] = email
+        msg.attach(MIMEText(personalisiere_email(vorlage, name, top_artikel), 'html', 'utf-8'))
+        nachrichten.append((name, msg))
+    
+    if not nachrichten:
+        return bereits_gesendet
+    
+    def gesendet(name):
+        # Sofort pro Email - bricht der Lauf mitten im Versand ab, bekommt niemand sie doppelt
+        if CHECKPOINTS:
+            CHECKPOINTS['speichere']('email', EMPFAENGER[name], True)
+    
+    ergebnisse = versende_nachrichten(nachrichten, GMAIL_USER, GMAIL_APP_PASSWORD, bei_erfolg=gesendet)
+    return bereits_gesendet + sum(1 for fehler in ergebnisse.values() if fehler is None)
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
 def main():
+    """
+    Tageslauf mit Trace - die Trace-Datei wird auch bei Abbruch geschrieben
+    Mit NEWSLETTER_PROFIL=1 zusätzlich CPU- und Speicher-Profil pro Stufe (newsletter_profil.py)
+    """
+    heute = datetime.now().strftime('%Y-%m-%d')
+    # Parser-Prozesse zuerst - sie werden geforkt, solange noch kein Thread läuft
+    parser_prozesse = starte_parser()
+    starte_trace(heute)
+    starte_profil('newsletter', heute)
+    try:
+        with span('lauf', heute, pipeline=PIPELINE_MODUS, dienste=DIENSTE_MODUS, parser_prozesse=parser_prozesse):
+            newsletter_lauf(heute)
+    finally:
+        pfad = schreibe_trace()
+        if pfad:
+            print(f"🧭 Trace: {pfad}")
+        beende_profil()
+        beende_parser()
+
+def newsletter_lauf(heute):
+    global CHECKPOINTS
+    
     print("\n" + "="*70)
     print("🎬 ZOO MEDIEN NEWSLETTER - MIT ARCHIV-SYSTEM")
     if LEARNING_RULES:
         print("🎓 Learning Rules aktiv")
-    if SUPABASE_AVAILABLE:
-        print("💾 Archiv-System aktiv")
+    if ARCHIV_AVAILABLE:
+        print(f"💾 Archiv-System aktiv ({ARCHIV['name']})")
+    if DIENSTE_MODUS != 'live':
+        print(f"🔌 Externe Dienste: {DIENSTE_MODUS}")
     print("="*70 + "\n")
     
+    # Checkpoints: ein abgebrochener Lauf vom selben Tag wird fortgesetzt
+    CHECKPOINTS = starte_checkpoints(heute)
+    
+    # Claude-Abrechnung: Tages-Budget zählt Tokens eines abgebrochenen Laufs von heute mit
+    if CHECKPOINTS:
+        starte_abrechnung(CHECKPOINTS['lade']('llm', 'tokens', 0),
+                          lambda tokens: CHECKPOINTS['speichere']('llm', 'tokens', tokens))
+    else:
+        starte_abrechnung()
+    
     print("🤖 SAMMLE UND BEWERTE ARTIKEL")
     print("="*70)
     
-    # 1. Sammle alle Artikel
-    alle_artikel = sammle_artikel()
+    # 1.+2. Sammle, bewerte und fasse zusammen (mit Duplikat-Check)
+    if PIPELINE_MODUS == 'stream':
+        with profil_stufe('pipeline'):
+            alle_artikel, relevante_artikel, _ = verarbeite_artikel_stream()
+    else:
+        alle_artikel = sammle_artikel()
+        relevante_artikel = verarbeite_artikel(alle_artikel) if alle_artikel else []
     
     if not alle_artikel:
         print("❌ Keine Artikel gefunden")
@@ -1231,9 +1432,6 @@ def main():
         'error': None
     }
     
-    # 2. Bewerte und erstelle Zusammenfassungen (mit Duplikat-Check)
-    relevante_artikel = verarbeite_artikel(alle_artikel)
-    
     # Update Stats
     stats['relevant'] = len([a for a in alle_artikel if a.get('score', 0) >= 7])
     stats['new'] = len(relevante_artikel)
@@ -1243,52 +1441,61 @@ def main():
         print("\n⚠️ Keine relevanten Artikel heute (Score < 7)")
         return
     
-    # 3. Archiviere Artikel in Supabase
-    heute = datetime.now().strftime('%Y-%m-%d')
-    
-    if SUPABASE_AVAILABLE:
+    # 3. Archiviere Artikel (Supabase oder lokal)
+    if ARCHIV_AVAILABLE:
         print(f"\n💾 ARCHIVIERE {len(relevante_artikel)} ARTIKEL")
         print("="*70)
         
-        regionen = {
-            'deutschland': ['DWDL', 'Horizont Medien', 'W&V', 'Quotenmeter', 'kress', 'meedia', 'turi2'],
-            'uk': ['Guardian Media'],
-            'usa': ['Variety', 'Deadline', 'Hollywood Reporter']
-        }
-        
         archiviert_count = 0
-        for artikel in relevante_artikel:
-            source = artikel['source']
-            region = 'deutschland' if source in regionen['deutschland'] else \
-                     'uk' if source in regionen['uk'] else 'usa'
-            
-            if speichere_artikel_im_archiv(artikel, heute, region):
-                print(f"✓ {artikel['title'][:50]}...")
-                archiviert_count += 1
+        with span('stufe', 'archivieren'), profil_stufe('archivieren'):
+            for artikel in relevante_artikel:
+                region = region_von(artikel['source'])
+                schluessel = artikel_schluessel(artikel)
+                
+                if CHECKPOINTS and CHECKPOINTS['lade']('archiviert', schluessel):
+                    archiviert_count += 1
+                elif speichere_artikel_im_archiv(artikel, heute, region):
+                    print(f"✓ {artikel['title'][:50]}...")
+                    archiviert_count += 1
+                    if CHECKPOINTS:
+                        CHECKPOINTS['speichere']('archiviert', schluessel, True)
         
         print(f"\n✅ {archiviert_count}/{len(relevante_artikel)} Artikel archiviert")
-        
-        # Speichere Run-Metadata
-        speichere_run_metadata(heute, stats)
     
     # 4. Speichere JSON
     print("\n")
-    filename = speichere_als_json(relevante_artikel)
+    with span('stufe', 'json'), profil_stufe('json'):
+        filename = speichere_als_json(relevante_artikel)
     
     # 5. Aktualisiere Index-Dateien für Webseite
-    aktualisiere_newsletter_index()
+    with span('stufe', 'index'), profil_stufe('index'):
+        aktualisiere_newsletter_index()
     
     # 6. Versende Newsletter
-    versende_newsletter(relevante_artikel)
+    with span('stufe', 'versand', empfaenger=len(EMPFAENGER)), profil_stufe('versand'):
+        gesendet = versende_newsletter(relevante_artikel)
+    
+    # Timing aller Stufen, Quellen und externen Aufrufe (newsletter_trace.py)
+    stats['timing'] = trace_zusammenfassung()
+    drucke_trace_zusammenfassung(stats['timing'])
+    
+    # Tokens, Kosten und Latenz der Claude-Aufrufe (claude_verbrauch.py)
+    stats['llm'] = verbrauch_zusammenfassung()
+    drucke_verbrauch(stats['llm'])
+    
+    # Speichere Run-Metadata mit Timing (einmal pro Lauf-Datum)
+    if ARCHIV_AVAILABLE and not (CHECKPOINTS and CHECKPOINTS['lade']('run', heute)):
+        if speichere_run_metadata(heute, stats) and CHECKPOINTS:
+            CHECKPOINTS['speichere']('run', heute, True)
     
     # 7. Zusammenfassung
     print("\n" + "="*70)
     print("🎉 NEWSLETTER VERSENDET!")
     print("="*70)
-    print(f"✅ {len(EMPFAENGER)}/{len(EMPFAENGER)} Emails gesendet")
+    print(f"✅ {gesendet}/{len(EMPFAENGER)} Emails gesendet")
     print(f"📄 Datei: {filename}")
     print(f"🌐 Web: {NEWSLETTER_URL}/?date={heute}")
-    if SUPABASE_AVAILABLE:
+    if ARCHIV_AVAILABLE:
         print(f"💾 Archiv: {len(relevante_artikel)} neue Artikel, {stats['duplicates']} Duplikate gefiltert")
     print("="*70 + "\n")
 
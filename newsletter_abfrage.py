@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Lokale Abfragen über das Archiv in docs/
+Persistenter SQLite-Index (mit FTS5-Volltextsuche) über alle docs/newsletter-*.json:
+- Filter nach Zeitraum, Quelle, Region, Score und Text
+- Abfragen in Millisekunden statt hunderte JSON-Dateien zu laden
+- Inkrementell: nur neue/geänderte Tage werden (neu) eingelesen
+
+Beispiel:
+    from newsletter_abfrage import suche
+    suche(text='netflix', quellen=['Deadline'], min_score=9, seit='2026-01-01', bis='2026-03-31')
+
+CLI:
+    python newsletter_abfrage.py netflix --quelle Deadline --min-score 9 --seit 2026-01-01 --bis 2026-03-31
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import argparse
+
+from newsletter_archiv import DOCS_VERZEICHNIS, finde_tagesdateien, lade_tag
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+ABFRAGE_DB = os.environ.get('ARCHIV_ABFRAGE_DB', 'newsletter_archiv.sqlite')
+ABFRAGE_SCHEMA_VERSION = 1
+
+ABFRAGE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tage (
+    datum TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    anzahl INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artikel (
+    rowid INTEGER PRIMARY KEY,
+    datum TEXT NOT NULL REFERENCES tage(datum) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    region TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    summary TEXT,
+    score REAL NOT NULL,
+    reasoning TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_artikel_datum ON artikel(datum);
+CREATE INDEX IF NOT EXISTS idx_artikel_source ON artikel(source, datum);
+CREATE INDEX IF NOT EXISTS idx_artikel_region ON artikel(region, datum);
+CREATE INDEX IF NOT EXISTS idx_artikel_score ON artikel(score);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS artikel_fts USING fts5(
+    title, summary, source,
+    content='artikel', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS artikel_ai AFTER INSERT ON artikel BEGIN
+    INSERT INTO artikel_fts(rowid, title, summary, source)
+    VALUES (new.rowid, new.title, new.summary, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS artikel_ad AFTER DELETE ON artikel BEGIN
+    INSERT INTO artikel_fts(artikel_fts, rowid, title, summary, source)
+    VALUES ('delete', old.rowid, old.title, old.summary, old.source);
+END;
+"""
+
+SPALTEN = ('datum', 'position', 'id', 'region', 'source', 'title', 'link', 'summary', 'score', 'reasoning')
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def oeffne_abfrage_db(pfad=ABFRAGE_DB):
+    """Öffnet (und initialisiert) den lokalen Abfrage-Index"""
+    conn = sqlite3.connect(pfad)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != ABFRAGE_SCHEMA_VERSION:
+        # Neues Schema → Index komplett neu aufbauen
+        conn.executescript(
+            'DROP TABLE IF EXISTS artikel_fts; DROP TABLE IF EXISTS artikel; DROP TABLE IF EXISTS tage;'
+        )
+        conn.execute(f'PRAGMA user_version = {ABFRAGE_SCHEMA_VERSION}')
+    conn.executescript(ABFRAGE_SCHEMA)
+    return conn
+
+
+def aktualisiere_abfrage_index(conn, verzeichnis=DOCS_VERZEICHNIS):
+    """
+    Gleicht den Index mit den Tagesdateien ab (SHA-256 pro Datei)
+    Returns: Liste der neu eingelesenen Daten
+    """
+    tage = finde_tagesdateien(verzeichnis)
+    bekannt = dict(conn.execute('SELECT datum, sha256 FROM tage'))
+    eingelesen = []
+
+    with conn:
+        for datum in sorted(set(bekannt) - set(tage)):
+            conn.execute('DELETE FROM artikel WHERE datum = ?', (datum,))
+            conn.execute('DELETE FROM tage WHERE datum = ?', (datum,))
+
+        for datum, name in sorted(tage.items()):
+            pfad = os.path.join(verzeichnis, name)
+            with open(pfad, 'rb') as f:
+                sha = hashlib.sha256(f.read()).hexdigest()
+            if bekannt.get(datum) == sha:
+                continue
+            try:
+                newsletter = lade_tag(pfad, datum)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"⚠️ {name} übersprungen: {e}")
+                continue
+
+            conn.execute('DELETE FROM artikel WHERE datum = ?', (datum,))
+            conn.execute('INSERT OR REPLACE INTO tage (datum, sha256, anzahl) VALUES (?, ?, ?)',
+                         (datum, sha, len(newsletter['articles'])))
+            conn.executemany(
+                f"INSERT INTO artikel ({', '.join(SPALTEN)}) VALUES ({', '.join('?' * len(SPALTEN))})",
+                [
+                    (datum, position, a['id'], a['region'], a['source'], a['title'], a['link'],
+                     a.get('summary'), a['score'], a.get('reasoning'))
+                    for position, a in enumerate(newsletter['articles'])
+                ]
+            )
+            eingelesen.append(datum)
+
+    if eingelesen:
+        print(f"✅ Abfrage-Index: {len(eingelesen)} Tage eingelesen")
+    return eingelesen
+
+
+# ============================================================================
+# ABFRAGEN
+# ============================================================================
+
+def fts_ausdruck(text):
+    """Freitext → FTS5-Ausdruck: alle Wörter müssen vorkommen, jeweils als Wortanfang"""
+    woerter = re.findall(r'\w+', text.lower())
+    return ' '.join(f'"{wort}"*' for wort in woerter)
+
+
+def suche_artikel(conn, text=None, seit=None, bis=None, quellen=None, regionen=None,
+                  min_score=None, max_score=None, limit=100):
+    """
+    Sucht Artikel im Abfrage-Index
+    Ohne text: neueste zuerst; mit text: nach FTS-Relevanz (bm25, Titel gewichtet)
+    Returns: Liste von Dicts (datum, position, id, region, source, title, link, summary, score, ...)
+    """
+    bedingungen = []
+    parameter = []
+
+    if text and fts_ausdruck(text):
+        von = 'artikel_fts JOIN artikel a ON a.rowid = artikel_fts.rowid'
+        bedingungen.append('artikel_fts MATCH ?')
+        parameter.append(fts_ausdruck(text))
+        sortierung = 'bm25(artikel_fts, 3.0, 1.0, 2.0), a.datum DESC'
+    else:
+        von = 'artikel a'
+        sortierung = 'a.datum DESC, a.position'
+
+    if seit:
+        bedingungen.append('a.datum >= ?')
+        parameter.append(str(seit))
+    if bis:
+        bedingungen.append('a.datum <= ?')
+        parameter.append(str(bis))
+    if quellen:
+        bedingungen.append(f"a.source IN ({', '.join('?' * len(quellen))})")
+        parameter.extend(quellen)
+    if regionen:
+        bedingungen.append(f"a.region IN ({', '.join('?' * len(regionen))})")
+        parameter.extend(regionen)
+    if min_score is not None:
+        bedingungen.append('a.score >= ?')
+        parameter.append(min_score)
+    if max_score is not None:
+        bedingungen.append('a.score <= ?')
+        parameter.append(max_score)
+
+    sql = f"SELECT {', '.join('a.' + s for s in SPALTEN)} FROM {von}"
+    if bedingungen:
+        sql += ' WHERE ' + ' AND '.join(bedingungen)
+    sql += f' ORDER BY {sortierung} LIMIT ?'
+    parameter.append(limit)
+
+    return [dict(zeile) for zeile in conn.execute(sql, parameter)]
+
+
+def suche(verzeichnis=DOCS_VERZEICHNIS, db_pfad=ABFRAGE_DB, **filter):
+    """Öffnet den Index, aktualisiert ihn inkrementell und sucht (siehe suche_artikel)"""
+    conn = oeffne_abfrage_db(db_pfad)
+    try:
+        aktualisiere_abfrage_index(conn, verzeichnis)
+        return suche_artikel(conn, **filter)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Durchsucht das Newsletter-Archiv in docs/')
+    parser.add_argument('text', nargs='*', help='Suchbegriffe (Titel, Zusammenfassung, Quelle)')
+    parser.add_argument('--seit', help='YYYY-MM-DD')
+    parser.add_argument('--bis', help='YYYY-MM-DD')
+    parser.add_argument('--quelle', action='append', dest='quellen')
+    parser.add_argument('--region', action='append', dest='regionen', choices=['deutschland', 'uk', 'usa'])
+    parser.add_argument('--min-score', type=float)
+    parser.add_argument('--max-score', type=float)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben')
+    parser.add_argument('--verzeichnis', default=DOCS_VERZEICHNIS)
+    args = parser.parse_args()
+
+    treffer = suche(
+        args.verzeichnis, text=' '.join(args.text), seit=args.seit, bis=args.bis,
+        quellen=args.quellen, regionen=args.regionen, min_score=args.min_score,
+        max_score=args.max_score, limit=args.limit
+    )
+    if args.json:
+        print(json.dumps(treffer, ensure_ascii=False, indent=2))
+    else:
+        for t in treffer:
+            print(f"{t['datum']}  {t['score']:>4.0f}  {t['source']:<18} {t['title']}")
+        print(f"\n{len(treffer)} Treffer")
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Archiv-Format, Migration und Loader
+Die Tagesdateien docs/newsletter-YYYY-MM-DD.json gibt es in drei Schemata:
+- flach: {date, articles: [{source, title, link, summary, score}]}
+- nach Regionen: {date, total_articles, regions: {deutschland: {count, articles: [... reasoning]}}}
+- deutsch: {id, datum, generiert_am, anzahl_artikel, artikel: [{titel, quelle, zusammenfassung, ...}]}
+
+Dieses Modul definiert EIN versioniertes Schema (FORMAT_VERSION) und bietet:
+- normalisiere_newsletter(): jedes Schema → aktuelles Schema
+- pruefe_newsletter(): Validierung
+- lade_tag() / lade_archiv() / iter_artikel(): Loader für Indexer und Analysen
+- migriere_archiv(): schreibt alle Tagesdateien in einem Durchlauf minifiziert neu
+
+Nur Standardbibliothek - kann ohne die Newsletter-Abhängigkeiten importiert werden.
+
+Migration: python newsletter_archiv.py [--dry-run] [verzeichnis]
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+DOCS_VERZEICHNIS = os.environ.get('NEWSLETTER_DOCS_DIR', 'docs')
+
+FORMAT_VERSION = 2
+
+TAGESDATEI_PATTERN = re.compile(r'^newsletter-(\d{4}-\d{2}-\d{2})\.json$')
+ID_PATTERN = re.compile(r'^[0-9a-f]{12}(-\d+)?$')
+
+# Regionen für Sortierung, Archiv und Newsletter-JSON
+REGIONEN = {
+    'deutschland': ['DWDL', 'Horizont Medien', 'W&V', 'Quotenmeter', 'kress', 'meedia', 'turi2'],
+    'uk': ['Guardian Media'],
+    'usa': ['Variety', 'Deadline', 'Hollywood Reporter']
+}
+
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+def region_von(source):
+    """Region einer Quelle - unbekannte Quellen zählen wie bisher im Archiv zu 'usa'"""
+    for region, quellen in REGIONEN.items():
+        if source in quellen:
+            return region
+    return 'usa'
+
+
+def artikel_id(artikel):
+    """Stabile Artikel-ID: Hash der URL (gleicher Artikel → gleiche ID über alle Läufe)"""
+    schluessel = artikel.get('link') or f"{artikel.get('source')}|{artikel.get('title')}"
+    return hashlib.sha256(schluessel.strip().encode('utf-8')).hexdigest()[:12]
+
+
+def vergebe_ids(artikel_liste):
+    """Setzt 'id' für alle Artikel - doppelte Links am selben Tag bekommen -2, -3, ..."""
+    gesehen = {}
+    for artikel in artikel_liste:
+        basis = artikel_id(artikel)
+        gesehen[basis] = gesehen.get(basis, 0) + 1
+        artikel['id'] = basis if gesehen[basis] == 1 else f"{basis}-{gesehen[basis]}"
+    return artikel_liste
+
+
+def durchschnitt_score(artikel_liste):
+    scores = [a['score'] for a in artikel_liste]
+    return round(sum(scores) / len(scores), 1) if scores else 0
+
+
+def berechne_stats(artikel_liste):
+    """Anzahl und Ø Score gesamt und pro Region"""
+    stats = {
+        'total': len(artikel_liste),
+        'avg_score': durchschnitt_score(artikel_liste),
+        'regions': {}
+    }
+    for region in REGIONEN:
+        region_artikel = [a for a in artikel_liste if a['region'] == region]
+        if region_artikel:
+            stats['regions'][region] = {
+                'count': len(region_artikel),
+                'avg_score': durchschnitt_score(region_artikel)
+            }
+    return stats
+
+
+def baue_newsletter(datum, artikel_liste, generated_at=None):
+    """Newsletter im aktuellen Schema aus bereits sortierten Artikeln"""
+    artikel_liste = vergebe_ids([
+        {
+            'region': a.get('region') or region_von(a['source']),
+            'source': a['source'],
+            'title': a['title'],
+            'link': a['link'],
+            'summary': a.get('summary') or 'Keine Zusammenfassung verfügbar',
+            'score': a['score'],
+            **({'reasoning': a['reasoning']} if a.get('reasoning') else {})
+        }
+        for a in artikel_liste
+    ])
+    # id als erstes Feld - liest sich besser in den minifizierten Dateien
+    artikel_liste = [{'id': a.pop('id'), **a} for a in artikel_liste]
+
+    newsletter = {
+        'format_version': FORMAT_VERSION,
+        'date': datum,
+        'stats': berechne_stats(artikel_liste),
+        'articles': artikel_liste
+    }
+    if generated_at:
+        newsletter['generated_at'] = generated_at
+    return newsletter
+
+
+def normalisiere_newsletter(daten, datum=None):
+    """
+    Beliebiges Schema → aktuelles Schema
+    Dateien im aktuellen Schema werden unverändert zurückgegeben (schneller Pfad)
+    """
+    if daten.get('format_version') == FORMAT_VERSION:
+        return daten
+
+    if daten.get('artikel') is not None:
+        # Deutsches Schema (November 2025)
+        artikel_liste = [{
+            'source': a.get('quelle'),
+            'title': a.get('titel'),
+            'link': a.get('link'),
+            'summary': a.get('zusammenfassung'),
+            'score': a.get('score')
+        } for a in daten['artikel']]
+        return baue_newsletter(datum or daten.get('id'), artikel_liste, daten.get('generiert_am'))
+
+    if daten.get('regions') is not None:
+        # Regionen-Schema: Region aus dem Schlüssel, reasoning bleibt erhalten.
+        # Reihenfolge aus 'articles', falls vorhanden - darauf beziehen sich die
+        # Bewertungen (artikel_id = Position)
+        nach_link = {
+            a.get('link'): {**a, 'region': region}
+            for region, inhalt in daten['regions'].items()
+            for a in inhalt.get('articles', [])
+        }
+        if daten.get('articles'):
+            artikel_liste = [{**nach_link.get(a.get('link'), {}), **a} for a in daten['articles']]
+        else:
+            artikel_liste = list(nach_link.values())
+        return baue_newsletter(datum or daten.get('date'), artikel_liste, daten.get('generated_at'))
+
+    # Flaches Schema (auch Version 2 ohne format_version, z.B. halb migriert)
+    return baue_newsletter(datum or daten.get('date'), daten.get('articles', []), daten.get('generated_at'))
+
+
+def pruefe_newsletter(newsletter, datum=None):
+    """
+    Validiert einen Newsletter im aktuellen Schema
+    Returns: Liste von Fehlermeldungen (leer = gültig)
+    """
+    fehler = []
+    if newsletter.get('format_version') != FORMAT_VERSION:
+        fehler.append(f"format_version {newsletter.get('format_version')!r} statt {FORMAT_VERSION}")
+    if datum and newsletter.get('date') != datum:
+        fehler.append(f"date {newsletter.get('date')!r} passt nicht zum Dateinamen ({datum})")
+    try:
+        datetime.strptime(newsletter.get('date') or '', '%Y-%m-%d')
+    except ValueError:
+        fehler.append(f"ungültiges date {newsletter.get('date')!r}")
+
+    artikel_liste = newsletter.get('articles')
+    if not isinstance(artikel_liste, list):
+        return fehler + ['articles fehlt']
+
+    ids = set()
+    for i, a in enumerate(artikel_liste):
+        if not ID_PATTERN.match(str(a.get('id', ''))):
+            fehler.append(f"Artikel {i}: ungültige id {a.get('id')!r}")
+        elif a['id'] in ids:
+            fehler.append(f"Artikel {i}: doppelte id {a['id']}")
+        ids.add(a.get('id'))
+        if a.get('region') not in REGIONEN:
+            fehler.append(f"Artikel {i}: unbekannte Region {a.get('region')!r}")
+        for feld in ('source', 'title', 'link', 'summary'):
+            if not isinstance(a.get(feld), str) or not a[feld].strip():
+                fehler.append(f"Artikel {i}: {feld} fehlt")
+        if isinstance(a.get('link'), str) and not a['link'].startswith(('http://', 'https://')):
+            fehler.append(f"Artikel {i}: link ist keine URL")
+        score = a.get('score')
+        if not isinstance(score, (int, float)) or isinstance(score, bool) or not 0 <= score <= 10:
+            fehler.append(f"Artikel {i}: score {score!r} nicht in 0-10")
+
+    if not fehler and newsletter.get('stats') != berechne_stats(artikel_liste):
+        fehler.append('stats passen nicht zu den Artikeln')
+    return fehler
+
+
+def serialisiere(newsletter):
+    """Minifiziertes JSON (UTF-8, ohne Einrückung)"""
+    return json.dumps(newsletter, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+# ============================================================================
+# LOADER
+# ============================================================================
+
+def finde_tagesdateien(verzeichnis=DOCS_VERZEICHNIS):
+    """Returns: {datum: dateiname} aller newsletter-YYYY-MM-DD.json"""
+    tage = {}
+    for name in os.listdir(verzeichnis):
+        match = TAGESDATEI_PATTERN.match(name)
+        if match:
+            tage[match.group(1)] = name
+    return tage
+
+
+def lade_tag(pfad, datum=None):
+    """Lädt eine Tagesdatei im aktuellen Schema (ältere Schemata werden im Speicher migriert)"""
+    with open(pfad, 'r', encoding='utf-8') as f:
+        daten = json.load(f)
+    if datum is None:
+        match = TAGESDATEI_PATTERN.match(os.path.basename(pfad))
+        datum = match.group(1) if match else None
+    return normalisiere_newsletter(daten, datum)
+
+
+def lade_archiv(verzeichnis=DOCS_VERZEICHNIS, seit=None, bis=None):
+    """
+    Generator über (datum, newsletter) in Datumsreihenfolge, optional nur [seit, bis]
+    Es ist immer nur ein Tag im Speicher
+    """
+    tage = finde_tagesdateien(verzeichnis)
+    for datum in sorted(tage):
+        if (seit and datum < str(seit)) or (bis and datum > str(bis)):
+            continue
+        yield datum, lade_tag(os.path.join(verzeichnis, tage[datum]), datum)
+
+
+def iter_artikel(verzeichnis=DOCS_VERZEICHNIS, seit=None, bis=None):
+    """Generator über alle Artikel als flache Dicts mit 'date' und 'index' (Position am Tag)"""
+    for datum, newsletter in lade_archiv(verzeichnis, seit, bis):
+        for index, artikel in enumerate(newsletter['articles']):
+            yield {'date': datum, 'index': index, **artikel}
+
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migriere_archiv(verzeichnis=DOCS_VERZEICHNIS, dry_run=False):
+    """
+    Schreibt alle Tagesdateien im aktuellen, minifizierten Schema neu
+    Ein Durchlauf, ein Tag im Speicher. Ungültige Tage werden nicht überschrieben.
+    Returns: dict mit Zählern (migriert, unveraendert, fehler, bytes_vorher, bytes_nachher)
+    """
+    ergebnis = {'migriert': 0, 'unveraendert': 0, 'fehler': 0, 'bytes_vorher': 0, 'bytes_nachher': 0}
+
+    for datum, name in sorted(finde_tagesdateien(verzeichnis).items()):
+        pfad = os.path.join(verzeichnis, name)
+        with open(pfad, 'rb') as f:
+            roh = f.read()
+        ergebnis['bytes_vorher'] += len(roh)
+
+        try:
+            newsletter = normalisiere_newsletter(json.loads(roh), datum)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"❌ {name}: nicht lesbar ({e})")
+            ergebnis['fehler'] += 1
+            ergebnis['bytes_nachher'] += len(roh)
+            continue
+
+        fehler = pruefe_newsletter(newsletter, datum)
+        if fehler:
+            print(f"❌ {name}: {len(fehler)} Fehler - {'; '.join(fehler[:3])}")
+            ergebnis['fehler'] += 1
+            ergebnis['bytes_nachher'] += len(roh)
+            continue
+
+        neu = serialisiere(newsletter).encode('utf-8')
+        ergebnis['bytes_nachher'] += len(neu)
+        if neu == roh:
+            ergebnis['unveraendert'] += 1
+            continue
+
+        ergebnis['migriert'] += 1
+        if not dry_run:
+            tmp_pfad = f"{pfad}.tmp"
+            with open(tmp_pfad, 'wb') as f:
+                f.write(neu)
+            os.replace(tmp_pfad, pfad)
+
+    aktion = "würden migriert" if dry_run else "migriert"
+    print(f"✅ {ergebnis['migriert']} Tage {aktion}, {ergebnis['unveraendert']} bereits aktuell, "
+          f"{ergebnis['fehler']} mit Fehlern")
+    print(f"   Größe: {ergebnis['bytes_vorher'] / 1024:.0f} KB → {ergebnis['bytes_nachher'] / 1024:.0f} KB")
+    return ergebnis
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Migriert docs/newsletter-*.json ins aktuelle Schema')
+    parser.add_argument('verzeichnis', nargs='?', default=DOCS_VERZEICHNIS)
+    parser.add_argument('--dry-run', action='store_true', help='Nur prüfen, nichts schreiben')
+    args = parser.parse_args()
+    ergebnis = migriere_archiv(args.verzeichnis, args.dry_run)
+    sys.exit(1 if ergebnis['fehler'] else 0)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Asset-Veröffentlichung für die Webseite
+Ersetzt die cp-Schritte im Workflow und das ?t=-Cache-Busting:
+- Logos, Fonts, CSS und die veränderlichen Daten-Dateien bekommen einen
+  Content-Hash im Namen (docs/assets/...) → unbegrenzt cachebar
+- Komprimierbare Dateien zusätzlich als .gz (und .br, falls brotli installiert)
+- docs/asset-manifest.json: logischer Name → gehashter Pfad (für JS)
+- Statische Verweise (href/src) in den HTML-Seiten werden umgeschrieben
+- Alte Versionen werden nach einer Generation gelöscht
+"""
+
+import os
+import re
+import glob
+import gzip
+import json
+import hashlib
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from newsletter_index import (
+    DOCS_VERZEICHNIS, INDEX_DATEI, ARCHIV_MANIFEST_DATEI, SHARD_VERZEICHNIS,
+    finde_tagesdateien, lese_json, schreibe_wenn_geaendert
+)
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+QUELL_VERZEICHNIS = os.path.dirname(os.path.abspath(__file__))
+
+ASSET_VERZEICHNIS = 'assets'
+ASSET_MANIFEST_DATEI = 'asset-manifest.json'
+ASSET_MANIFEST_VERSION = 1
+HASH_LAENGE = 10
+
+# Logos und Fonts liegen im Repo-Root, das Stylesheet in docs/
+STATISCHE_ASSETS = ['logo-*.png', 'fonts/*.woff2']
+STYLESHEET = 'newsletter.css'
+
+# PNG und WOFF2 sind bereits komprimiert
+KOMPRIMIERBAR = ('.css', '.json', '.html', '.js', '.svg')
+
+HASH_PATTERN = r'(?:\.[0-9a-f]{%d})?' % HASH_LAENGE
+
+
+# ============================================================================
+# HELPER
+# ============================================================================
+
+def inhalt_hash(daten):
+    return hashlib.sha256(daten).hexdigest()[:HASH_LAENGE]
+
+
+def gehashter_name(logischer_name, daten):
+    """fonts/soehne.woff2 → assets/fonts/soehne.<hash>.woff2"""
+    stamm, endung = os.path.splitext(logischer_name)
+    return f"{ASSET_VERZEICHNIS}/{stamm}.{inhalt_hash(daten)}{endung}"
+
+
+def lese_bytes(pfad):
+    with open(pfad, 'rb') as f:
+        return f.read()
+
+
+def schreibe_varianten(verzeichnis, pfad, daten):
+    """
+    Schreibt eine gehashte Datei plus vorkomprimierte Varianten
+    Gehashte Dateien sind unveränderlich - existieren sie schon, passiert nichts
+    Returns: Liste der geschriebenen/vorhandenen relativen Pfade
+    """
+    varianten = [(pfad, lambda: daten)]
+    if pfad.endswith(KOMPRIMIERBAR):
+        # mtime=0 → identische Bytes bei jedem Lauf (keine Git-Änderungen)
+        varianten.append((f"{pfad}.gz", lambda: gzip.compress(daten, compresslevel=9, mtime=0)))
+        if BROTLI_AVAILABLE:
+            varianten.append((f"{pfad}.br", lambda: brotli.compress(daten, quality=11)))
+
+    for relativ, erzeuge in varianten:
+        ziel = os.path.join(verzeichnis, relativ)
+        if not os.path.exists(ziel):
+            os.makedirs(os.path.dirname(ziel), exist_ok=True)
+            schreibe_wenn_geaendert(ziel, erzeuge())
+    return [relativ for relativ, _ in varianten]
+
+
+def finde_statische_assets():
+    """Returns: {logischer Name: Quellpfad} für Logos und Fonts"""
+    assets = {}
+    for muster in STATISCHE_ASSETS:
+        for pfad in sorted(glob.glob(os.path.join(QUELL_VERZEICHNIS, muster))):
+            assets[os.path.relpath(pfad, QUELL_VERZEICHNIS).replace(os.sep, '/')] = pfad
+    return assets
+
+
+def finde_daten_dateien(verzeichnis):
+    """
+    Veränderliche Daten, die die Seiten per fetch laden:
+    Index, Archiv-Manifest, Monats-Shards und der neueste Tag
+    (ältere Tagesdateien ändern sich nicht mehr und werden direkt geladen)
+    """
+    namen = [INDEX_DATEI, ARCHIV_MANIFEST_DATEI]
+    namen += sorted(
+        os.path.relpath(p, verzeichnis).replace(os.sep, '/')
+        for p in glob.glob(os.path.join(verzeichnis, SHARD_VERZEICHNIS, '*.json'))
+    )
+    tage = finde_tagesdateien(verzeichnis)
+    if tage:
+        namen.append(tage[max(tage)])
+    return [n for n in namen if os.path.exists(os.path.join(verzeichnis, n))]
+
+
+def ersetze_verweise(text, zuordnung):
+    """
+    Schreibt href/src-Verweise auf logische Namen (oder ältere Hash-Versionen)
+    auf die aktuellen gehashten Pfade um - relative Präfixe (../) bleiben erhalten
+    """
+    for logisch, gehasht in zuordnung.items():
+        stamm, endung = os.path.splitext(logisch)
+        muster = re.compile(
+            r'((?:href|src)=["\'])((?:\.\./)*)(?:%s/)?%s%s%s(["\'])'
+            % (ASSET_VERZEICHNIS, re.escape(stamm), HASH_PATTERN, re.escape(endung))
+        )
+        text = muster.sub(lambda m: f"{m.group(1)}{m.group(2)}{gehasht}{m.group(3)}", text)
+    return text
+
+
+# ============================================================================
+# VERÖFFENTLICHUNG
+# ============================================================================
+
+def veroeffentliche_assets(verzeichnis=DOCS_VERZEICHNIS):
+    """
+    Fingerprintet Assets und Daten, schreibt Manifest und aktualisiert die Seiten
+    Returns: {logischer Name: gehashter Pfad}
+    """
+    manifest_pfad = os.path.join(verzeichnis, ASSET_MANIFEST_DATEI)
+    altes_manifest = lese_json(manifest_pfad, {})
+    if altes_manifest.get('version') != ASSET_MANIFEST_VERSION:
+        altes_manifest = {}
+
+    zuordnung = {}
+    geschrieben = set()
+
+    # 1. Logos und Fonts (ungehashte Kopien in docs/ bleiben für die Email-Logos)
+    for logisch, quelle in finde_statische_assets().items():
+        daten = lese_bytes(quelle)
+        ziel = os.path.join(verzeichnis, logisch)
+        os.makedirs(os.path.dirname(ziel), exist_ok=True)
+        schreibe_wenn_geaendert(ziel, daten)
+        zuordnung[logisch] = gehashter_name(logisch, daten)
+        geschrieben.update(schreibe_varianten(verzeichnis, zuordnung[logisch], daten))
+
+    # 2. Stylesheet - Font-URLs zeigen auf die gehashten Fonts (relativ zu assets/)
+    css_pfad = os.path.join(verzeichnis, STYLESHEET)
+    if os.path.exists(css_pfad):
+        css = lese_bytes(css_pfad).decode('utf-8')
+        for logisch, gehasht in zuordnung.items():
+            if logisch.startswith('fonts/'):
+                css = css.replace(logisch, gehasht[len(ASSET_VERZEICHNIS) + 1:])
+        daten = css.encode('utf-8')
+        zuordnung[STYLESHEET] = gehashter_name(STYLESHEET, daten)
+        geschrieben.update(schreibe_varianten(verzeichnis, zuordnung[STYLESHEET], daten))
+
+    # 3. Daten-Dateien (nur per JS über das Manifest referenziert)
+    daten_zuordnung = {}
+    for logisch in finde_daten_dateien(verzeichnis):
+        daten = lese_bytes(os.path.join(verzeichnis, logisch))
+        daten_zuordnung[logisch] = gehashter_name(logisch, daten)
+        geschrieben.update(schreibe_varianten(verzeichnis, daten_zuordnung[logisch], daten))
+
+    # 4. Statische Verweise in den Seiten umschreiben
+    seiten = glob.glob(os.path.join(verzeichnis, '*.html')) + glob.glob(os.path.join(verzeichnis, 'd', '*.html'))
+    umgeschrieben = 0
+    for seite in seiten:
+        html = lese_bytes(seite).decode('utf-8')
+        if schreibe_wenn_geaendert(seite, ersetze_verweise(html, zuordnung)):
+            umgeschrieben += 1
+
+    dateien = {**zuordnung, **daten_zuordnung}
+    manifest = {'version': ASSET_MANIFEST_VERSION, 'dateien': dateien}
+    zeilen = [f"{json.dumps(k)}:{json.dumps(v)}" for k, v in sorted(dateien.items())]
+    schreibe_wenn_geaendert(
+        manifest_pfad,
+        '{"version":%d,\n"dateien":{\n%s\n}}\n' % (ASSET_MANIFEST_VERSION, ',\n'.join(zeilen))
+    )
+
+    # 5. Aufräumen: aktuelle und vorherige Generation behalten
+    # (bereits geöffnete Seiten können noch die alten Pfade laden)
+    behalten = set(geschrieben)
+    for gehasht in altes_manifest.get('dateien', {}).values():
+        behalten.update({gehasht, f"{gehasht}.gz", f"{gehasht}.br"})
+    geloescht = 0
+    for pfad in glob.glob(os.path.join(verzeichnis, ASSET_VERZEICHNIS, '**', '*'), recursive=True):
+        relativ = os.path.relpath(pfad, verzeichnis).replace(os.sep, '/')
+        if os.path.isfile(pfad) and relativ not in behalten:
+            os.remove(pfad)
+            geloescht += 1
+
+    print(f"✅ Assets veröffentlicht: {len(dateien)} Dateien, {umgeschrieben} Seiten aktualisiert, "
+          f"{geloescht} alte Versionen entfernt" + ("" if BROTLI_AVAILABLE else " (ohne Brotli)"))
+    return dateien
+
+
+if __name__ == "__main__":
+    veroeffentliche_assets()
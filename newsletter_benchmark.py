@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - End-to-End Benchmark mit synthetischer Last
+Führt sammle_artikel → verarbeite_artikel → speichere_als_json →
+aktualisiere_newsletter_index gegen einen lokalen HTTP-Stand-in aus:
+- Feeds, Startseiten, Artikelseiten und Claude (Stub aus newsletter_dienste.py)
+  kommen von einem ThreadingHTTPServer auf 127.0.0.1 mit einstellbarer Latenz -
+  echte Sockets, echtes requests/feedparser (NEWSLETTER_DIENSTE_UMLEITUNG)
+- Synthetischer Generator: beliebig viele Feeds (je bis zu 20 Artikel),
+  Archiv mit hunderten Tagen in einer Kopie von docs/ und im Archiv-Backend
+  (ARCHIV_BACKEND=speicher), ein Teil der heutigen Artikel sind Duplikate
+- HTML-Parsing inline oder im Prozess-Pool (--parser, newsletter_parser.py)
+- Pro Stufe: Wall-Time, Speicher-Spitze (tracemalloc) und Anfragen pro Art
+- Ergebnis als JSON in benchmarks/; mit --baseline-speichern wird es zur
+  Baseline für Profil + Pipeline, jeder weitere Lauf wird damit verglichen
+  (Exit-Code 1 bei Regression)
+
+    python newsletter_benchmark.py                      # Profil 'klein'
+    python newsletter_benchmark.py --profil x10 --pipeline stream
+    python newsletter_benchmark.py --profil x10 --pipeline stream --parser prozesse
+    python newsletter_benchmark.py --profil standard --baseline-speichern
+    python newsletter_benchmark.py --feeds 40 --archiv-tage 300 --claude-latenz-ms 500
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import contextlib
+from datetime import datetime, timedelta
+from html import escape
+from urllib.parse import unquote, urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from newsletter_parser import starte_parser, beende_parser
+
+QUELL_VERZEICHNIS = os.path.dirname(os.path.abspath(__file__))
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+BENCHMARK_VERZEICHNIS = os.environ.get('NEWSLETTER_BENCHMARK_DIR', 'benchmarks')
+# Erlaubte relative Verschlechterung gegenüber der Baseline
+BENCHMARK_TOLERANZ = float(os.environ.get('BENCHMARK_TOLERANZ', '0.25'))
+# Kleinere absolute Abweichungen sind Rauschen
+MIN_DIFFERENZ_S = 0.05
+MIN_DIFFERENZ_MB = 1.0
+
+PROFILE = {
+    # Schneller Rauchtest
+    'klein': {'feeds': 8, 'artikel_pro_feed': 20, 'archiv_tage': 30, 'artikel_pro_tag': 25,
+              'http_latenz_ms': 20, 'claude_latenz_ms': 50},
+    # Heutiger Tageslauf: 8 Feeds + 3 Scraping-Quellen, knapp ein Jahr Archiv
+    'standard': {'feeds': 8, 'artikel_pro_feed': 20, 'archiv_tage': 250, 'artikel_pro_tag': 25,
+                 'http_latenz_ms': 80, 'claude_latenz_ms': 300},
+    # 10× Quellen und Artikel, zwei Jahre Archiv
+    'x10': {'feeds': 80, 'artikel_pro_feed': 20, 'archiv_tage': 500, 'artikel_pro_tag': 60,
+            'http_latenz_ms': 80, 'claude_latenz_ms': 300},
+}
+DUPLIKAT_ANTEIL = 0.1
+SEED = 42
+
+# Wortmaterial für synthetische Titel und Texte
+SENDER = ['ARD', 'ZDF', 'RTL', 'ProSieben', 'Sat.1', 'Netflix', 'Amazon Prime Video', 'Disney+',
+          'Sky Deutschland', 'Paramount+', 'Joyn', 'RTL+', 'BBC', 'ITV', 'Channel 4', 'HBO',
+          'Apple TV+', 'Warner Bros. Discovery', 'Fremantle', 'Banijay', 'UFA', 'Constantin']
+VERBEN = ['bestellt', 'verlängert', 'startet', 'setzt ab', 'kauft', 'verschiebt', 'produziert',
+          'entwickelt', 'testet', 'übernimmt', 'verliert', 'gewinnt']
+THEMEN = ['neue Dokuserie über Tierparks', 'Reality-Format zur Primetime', 'True-Crime-Reihe',
+          'Streaming-Deal für Europa', 'Quotenhit am Sonntagabend', 'Koproduktion mit Skandinavien',
+          'Spielfilm-Offensive im Frühjahr', 'Daily Soap für den Vorabend', 'Factual-Entertainment-Slot',
+          'Kinderprogramm mit Werbeverzicht', 'Late-Night-Show am Freitag', 'Event-Serie zum Jubiläum']
+ZUSAETZE = ['Marktanteil steigt deutlich', 'Produzenten reagieren gelassen', 'Branche rätselt über Strategie',
+            'Werbekunden ziehen mit', 'Zuschauer entscheiden', 'Details zum Budget bekannt',
+            'Rechte gehen an Indie-Produktion', 'Start noch in diesem Jahr']
+SATZTEILE = ['Die Produktion', 'Der Sender', 'Das Format', 'Die Quote', 'Der Streamingdienst',
+             'Die Redaktion', 'Das Team', 'Die Geschäftsführung']
+PRAEDIKATE = ['setzt auf', 'bestätigte am Montag', 'rechnet mit', 'plant zusätzlich', 'verhandelt über',
+              'kündigte an', 'verzichtet auf', 'investiert in']
+OBJEKTE = ['eine zweite Staffel', 'mehr lokale Inhalte', 'einen neuen Sendeplatz', 'internationale Partner',
+           'kürzere Episoden', 'ein höheres Budget', 'junge Zielgruppen', 'lineare Ausstrahlung']
+
+MB = 1024 * 1024
+
+
+# ============================================================================
+# SYNTHETISCHER GENERATOR
+# ============================================================================
+
+def _satz(rnd):
+    return f"{rnd.choice(SATZTEILE)} {rnd.choice(PRAEDIKATE)} {rnd.choice(OBJEKTE)}."
+
+
+def erzeuge_artikel(rnd, quelle, basis_url, datum, nummer):
+    """Ein synthetischer Artikel (Titel ≥ 40 Zeichen, damit die Scraper ihn nehmen)"""
+    titel = f"{rnd.choice(SENDER)} {rnd.choice(VERBEN)} {rnd.choice(THEMEN)}: {rnd.choice(ZUSAETZE)} (Nr. {nummer})"
+    absaetze = [' '.join(_satz(rnd) for _ in range(rnd.randint(3, 6))) for _ in range(rnd.randint(4, 8))]
+    return {
+        'source': quelle,
+        'title': titel,
+        'link': f"{basis_url}/{datum}/artikel-{nummer}",
+        'date': datum,
+        'summary': ' '.join(absaetze[0].split('. ')[:2])[:300],
+        'score': rnd.randint(7, 10),
+        'absaetze': absaetze,
+    }
+
+
+def artikelseite_html(artikel):
+    """Artikelseite mit dem üblichen Rauschen (Scripte, Navigation, Sidebar, Footer)"""
+    absaetze = ''.join(f'<p>{escape(a)}</p>' for a in artikel['absaetze'])
+    return (f'<html><head><title>{escape(artikel["title"])}</title>'
+            f'<script>window.dataLayer=[];</script><style>body{{margin:0}}</style></head><body>'
+            f'<header>Logo</header><nav><a href="/">Start</a><a href="/medien">Medien</a></nav>'
+            f'<article><h1>{escape(artikel["title"])}</h1>{absaetze}</article>'
+            f'<aside>Meistgelesen</aside><footer>Impressum · Datenschutz</footer></body></html>').encode('utf-8')
+
+
+def synthetische_quellen(anzahl_feeds, rss_feeds, regionen):
+    """
+    RSS-Quellen für den Benchmark: zuerst die echten Feeds, darüber hinaus
+    'Synth NNN' (reihum einer Region zugeordnet, damit sie sortiert werden)
+    """
+    quellen = dict(list(rss_feeds.items())[:anzahl_feeds])
+    region_namen = list(regionen)
+    for nummer in range(len(quellen), anzahl_feeds):
+        name = f"Synth {nummer:03d}"
+        quellen[name] = f"https://synth-{nummer:03d}.example/feed"
+        if name not in regionen[region_namen[nummer % len(region_namen)]]:
+            regionen[region_namen[nummer % len(region_namen)]].append(name)
+    return quellen
+
+
+def erzeuge_archiv(rnd, quellen, tage, artikel_pro_tag, heute):
+    """Archiv-Tage vor `heute` → {datum: [artikel, ...]}"""
+    archiv = {}
+    namen = list(quellen)
+    nummer = 0
+    for tag in range(tage, 0, -1):
+        datum = (heute - timedelta(days=tag)).strftime('%Y-%m-%d')
+        archiv[datum] = []
+        for _ in range(artikel_pro_tag):
+            quelle = namen[nummer % len(namen)]
+            archiv[datum].append(erzeuge_artikel(rnd, quelle, _basis_url(quellen[quelle]), datum, nummer))
+            nummer += 1
+    return archiv
+
+
+def erzeuge_heute(rnd, rss_quellen, scraping_quellen, artikel_pro_feed, archiv, heute, duplikat_anteil):
+    """Heutige Artikel pro Quelle - ein Anteil stammt unverändert aus dem Archiv (Duplikate)"""
+    datum = heute.strftime('%Y-%m-%d')
+    archiv_nach_quelle = {}
+    for artikel_liste in archiv.values():
+        for artikel in artikel_liste:
+            archiv_nach_quelle.setdefault(artikel['source'], []).append(artikel)
+
+    heute_artikel = {}
+    nummer = 10_000_000
+    for name, url in {**rss_quellen, **scraping_quellen}.items():
+        heute_artikel[name] = []
+        for _ in range(artikel_pro_feed):
+            kandidaten = archiv_nach_quelle.get(name)
+            if kandidaten and rnd.random() < duplikat_anteil:
+                heute_artikel[name].append(rnd.choice(kandidaten))
+            else:
+                heute_artikel[name].append(erzeuge_artikel(rnd, name, _basis_url(url), datum, nummer))
+                nummer += 1
+    return heute_artikel
+
+
+def _basis_url(url):
+    teile = urlparse(url)
+    return f"{teile.scheme}://{teile.netloc}"
+
+
+def baue_inhalte(rss_quellen, scraping_quellen, heute_artikel):
+    """URL → (Art, Content-Type, Bytes) für den Stand-in"""
+    from newsletter_dienste import rss_xml, startseite_html
+
+    inhalte = {}
+    for quellen, art, erzeuge, content_type in (
+            (rss_quellen, 'feed', rss_xml, 'application/rss+xml'),
+            (scraping_quellen, 'startseite', startseite_html, 'text/html; charset=utf-8')):
+        for name, url in quellen.items():
+            inhalte[url] = (art, content_type, erzeuge(name, heute_artikel[name]))
+            for artikel in heute_artikel[name]:
+                inhalte[artikel['link']] = ('artikel', 'text/html; charset=utf-8', artikelseite_html(artikel))
+    return inhalte
+
+
+def kopiere_docs(ziel):
+    """Webseite ohne Tagesdateien und ohne generierte Index-/Asset-Dateien"""
+    generiert = {'data', 'suche', 'd', 'assets', 'archiv-manifest.json', 'asset-manifest.json'}
+    shutil.copytree(
+        os.path.join(QUELL_VERZEICHNIS, 'docs'), ziel,
+        ignore=lambda _, namen: [n for n in namen if n.startswith('newsletter-') or n in generiert]
+    )
+
+
+def schreibe_archiv(verzeichnis, archiv):
+    from newsletter_archiv import baue_newsletter, serialisiere
+
+    for datum, artikel_liste in archiv.items():
+        with open(os.path.join(verzeichnis, f'newsletter-{datum}.json'), 'w', encoding='utf-8') as f:
+            f.write(serialisiere(baue_newsletter(datum, artikel_liste, f'{datum}T09:00:00')))
+
+
+# ============================================================================
+# LOKALER HTTP-STAND-IN
+# ============================================================================
+
+def starte_stand_in(inhalte, http_latenz_ms=0, claude_latenz_ms=0):
+    """
+    HTTP-Server auf 127.0.0.1 (freier Port) - erwartet Pfade /{url-kodierte Original-URL}
+    Returns: Dict mit url, zaehler() → {art: {'anfragen', 'bytes'}} und stoppe()
+    """
+    zaehler = {}
+    sperre = threading.Lock()
+
+    def zaehle(art, anzahl_bytes):
+        with sperre:
+            eintrag = zaehler.setdefault(art, {'anfragen': 0, 'bytes': 0})
+            eintrag['anfragen'] += 1
+            eintrag['bytes'] += anzahl_bytes
+
+    class StandIn(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def antworte(self, status, content_type, inhalt):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(inhalt)))
+            self.end_headers()
+            self.wfile.write(inhalt)
+
+        def do_GET(self):
+            url = unquote(self.path[1:].split('?', 1)[0])
+            art, content_type, inhalt = inhalte.get(url, ('unbekannt', 'text/plain', b'nicht gefunden'))
+            time.sleep(http_latenz_ms / 1000)
+            zaehle(art, len(inhalt))
+            self.antworte(404 if art == 'unbekannt' else 200, content_type, inhalt)
+
+        def do_POST(self):
+            # Erst hier importieren - newsletter_dienste liest NEWSLETTER_DIENSTE_UMLEITUNG beim Import
+            from newsletter_dienste import CLAUDE_API_URL, claude_stub_antwort
+
+            url = unquote(self.path[1:])
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if url != CLAUDE_API_URL:
+                zaehle('unbekannt', 0)
+                return self.antworte(404, 'text/plain', b'nicht gefunden')
+            time.sleep(claude_latenz_ms / 1000)
+            inhalt = claude_stub_antwort(url, body).content
+            zaehle('claude', len(inhalt))
+            self.antworte(200, 'application/json', inhalt)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stand():
+        with sperre:
+            return {art: dict(werte) for art, werte in zaehler.items()}
+
+    def stoppe():
+        server.shutdown()
+        server.server_close()
+
+    return {'url': f"http://127.0.0.1:{server.server_address[1]}", 'zaehler': stand, 'stoppe': stoppe}
+
+
+# ============================================================================
+# MESSUNG
+# ============================================================================
+
+def _differenz(nachher, vorher):
+    return {
+        art: {schluessel: wert - vorher.get(art, {}).get(schluessel, 0) for schluessel, wert in werte.items()}
+        for art, werte in sorted(nachher.items())
+        if werte['anfragen'] != vorher.get(art, {}).get('anfragen', 0)
+    }
+
+
+def miss_stufe(name, funktion, stand_in, ergebnisse, ausgabe=False, speicher=True):
+    """Führt funktion() aus und trägt Dauer, Speicher-Spitze und Anfragen in ergebnisse ein"""
+    vorher = stand_in['zaehler']()
+    if speicher:
+        tracemalloc.reset_peak()
+        basis = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    if ausgabe:
+        wert = funktion()
+    else:
+        with open(os.devnull, 'w') as stumm, contextlib.redirect_stdout(stumm):
+            wert = funktion()
+    dauer = time.perf_counter() - start
+    anfragen = _differenz(stand_in['zaehler'](), vorher)
+
+    ergebnisse[name] = {
+        'dauer_s': round(dauer, 3),
+        'speicher_spitze_mb': round((tracemalloc.get_traced_memory()[1] - basis) / MB, 2) if speicher else None,
+        'anfragen': {art: werte['anfragen'] for art, werte in anfragen.items()},
+        'bytes': sum(werte['bytes'] for werte in anfragen.values()),
+    }
+    print(f"   ⏱️ {name:<22}{dauer:>8.2f}s")
+    return wert
+
+
+def fuehre_benchmark_aus(parameter, pipeline='phasen', verzeichnis=None, ausgabe=False, speicher=True,
+                         mit_pausen=False, parser='inline'):
+    """
+    Kompletter Benchmark-Lauf - nur einmal pro Prozess möglich, weil
+    medien_newsletter_web beim Import konfiguriert wird
+    Returns: Ergebnis-Dict (JSON-fähig)
+    """
+    rnd = random.Random(SEED)
+    heute = datetime.now()
+    verzeichnis = verzeichnis or tempfile.mkdtemp(prefix='newsletter-benchmark-')
+    docs = os.path.join(verzeichnis, 'docs')
+    if os.path.exists(docs):
+        shutil.rmtree(docs)
+
+    # Parser-Prozesse vor allen Threads (fork), dann der Stand-in (seine URL muss vor dem Import des Newsletters in der Umgebung stehen),
+    # die Inhalte kommen nach dem Generieren dazu
+    parser_prozesse = starte_parser(parser)
+    inhalte = {}
+    stand_in = starte_stand_in(inhalte, parameter['http_latenz_ms'], parameter['claude_latenz_ms'])
+    os.environ.update({
+        'NEWSLETTER_DIENSTE': 'live',
+        'NEWSLETTER_DIENSTE_UMLEITUNG': stand_in['url'],
+        'NO_PROXY': '127.0.0.1,localhost',
+        'NEWSLETTER_DOCS_DIR': docs,
+        'NEWSLETTER_PIPELINE': pipeline,
+        'NEWSLETTER_CHECKPOINTS': '0',
+        'ARCHIV_BACKEND': 'speicher',
+        'SUPABASE_URL': '',
+        'BRAVE_SEARCH_API_KEY': '',
+        'ANTHROPIC_API_KEY': 'benchmark',
+    })
+    if not mit_pausen:
+        os.environ.update({'NEWSLETTER_QUELLEN_PAUSE': '0', 'NEWSLETTER_ZUSAMMENFASSUNG_PAUSE': '0'})
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import medien_newsletter_web as newsletter
+    from newsletter_archiv import REGIONEN, region_von
+
+    rss_quellen = synthetische_quellen(parameter['feeds'], newsletter.RSS_FEEDS, REGIONEN)
+    scraping_quellen = newsletter.WEB_SCRAPING_SOURCES
+    newsletter.RSS_FEEDS = rss_quellen
+
+    print(f"🧪 Erzeuge {parameter['archiv_tage']} Archiv-Tage und "
+          f"{len(rss_quellen) + len(scraping_quellen)} Quellen in {verzeichnis}")
+    start = time.perf_counter()
+    archiv = erzeuge_archiv(rnd, {**rss_quellen, **scraping_quellen}, parameter['archiv_tage'],
+                            parameter['artikel_pro_tag'], heute)
+    heute_artikel = erzeuge_heute(rnd, rss_quellen, scraping_quellen, parameter['artikel_pro_feed'],
+                                  archiv, heute, DUPLIKAT_ANTEIL)
+    kopiere_docs(docs)
+    schreibe_archiv(docs, archiv)
+    inhalte.update(baue_inhalte(rss_quellen, scraping_quellen, heute_artikel))
+
+    # Archiv-Backend mit der gesamten Historie füllen (Duplikat-Check gegen echte Tabellengröße)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for datum, artikel_liste in archiv.items():
+            for artikel in artikel_liste:
+                newsletter.speichere_artikel_im_archiv(artikel, datum, region_von(artikel['source']))
+    print(f"   ✅ {sum(len(a) for a in archiv.values())} Archiv-Artikel, {len(inhalte)} URLs "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    if speicher:
+        tracemalloc.start()
+    stufen = {}
+    try:
+        print(f"\n🏁 Benchmark ({pipeline})")
+        miss_stufe('index_kalt', newsletter.aktualisiere_newsletter_index, stand_in, stufen, ausgabe, speicher)
+
+        if pipeline == 'stream':
+            alle_artikel, relevante_artikel, _ = miss_stufe(
+                'sammeln_verarbeiten', newsletter.verarbeite_artikel_stream, stand_in, stufen, ausgabe, speicher)
+        else:
+            alle_artikel = miss_stufe('sammeln', newsletter.sammle_artikel, stand_in, stufen, ausgabe, speicher)
+            relevante_artikel = miss_stufe('verarbeiten', lambda: newsletter.verarbeite_artikel(alle_artikel),
+                                           stand_in, stufen, ausgabe, speicher)
+
+        miss_stufe('json', lambda: newsletter.speichere_als_json(relevante_artikel),
+                   stand_in, stufen, ausgabe, speicher)
+        miss_stufe('index', newsletter.aktualisiere_newsletter_index, stand_in, stufen, ausgabe, speicher)
+    finally:
+        if speicher:
+            tracemalloc.stop()
+        stand_in['stoppe']()
+        beende_parser()
+
+    gesamt = [werte for name, werte in stufen.items() if name != 'index_kalt']
+    return {
+        'zeitpunkt': heute.isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'pipeline': pipeline,
+        'parser': parser,
+        'parser_prozesse': parser_prozesse,
+        'parameter': parameter,
+        'artikel': {
+            'quellen': len(rss_quellen) + len(scraping_quellen),
+            'gesammelt': len(alle_artikel),
+            'relevant_neu': len(relevante_artikel),
+            'archiv_tage': len(archiv),
+            'archiv_artikel': sum(len(a) for a in archiv.values()),
+        },
+        'stufen': stufen,
+        'gesamt_s': round(sum(werte['dauer_s'] for werte in gesamt), 3),
+        'max_rss_mb': _max_rss_mb(),
+    }
+
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+# ============================================================================
+# BASELINE
+# ============================================================================
+
+def baseline_pfad(profil, pipeline, verzeichnis=BENCHMARK_VERZEICHNIS):
+    return os.path.join(verzeichnis, f'baseline-{profil}-{pipeline}.json')
+
+
+def vergleiche_mit_baseline(ergebnis, baseline, toleranz=BENCHMARK_TOLERANZ):
+    """
+    Regressionen gegenüber der Baseline: Dauer oder Speicher-Spitze einer Stufe
+    mehr als `toleranz` (und mehr als das absolute Minimum) schlechter, oder
+    eine andere Anzahl Anfragen (die ist bei gleichen Parametern deterministisch)
+    Returns: Liste von Meldungen
+    """
+    if baseline.get('parameter') != ergebnis['parameter']:
+        return None
+    regressionen = []
+    for stufe, werte in ergebnis['stufen'].items():
+        alt = baseline['stufen'].get(stufe)
+        if not alt:
+            continue
+        for feld, minimum, einheit in (('dauer_s', MIN_DIFFERENZ_S, 's'), ('speicher_spitze_mb', MIN_DIFFERENZ_MB, ' MB')):
+            if werte.get(feld) is None or alt.get(feld) is None:
+                continue
+            if werte[feld] - alt[feld] > max(minimum, alt[feld] * toleranz):
+                regressionen.append(f"{stufe}: {feld} {alt[feld]}{einheit} → {werte[feld]}{einheit}")
+        if werte['anfragen'] != alt['anfragen']:
+            regressionen.append(f"{stufe}: Anfragen {alt['anfragen']} → {werte['anfragen']}")
+    return regressionen
+
+
+def drucke_bericht(ergebnis, baseline=None):
+    parser_info = f", Parser: {ergebnis['parser_prozesse']} Prozesse" if ergebnis.get('parser_prozesse') else ''
+    print(f"\n📊 BENCHMARK {ergebnis['pipeline'].upper()}{parser_info} - {ergebnis['artikel']['quellen']} Quellen, "
+          f"{ergebnis['artikel']['gesammelt']} Artikel, {ergebnis['artikel']['relevant_neu']} neu relevant, "
+          f"{ergebnis['artikel']['archiv_tage']} Archiv-Tage")
+    print("="*86)
+    print(f"{'Stufe':<22}{'Dauer':>9}{'Baseline':>10}{'Speicher':>11}{'KB':>9}  Anfragen")
+    for stufe, werte in ergebnis['stufen'].items():
+        alt = ((baseline or {}).get('stufen') or {}).get(stufe, {})
+        vergleich = f"{alt['dauer_s']:>9.2f}s" if alt.get('dauer_s') is not None else f"{'-':>10}"
+        speicher = f"{werte['speicher_spitze_mb']:>8.1f} MB" if werte['speicher_spitze_mb'] is not None else f"{'-':>11}"
+        anfragen = ', '.join(f"{anzahl} {art}" for art, anzahl in werte['anfragen'].items()) or '-'
+        print(f"{stufe:<22}{werte['dauer_s']:>8.2f}s{vergleich}{speicher}{werte['bytes'] // 1024:>9}  {anfragen}")
+    print(f"{'gesamt (ohne index_kalt)':<22}{ergebnis['gesamt_s']:>8.2f}s")
+    if ergebnis['max_rss_mb']:
+        print(f"Max. RSS des Prozesses: {ergebnis['max_rss_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='End-to-End Benchmark des Tageslaufs mit synthetischer Last')
+    parser.add_argument('--profil', choices=sorted(PROFILE), default='klein')
+    parser.add_argument('--pipeline', choices=['phasen', 'stream'], default='phasen')
+    parser.add_argument('--parser', choices=['inline', 'prozesse'], default='inline',
+                        help='HTML-Parsing im Prozess-Pool (eigene Baseline)')
+    for name in PROFILE['klein']:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f'Überschreibt {name} des Profils')
+    parser.add_argument('--verzeichnis', help='Arbeitsverzeichnis (Standard: temporär)')
+    parser.add_argument('--baseline-speichern', action='store_true', help='Ergebnis als neue Baseline speichern')
+    parser.add_argument('--toleranz', type=float, default=BENCHMARK_TOLERANZ)
+    parser.add_argument('--ohne-speicher', action='store_true', help='Ohne tracemalloc (reine Zeitmessung)')
+    parser.add_argument('--mit-pausen', action='store_true', help='Pausen zwischen Feeds/Zusammenfassungen behalten')
+    parser.add_argument('--ausgabe', action='store_true', help='Ausgabe des Newsletters nicht unterdrücken')
+    args = parser.parse_args()
+
+    parameter = dict(PROFILE[args.profil])
+    for name in parameter:
+        if getattr(args, name) is not None:
+            parameter[name] = getattr(args, name)
+    profil = args.profil if parameter == PROFILE[args.profil] else f"{args.profil}-angepasst"
+
+    ergebnis = fuehre_benchmark_aus(parameter, args.pipeline, args.verzeichnis, args.ausgabe,
+                                    not args.ohne_speicher, args.mit_pausen, args.parser)
+    ergebnis['profil'] = profil
+
+    variante = args.pipeline if args.parser == 'inline' else f"{args.pipeline}-{args.parser}"
+    pfad = baseline_pfad(profil, variante)
+    baseline = None
+    if os.path.exists(pfad):
+        with open(pfad, encoding='utf-8') as f:
+            baseline = json.load(f)
+    drucke_bericht(ergebnis, baseline)
+
+    os.makedirs(BENCHMARK_VERZEICHNIS, exist_ok=True)
+    letzter = os.path.join(BENCHMARK_VERZEICHNIS, f'letzter-{profil}-{variante}.json')
+    with open(letzter, 'w', encoding='utf-8') as f:
+        json.dump(ergebnis, f, ensure_ascii=False, indent=2)
+    print(f"💾 Ergebnis: {letzter}")
+
+    if args.baseline_speichern:
+        shutil.copyfile(letzter, pfad)
+        print(f"📌 Neue Baseline: {pfad}")
+    elif baseline:
+        regressionen = vergleiche_mit_baseline(ergebnis, baseline, args.toleranz)
+        if regressionen is None:
+            print(f"⚠️ Baseline {pfad} hat andere Parameter - kein Vergleich")
+        elif regressionen:
+            print(f"\n❌ {len(regressionen)} Regression(en) gegenüber {pfad}:")
+            for meldung in regressionen:
+                print(f"   - {meldung}")
+            sys.exit(1)
+        else:
+            print(f"✅ Keine Regression gegenüber {pfad} (Toleranz {args.toleranz:.0%})")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Checkpoints für wiederaufnehmbare Läufe
+Speichert pro Lauf-Datum jedes fertige Zwischenergebnis sofort in SQLite:
+- 'quelle':          gesammelte Artikel einer Quelle
+- 'score':           Claude-Score eines Artikels (vor Learning Boost)
+- 'volltext':        geladener Volltext / Recherche-Kontext
+- 'zusammenfassung': Claude-Zusammenfassung
+- 'archiviert':      Artikel wurde von diesem Lauf archiviert
+- 'run':             Run-Statistik wurde gespeichert
+- 'email':           Email an einen Empfänger wurde versendet
+- 'llm':             heute verbrauchte Claude-Tokens (Tages-Budget)
+Bricht ein Lauf ab (Timeout, API-Ausfall), überspringt ein neuer Lauf für
+dasselbe Datum alles, was schon erledigt ist - keine doppelten API-Kosten,
+keine doppelten Emails.
+
+In GitHub Actions wird die Datei über actions/cache zwischen Versuchen erhalten.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+CHECKPOINT_DB = os.environ.get('NEWSLETTER_CHECKPOINT_DB', 'newsletter_checkpoint.sqlite')
+CHECKPOINT_AKTIV = os.environ.get('NEWSLETTER_CHECKPOINTS', '1') != '0'
+CHECKPOINT_AUFBEWAHRUNG_TAGE = 7
+
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    datum TEXT NOT NULL,
+    art TEXT NOT NULL,
+    schluessel TEXT NOT NULL,
+    wert TEXT NOT NULL,          -- JSON
+    gespeichert_am TEXT NOT NULL,
+    PRIMARY KEY (datum, art, schluessel)
+);
+"""
+
+
+# ============================================================================
+# CHECKPOINT-STORE
+# ============================================================================
+
+def artikel_schluessel(artikel):
+    """Ein Artikel ist über Link und Titel eindeutig (gleiche URL kann neuen Titel bekommen)"""
+    return f"{artikel.get('link', '')}\n{artikel.get('title', '')}"
+
+
+def oeffne_checkpoints(datum, pfad=CHECKPOINT_DB):
+    """
+    Checkpoint-Store für einen Lauf - Dict mit den Funktionen
+        lade(art, schluessel, standard=None) → gespeicherter Wert
+        speichere(art, schluessel, wert)
+        anzahl() → {art: Anzahl}
+    Einträge älter als CHECKPOINT_AUFBEWAHRUNG_TAGE werden gelöscht.
+    Nutzbar aus mehreren Threads (Pipeline-Stufen).
+    """
+    conn = sqlite3.connect(pfad, check_same_thread=False)
+    conn.executescript(CHECKPOINT_SCHEMA)
+    sperre = threading.Lock()
+
+    grenze = (datetime.strptime(datum, '%Y-%m-%d') - timedelta(days=CHECKPOINT_AUFBEWAHRUNG_TAGE)).strftime('%Y-%m-%d')
+    with conn:
+        conn.execute('DELETE FROM checkpoints WHERE datum < ?', (grenze,))
+
+    def lade(art, schluessel, standard=None):
+        with sperre:
+            zeile = conn.execute(
+                'SELECT wert FROM checkpoints WHERE datum = ? AND art = ? AND schluessel = ?',
+                (datum, art, schluessel)
+            ).fetchone()
+        return json.loads(zeile[0]) if zeile else standard
+
+    def speichere(art, schluessel, wert):
+        with sperre, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO checkpoints (datum, art, schluessel, wert, gespeichert_am) VALUES (?, ?, ?, ?, ?)',
+                (datum, art, schluessel, json.dumps(wert, ensure_ascii=False),
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+
+    def anzahl():
+        with sperre:
+            return dict(conn.execute(
+                'SELECT art, count(*) FROM checkpoints WHERE datum = ? GROUP BY art', (datum,)
+            ))
+
+    return {'datum': datum, 'lade': lade, 'speichere': speichere, 'anzahl': anzahl}
+
+
+def starte_checkpoints(datum, pfad=CHECKPOINT_DB, aktiv=CHECKPOINT_AKTIV):
+    """Öffnet den Store und meldet, ob ein abgebrochener Lauf fortgesetzt wird"""
+    if not aktiv:
+        return None
+    try:
+        checkpoints = oeffne_checkpoints(datum, pfad)
+    except sqlite3.Error as e:
+        print(f"⚠️ Checkpoints nicht verfügbar ({pfad}): {e}")
+        return None
+    vorhanden = checkpoints['anzahl']()
+    if vorhanden:
+        details = ', '.join(f"{anzahl} {art}" for art, anzahl in sorted(vorhanden.items()))
+        print(f"♻️ Setze Lauf vom {datum} fort: {details}")
+    return checkpoints
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Service-Schicht für alle externen HTTP-Aufrufe
+Feeds, Scraping, Volltexte, Brave Search und die Claude API laufen über
+http_get() / http_post() / lade_feed(). Modus über NEWSLETTER_DIENSTE:
+- 'live':      direkt ins Netz (Standard, wie bisher)
+- 'aufnehmen': live, zusätzlich jede GET-Antwort als Fixture speichern
+- 'offline':   kein Netzwerk - GET aus Fixtures (sonst 404), Claude als
+               deterministischer Stub mit einstellbarer Latenz, Brave leer
+
+Mit NEWSLETTER_DIENSTE_UMLEITUNG (Basis-URL eines lokalen HTTP-Stand-ins) gehen
+alle live-Aufrufe als {basis}/{url-kodierte Original-URL} an diesen Server -
+echte Sockets, echtes requests/feedparser, aber kein Internet (newsletter_benchmark.py).
+
+Fixtures: NEWSLETTER_FIXTURES/index.json (URL → Datei, Status, Content-Type)
+plus die Antwort-Bytes in http/. erzeuge_fixtures() baut einen Satz aus dem
+Archiv in docs/ (Feeds, Startseiten, Artikelseiten) - siehe newsletter_offline.py
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from html import escape
+from urllib.parse import quote, urlparse
+
+import requests
+import feedparser
+
+from newsletter_archiv import DOCS_VERZEICHNIS, iter_artikel
+from newsletter_trace import span
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+DIENSTE_MODUS = os.environ.get('NEWSLETTER_DIENSTE', 'live')
+FIXTURE_VERZEICHNIS = os.environ.get('NEWSLETTER_FIXTURES', os.path.join('offline', 'fixtures'))
+OFFLINE_CLAUDE_LATENZ_MS = int(os.environ.get('OFFLINE_CLAUDE_LATENZ_MS', '0'))
+OFFLINE_HTTP_LATENZ_MS = int(os.environ.get('OFFLINE_HTTP_LATENZ_MS', '0'))
+DIENSTE_UMLEITUNG = os.environ.get('NEWSLETTER_DIENSTE_UMLEITUNG', '').rstrip('/')
+
+CLAUDE_API_URL = 'https://api.anthropic.com/v1/messages'
+
+_fixture_index = None
+_fixture_sperre = threading.Lock()
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def fixture_datei(url):
+    return f"http/{hashlib.sha256(url.encode('utf-8')).hexdigest()[:20]}"
+
+
+def lade_fixture_index(verzeichnis=FIXTURE_VERZEICHNIS):
+    global _fixture_index
+    with _fixture_sperre:
+        if _fixture_index is None:
+            pfad = os.path.join(verzeichnis, 'index.json')
+            if os.path.exists(pfad):
+                with open(pfad, encoding='utf-8') as f:
+                    _fixture_index = json.load(f)
+            else:
+                _fixture_index = {}
+        return _fixture_index
+
+
+def speichere_fixture(url, status, inhalt, content_type, verzeichnis=FIXTURE_VERZEICHNIS):
+    """Eine Antwort aufzeichnen (Index wird nach jedem Eintrag geschrieben)"""
+    index = lade_fixture_index(verzeichnis)
+    datei = fixture_datei(url)
+    os.makedirs(os.path.join(verzeichnis, 'http'), exist_ok=True)
+    with open(os.path.join(verzeichnis, datei), 'wb') as f:
+        f.write(inhalt)
+    with _fixture_sperre:
+        index[url] = {'datei': datei, 'status': status, 'content_type': content_type}
+        with open(os.path.join(verzeichnis, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def baue_antwort(url, status, inhalt, content_type='text/html; charset=utf-8'):
+    """requests.Response ohne Netzwerk (für Fixtures und Stubs)"""
+    antwort = requests.Response()
+    antwort.url = url
+    antwort.status_code = status
+    antwort._content = inhalt
+    antwort.headers['Content-Type'] = content_type
+    antwort.encoding = 'utf-8'
+    return antwort
+
+
+def fixture_antwort(url, verzeichnis=FIXTURE_VERZEICHNIS):
+    eintrag = lade_fixture_index(verzeichnis).get(url)
+    if OFFLINE_HTTP_LATENZ_MS:
+        time.sleep(OFFLINE_HTTP_LATENZ_MS / 1000)
+    if not eintrag:
+        return baue_antwort(url, 404, b'offline: keine Fixture', 'text/plain')
+    with open(os.path.join(verzeichnis, eintrag['datei']), 'rb') as f:
+        return baue_antwort(url, eintrag['status'], f.read(), eintrag.get('content_type') or 'text/html')
+
+
+# ============================================================================
+# CLAUDE-STUB
+# ============================================================================
+
+def _stabile_zahl(text):
+    return int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:8], 16)
+
+
+def claude_stub_text(prompt):
+    """
+    Deterministische Antwort auf die beiden Prompts des Newsletters:
+    Bewertung → {"scores": [...]} (3-10 aus dem Titel-Hash), sonst eine Zusammenfassung
+    """
+    if '"scores"' in prompt:
+        titel = re.findall(r'^Titel: (.*)$', prompt, re.MULTILINE)
+        return json.dumps({'scores': [3 + _stabile_zahl(t) % 8 for t in titel]})
+
+    titel = re.search(r'^Titel: (.*)$', prompt, re.MULTILINE)
+    volltext = prompt.split('Volltext:', 1)[-1].split('Antworte NUR', 1)[0]
+    saetze = re.split(r'(?<=[.!?])\s+', ' '.join(volltext.split()))
+    return f"{titel.group(1) if titel else 'Artikel'}: {' '.join(saetze[:2])[:400]}"
+
+
+def claude_stub_antwort(url, json_body):
+    if OFFLINE_CLAUDE_LATENZ_MS:
+        time.sleep(OFFLINE_CLAUDE_LATENZ_MS / 1000)
+    prompt = ''.join(m.get('content', '') for m in (json_body or {}).get('messages', [])
+                     if isinstance(m.get('content'), str))
+    text = claude_stub_text(prompt)
+    daten = {
+        'id': f"msg_offline_{_stabile_zahl(prompt):08x}",
+        'type': 'message',
+        'role': 'assistant',
+        'model': (json_body or {}).get('model', 'offline'),
+        'content': [{'type': 'text', 'text': text}],
+        'stop_reason': 'end_turn',
+        # Grobe Schätzung (~4 Zeichen pro Token) - gleiche Form wie die echte API
+        'usage': {'input_tokens': len(prompt) // 4 + 1, 'output_tokens': len(text) // 4 + 1},
+    }
+    return baue_antwort(url, 200, json.dumps(daten).encode('utf-8'), 'application/json')
+
+
+# ============================================================================
+# SERVICE-FUNKTIONEN
+# ============================================================================
+
+def ziel_url(url):
+    """Tatsächlich angefragte URL - mit DIENSTE_UMLEITUNG beim lokalen Stand-in"""
+    if DIENSTE_UMLEITUNG:
+        return f"{DIENSTE_UMLEITUNG}/{quote(url, safe='')}"
+    return url
+
+
+def _get(url, **kwargs):
+    if DIENSTE_MODUS == 'offline':
+        # Query-Parameter (Brave) gehören zur URL der Fixture
+        if kwargs.get('params'):
+            url = requests.Request('GET', url, params=kwargs['params']).prepare().url
+        return fixture_antwort(url)
+
+    antwort = requests.get(ziel_url(url), **kwargs)
+    if DIENSTE_MODUS == 'aufnehmen' and 'api.search.brave.com' not in url:
+        speichere_fixture(url, antwort.status_code, antwort.content,
+                          antwort.headers.get('Content-Type', 'text/html'))
+    return antwort
+
+
+def _post(url, **kwargs):
+    if DIENSTE_MODUS == 'offline':
+        if url == CLAUDE_API_URL:
+            return claude_stub_antwort(url, kwargs.get('json'))
+        return baue_antwort(url, 404, b'offline', 'text/plain')
+    return requests.post(ziel_url(url), **kwargs)
+
+
+def _aufruf_mit_span(methode, aufruf, url, **kwargs):
+    """Externer Aufruf als Trace-Span (Host, Dauer, Bytes, HTTP-Status)"""
+    with span('extern', urlparse(url).netloc or url, methode=methode, url=url[:200]) as aktuell:
+        antwort = aufruf(url, **kwargs)
+        aktuell['bytes'] = len(antwort.content)
+        aktuell['attribute']['http_status'] = antwort.status_code
+        if antwort.status_code >= 400:
+            aktuell['status'] = f"http_{antwort.status_code}"
+        return antwort
+
+
+def http_get(url, **kwargs):
+    """requests.get über die Service-Schicht"""
+    return _aufruf_mit_span('GET', _get, url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    """requests.post über die Service-Schicht (offline: nur Claude, als Stub)"""
+    return _aufruf_mit_span('POST', _post, url, **kwargs)
+
+
+def lade_feed(url):
+    """feedparser.parse über die Service-Schicht"""
+    if DIENSTE_MODUS == 'live' and not DIENSTE_UMLEITUNG:
+        with span('extern', urlparse(url).netloc, methode='GET', url=url[:200]) as aktuell:
+            feed = feedparser.parse(url)
+            aktuell['attribute']['http_status'] = feed.get('status')
+            if feed.get('bozo') and not feed.entries:
+                aktuell['status'] = 'fehler'
+            return feed
+    antwort = http_get(url, timeout=10)
+    return feedparser.parse(antwort.content if antwort.status_code == 200 else b'')
+
+
+# ============================================================================
+# FIXTURE-GENERATOR
+# ============================================================================
+
+def rss_xml(name, artikel_liste):
+    items = ''.join(
+        f"<item><title>{escape(a['title'])}</title><link>{escape(a['link'])}</link>"
+        f"<description>{escape(a.get('summary') or '')}</description>"
+        f"<pubDate>{datetime.strptime(a['date'], '%Y-%m-%d').strftime('%a, %d %b %Y 06:00:00 +0000')}</pubDate></item>"
+        for a in artikel_liste
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>{escape(name)}</title>{items}</channel></rss>').encode('utf-8')
+
+
+def startseite_html(name, artikel_liste):
+    links = ''.join(f'<li><a href="{escape(a["link"])}">{escape(a["title"])}</a></li>' for a in artikel_liste)
+    return f'<html><head><title>{escape(name)}</title></head><body><ul>{links}</ul></body></html>'.encode('utf-8')
+
+
+def _artikelseite(artikel):
+    absatz = escape(artikel.get('summary') or artikel['title'])
+    return (f'<html><head><title>{escape(artikel["title"])}</title></head><body>'
+            f'<nav>Navigation</nav><article><h1>{escape(artikel["title"])}</h1>'
+            f'<p>{absatz}</p><p>{absatz}</p></article><footer>Impressum</footer></body></html>').encode('utf-8')
+
+
+def erzeuge_fixtures(rss_feeds, scraping_quellen, verzeichnis=FIXTURE_VERZEICHNIS,
+                     archiv_verzeichnis=DOCS_VERZEICHNIS, tage=7, pro_quelle=20):
+    """
+    Fixture-Satz aus den letzten `tage` Archiv-Tagen: ein RSS-Feed pro Feed-Quelle,
+    eine Startseite pro Scraping-Quelle und eine Artikelseite pro Link
+    Returns: Anzahl Fixtures
+    """
+    global _fixture_index
+    alle = list(iter_artikel(archiv_verzeichnis))
+    letzte_tage = sorted({a['date'] for a in alle})[-tage:]
+    nach_quelle = {}
+    for artikel in alle:
+        if artikel['date'] in letzte_tage:
+            nach_quelle.setdefault(artikel['source'], []).append(artikel)
+
+    _fixture_index = {}
+    anzahl = 0
+    for quellen, erzeuge, content_type in ((rss_feeds, rss_xml, 'application/rss+xml'),
+                                           (scraping_quellen, startseite_html, 'text/html; charset=utf-8')):
+        for name, url in quellen.items():
+            artikel_liste = nach_quelle.get(name, [])[-pro_quelle:]
+            speichere_fixture(url, 200, erzeuge(name, artikel_liste), content_type, verzeichnis)
+            for artikel in artikel_liste:
+                speichere_fixture(artikel['link'], 200, _artikelseite(artikel), 'text/html; charset=utf-8', verzeichnis)
+            anzahl += 1 + len(artikel_liste)
+    return anzahl
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Inkrementeller Index für die Webseite
+Pflegt in docs/:
+- newsletter-index.json: Liste aller Daten
+- data/newsletter-YYYY-MM.json: Monats-Shards mit allen Newslettern eines Monats
+- archiv-manifest.json: Daten, Artikelzahlen und Shard-Pfade für die Webseite
+- suche/XX.json: Invertierter Suchindex (Token → Artikel), geshardet nach Token-Präfix
+- d/YYYY-MM-DD.html: Vorgerenderte statische Tagesseiten (newsletter_seiten.py)
+
+Inkrementell:
+- Manifest mit mtime/Größe/SHA-256 pro Tagesdatei (newsletter-manifest.json)
+- Nur neue oder geänderte Tage werden geparst, nur betroffene Monate neu geschrieben
+- Ausgabedateien werden nur geschrieben, wenn sich ihr Inhalt ändert
+- Kompakt: ein minifizierter Eintrag pro Zeile → Git-Diff = eine Zeile pro Tag
+"""
+
+import os
+import re
+import json
+import hashlib
+import unicodedata
+
+from newsletter_archiv import finde_tagesdateien, lade_tag, normalisiere_newsletter
+from newsletter_seiten import SEITEN_VERSION, seiten_pfad, schreibe_tagesseite, entferne_tagesseite
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+DOCS_VERZEICHNIS = os.environ.get('NEWSLETTER_DOCS_DIR', 'docs')
+
+MANIFEST_DATEI = 'newsletter-manifest.json'
+INDEX_DATEI = 'newsletter-index.json'
+ARCHIV_MANIFEST_DATEI = 'archiv-manifest.json'
+SHARD_VERZEICHNIS = 'data'
+MANIFEST_VERSION = 1
+ARCHIV_MANIFEST_VERSION = 1
+
+# Suchindex - Tokenisierung muss mit tokenize() in archive.html übereinstimmen!
+SUCH_VERZEICHNIS = 'suche'
+SUCH_MANIFEST_DATEI = 'manifest.json'
+SUCH_VERSION = 1
+SUCH_PRAEFIX_LAENGE = 2
+SUCH_MIN_LAENGE = 2
+SUCH_FELDER = (('title', 1), ('source', 2), ('summary', 4))  # Bitmaske pro Posting
+SUCH_UMLAUTE = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+SUCH_STOPWORDS = {
+    'aber', 'als', 'am', 'an', 'auch', 'auf', 'aus', 'bei', 'bis', 'das', 'dass', 'dem', 'den',
+    'der', 'des', 'die', 'ein', 'eine', 'einem', 'einen', 'einer', 'es', 'fuer', 'hat', 'im',
+    'in', 'ist', 'mit', 'nach', 'nicht', 'noch', 'nur', 'oder', 'sich', 'sie', 'sind', 'um',
+    'und', 'vom', 'von', 'vor', 'war', 'wird', 'wie', 'zu', 'zum', 'zur', 'ueber',
+    'a', 'and', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'is', 'it', 'its', 'of', 'on',
+    'or', 'the', 'to', 'was', 'with'
+}
+
+
+# ============================================================================
+# HELPER
+# ============================================================================
+
+def datei_hash(pfad):
+    """SHA-256 einer Datei"""
+    with open(pfad, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def lese_json(pfad, default=None):
+    """Lädt eine JSON-Datei, bei Fehlern default"""
+    try:
+        with open(pfad, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def schreibe_wenn_geaendert(pfad, inhalt):
+    """
+    Schreibt Text (oder Bytes) nur, wenn er sich vom aktuellen Dateiinhalt unterscheidet
+    Atomar über temporäre Datei + os.replace
+    Returns: True wenn geschrieben wurde
+    """
+    daten = inhalt.encode('utf-8') if isinstance(inhalt, str) else inhalt
+    try:
+        with open(pfad, 'rb') as f:
+            if f.read() == daten:
+                return False
+    except OSError:
+        pass
+
+    tmp_pfad = f"{pfad}.tmp"
+    with open(tmp_pfad, 'wb') as f:
+        f.write(daten)
+    os.replace(tmp_pfad, pfad)
+    return True
+
+
+def json_zeilen(eintraege):
+    """JSON-Array mit einem minifizierten Eintrag pro Zeile (kompakt + kleine Git-Diffs)"""
+    zeilen = [json.dumps(e, ensure_ascii=False, separators=(',', ':')) for e in eintraege]
+    return '[\n' + ',\n'.join(zeilen) + '\n]\n'
+
+
+def shard_pfad(monat):
+    """Relativer Pfad des Monats-Shards (relativ zu docs/)"""
+    return f"{SHARD_VERZEICHNIS}/newsletter-{monat}.json"
+
+
+def lade_tagesdatei(verzeichnis, name):
+    """Tagesdatei im aktuellen Schema (newsletter_archiv.lade_tag), bei Fehlern None"""
+    try:
+        return lade_tag(os.path.join(verzeichnis, name))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def artikel_von(newsletter):
+    """Artikel-Liste eines Newsletters - ältere Schemata (z.B. in alten Shards) werden normalisiert"""
+    return normalisiere_newsletter(newsletter)['articles']
+
+
+def tages_eintrag(datum, newsletter):
+    """Manifest-Eintrag für einen Tag: Anzahl, Ø Score, Quellen, Shard"""
+    artikel = artikel_von(newsletter)
+    scores = [a['score'] for a in artikel if isinstance(a.get('score'), (int, float))]
+    return {
+        'date': datum,
+        'count': len(artikel),
+        'avg_score': round(sum(scores) / len(scores), 1) if scores else None,
+        'sources': sorted({a['source'] for a in artikel if a.get('source')}),
+        'shard': shard_pfad(datum[:7])
+    }
+
+
+def _inhalt(manifest):
+    """Manifest ohne mtimes (nur Größe + Hash pro Datei)"""
+    return {name: (e['size'], e['sha256']) for name, e in manifest.get('dateien', {}).items()}
+
+
+def pruefe_aenderungen(verzeichnis, tage, manifest):
+    """
+    Vergleicht Tagesdateien mit dem Manifest
+    mtime + Größe gleich → unverändert; sonst entscheidet der SHA-256
+    (nach git checkout haben alle Dateien neue mtimes, aber gleiche Hashes)
+    Returns: (geänderte Daten, neues Manifest)
+    """
+    alte_eintraege = manifest.get('dateien', {})
+    neue_eintraege = {}
+    geaendert = []
+
+    for datum, name in tage.items():
+        stat = os.stat(os.path.join(verzeichnis, name))
+        alt = alte_eintraege.get(name)
+        eintrag = {'mtime': stat.st_mtime, 'size': stat.st_size}
+
+        if alt and alt['mtime'] == stat.st_mtime and alt['size'] == stat.st_size:
+            eintrag['sha256'] = alt['sha256']
+        else:
+            eintrag['sha256'] = datei_hash(os.path.join(verzeichnis, name))
+            if not alt or alt['sha256'] != eintrag['sha256']:
+                geaendert.append(datum)
+
+        neue_eintraege[name] = eintrag
+
+    return geaendert, {'version': MANIFEST_VERSION, 'dateien': neue_eintraege}
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def aktualisiere_index(verzeichnis=DOCS_VERZEICHNIS):
+    """
+    Aktualisiert Index, Monats-Shards und Archiv-Manifest inkrementell
+    Returns: Liste der neu geparsten Daten
+    """
+    manifest_pfad = os.path.join(verzeichnis, MANIFEST_DATEI)
+    index_pfad = os.path.join(verzeichnis, INDEX_DATEI)
+    archiv_pfad = os.path.join(verzeichnis, ARCHIV_MANIFEST_DATEI)
+
+    tage = finde_tagesdateien(verzeichnis)
+    if not tage:
+        print("⚠️ Keine Newsletter-Dateien gefunden")
+        return []
+
+    manifest = lese_json(manifest_pfad, {})
+    if manifest.get('version') != MANIFEST_VERSION:
+        manifest = {}
+
+    # Bestehendes Archiv-Manifest wiederverwenden - nur Änderungen neu parsen
+    archiv = lese_json(archiv_pfad, {}) if manifest else {}
+    if archiv.get('version') != ARCHIV_MANIFEST_VERSION:
+        archiv = {}
+    eintraege = {e['date']: e for e in archiv.get('days', [])}
+
+    geaendert, neues_manifest = pruefe_aenderungen(verzeichnis, tage, manifest)
+    # Tage ohne Eintrag im Archiv-Manifest (z.B. nach Fehlern) ebenfalls parsen
+    fehlend = [datum for datum in tage if datum not in eintraege and datum not in geaendert]
+    zu_parsen = sorted(set(geaendert) | set(fehlend))
+    entfernt = [datum for datum in eintraege if datum not in tage]
+
+    geparst = {}
+    for datum in zu_parsen:
+        newsletter = lade_tagesdatei(verzeichnis, tage[datum])
+        if newsletter is None:
+            print(f"⚠️ Fehler beim Laden von {tage[datum]}")
+            neues_manifest['dateien'].pop(tage[datum], None)
+            continue
+        geparst[datum] = newsletter
+        eintraege[datum] = tages_eintrag(datum, newsletter)
+    for datum in entfernt:
+        del eintraege[datum]
+
+    # Nur betroffene Monats-Shards neu schreiben
+    betroffene_monate = {datum[:7] for datum in list(geparst) + entfernt}
+    vorher = {}
+    for monat in sorted(betroffene_monate):
+        bestehend = schreibe_monats_shard(verzeichnis, monat, tage, geparst)
+        vorher.update({d: n for d, n in bestehend.items() if d in geparst or d in entfernt})
+
+    # Statische Tagesseiten: neue/geänderte Tage, fehlende Seiten und bei
+    # neuer Template-Version alle Tage
+    if manifest.get('seiten_version') != SEITEN_VERSION:
+        zu_rendern = set(tage)
+    else:
+        zu_rendern = set(geparst) | {d for d in tage if not os.path.exists(seiten_pfad(verzeichnis, d))}
+    for datum in sorted(zu_rendern):
+        newsletter = geparst.get(datum) or lade_tagesdatei(verzeichnis, tage[datum])
+        if newsletter is not None:
+            schreibe_tagesseite(verzeichnis, datum, artikel_von(newsletter), schreibe_wenn_geaendert)
+    for datum in entfernt:
+        entferne_tagesseite(verzeichnis, datum)
+    neues_manifest['seiten_version'] = SEITEN_VERSION
+    if zu_rendern:
+        print(f"✅ Tagesseiten gerendert: {len(zu_rendern)}")
+
+    # Suchindex: alte Postings geänderter Tage kommen aus dem bisherigen Monats-Shard
+    aktualisiere_suchindex(verzeichnis, tage, geparst, vorher)
+
+    index_data = {'dates': sorted(tage, reverse=True)}
+    if schreibe_wenn_geaendert(index_pfad, json.dumps(index_data, ensure_ascii=False, indent=2)):
+        print(f"✅ Index aktualisiert: {len(index_data['dates'])} Newsletter")
+    else:
+        print(f"✅ Index unverändert: {len(index_data['dates'])} Newsletter")
+
+    tage_sortiert = [eintraege[datum] for datum in sorted(eintraege, reverse=True)]
+    monate = {}
+    for e in tage_sortiert:
+        monat = monate.setdefault(e['date'][:7], {
+            'month': e['date'][:7], 'shard': e['shard'], 'days': 0, 'articles': 0
+        })
+        monat['days'] += 1
+        monat['articles'] += e['count']
+    archiv_json = (
+        '{"version":' + str(ARCHIV_MANIFEST_VERSION) + ',\n'
+        '"months":' + json_zeilen(list(monate.values())).rstrip('\n') + ',\n'
+        '"days":' + json_zeilen(tage_sortiert).rstrip('\n') + '\n}\n'
+    )
+    if schreibe_wenn_geaendert(archiv_pfad, archiv_json):
+        print(f"✅ Daten-Archiv aktualisiert: {len(tage_sortiert)} Newsletter in {len(monate)} Monaten "
+              f"({len(geparst)} neu geparst, {len(betroffene_monate)} Shards geschrieben)")
+    else:
+        print(f"✅ Daten-Archiv unverändert: {len(tage_sortiert)} Newsletter")
+
+    # Manifest nur bei geänderten Hashes schreiben - reine mtime-Änderungen
+    # (z.B. nach git checkout) sollen keinen Commit erzeugen
+    if (_inhalt(neues_manifest) != _inhalt(manifest)
+            or manifest.get('seiten_version') != SEITEN_VERSION):
+        schreibe_wenn_geaendert(manifest_pfad, json.dumps(neues_manifest, sort_keys=True, indent=1))
+
+    return sorted(geparst)
+
+
+def schreibe_monats_shard(verzeichnis, monat, tage, geparst):
+    """
+    Schreibt den Shard eines Monats neu (neueste Tage zuerst)
+    Unveränderte Tage kommen aus dem bestehenden Shard, geänderte aus geparst
+    Returns: bisheriger Inhalt des Shards {datum: newsletter}
+    """
+    pfad = os.path.join(verzeichnis, shard_pfad(monat))
+    bestehend = {
+        n.get('date') or n.get('id'): n for n in lese_json(pfad, [])
+    }
+
+    newsletter = []
+    for datum in sorted((d for d in tage if d.startswith(monat)), reverse=True):
+        if datum in geparst:
+            newsletter.append(geparst[datum])
+        elif datum in bestehend:
+            newsletter.append(bestehend[datum])
+        else:
+            # Shard fehlt/unvollständig → Tagesdatei nachladen
+            nachgeladen = lade_tagesdatei(verzeichnis, tage[datum])
+            if nachgeladen is not None:
+                newsletter.append(nachgeladen)
+
+    if not newsletter:
+        if os.path.exists(pfad):
+            os.remove(pfad)
+        return bestehend
+
+    os.makedirs(os.path.dirname(pfad), exist_ok=True)
+    schreibe_wenn_geaendert(pfad, json_zeilen(newsletter))
+    return bestehend
+
+
+# ============================================================================
+# SUCHINDEX
+# ============================================================================
+
+def such_tokens(text):
+    """Normalisierte Such-Tokens: klein, Umlaute ausgeschrieben, ohne Akzente und Stoppwörter"""
+    text = unicodedata.normalize('NFKD', (text or '').lower().translate(SUCH_UMLAUTE))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return [t for t in re.findall(r'[a-z0-9]+', text)
+            if len(t) >= SUCH_MIN_LAENGE and t not in SUCH_STOPWORDS]
+
+
+def such_postings(newsletter):
+    """
+    Postings eines Tages
+    Returns: {token: [[artikel_index, feld_bitmaske], ...]}
+    """
+    postings = {}
+    for index, artikel in enumerate(artikel_von(newsletter)):
+        masken = {}
+        for feld, bit in SUCH_FELDER:
+            for token in such_tokens(artikel.get(feld)):
+                masken[token] = masken.get(token, 0) | bit
+        for token, maske in masken.items():
+            postings.setdefault(token, []).append([index, maske])
+    return postings
+
+
+def such_shard_name(token):
+    return token[:SUCH_PRAEFIX_LAENGE]
+
+
+def schreibe_such_shard(pfad, shard):
+    """Shard {token: {datum: postings}} - ein Token pro Zeile, leere Shards werden gelöscht"""
+    if not shard:
+        if os.path.exists(pfad):
+            os.remove(pfad)
+        return
+    zeilen = [
+        json.dumps(token) + ':' + json.dumps(shard[token], sort_keys=True, separators=(',', ':'))
+        for token in sorted(shard)
+    ]
+    schreibe_wenn_geaendert(pfad, '{\n' + ',\n'.join(zeilen) + '\n}\n')
+
+
+def aktualisiere_suchindex(verzeichnis, tage, neu, alt):
+    """
+    Aktualisiert den invertierten Suchindex in docs/suche/ inkrementell
+    neu: {datum: newsletter} neu geparste Tage
+    alt: {datum: newsletter} bisheriger Inhalt geänderter oder entfernter Tage
+    Nur Shards mit Tokens dieser Tage werden gelesen und geschrieben.
+    Fehlt der Index (oder hat er eine andere Version), wird er komplett aufgebaut.
+    """
+    such_pfad = os.path.join(verzeichnis, SUCH_VERZEICHNIS)
+    manifest_pfad = os.path.join(such_pfad, SUCH_MANIFEST_DATEI)
+    manifest = lese_json(manifest_pfad, {})
+
+    neuaufbau = (manifest.get('version') != SUCH_VERSION
+                 or manifest.get('praefix_laenge') != SUCH_PRAEFIX_LAENGE)
+    if neuaufbau:
+        neu = {}
+        for datum, name in tage.items():
+            newsletter = lade_tagesdatei(verzeichnis, name)
+            if newsletter is not None:
+                neu[datum] = newsletter
+        alt = {}
+        if os.path.isdir(such_pfad):
+            for name in os.listdir(such_pfad):
+                if name.endswith('.json') and name != SUCH_MANIFEST_DATEI:
+                    os.remove(os.path.join(such_pfad, name))
+        shard_namen = set()
+    else:
+        shard_namen = set(manifest.get('shards', []))
+
+    if not neu and not alt:
+        return
+
+    # Neue Postings nach Shard gruppieren: {shard: {token: {datum: postings}}}
+    neue_shards = {}
+    for datum, newsletter in neu.items():
+        for token, eintraege in such_postings(newsletter).items():
+            neue_shards.setdefault(such_shard_name(token), {}).setdefault(token, {})[datum] = eintraege
+    betroffen = set(neue_shards)
+    betroffen |= {such_shard_name(t) for n in alt.values() for t in such_postings(n)}
+    zu_entfernen = set(neu) | set(alt)
+
+    os.makedirs(such_pfad, exist_ok=True)
+    for name in sorted(betroffen):
+        pfad = os.path.join(such_pfad, f"{name}.json")
+        shard = {} if neuaufbau else lese_json(pfad, {})
+
+        # Alte Postings der betroffenen Tage entfernen ...
+        for token in list(shard):
+            for datum in zu_entfernen & shard[token].keys():
+                del shard[token][datum]
+            if not shard[token]:
+                del shard[token]
+        # ... und neue eintragen
+        for token, postings in neue_shards.get(name, {}).items():
+            shard.setdefault(token, {}).update(postings)
+
+        schreibe_such_shard(pfad, shard)
+        if shard:
+            shard_namen.add(name)
+        else:
+            shard_namen.discard(name)
+
+    manifest = {
+        'version': SUCH_VERSION,
+        'praefix_laenge': SUCH_PRAEFIX_LAENGE,
+        'min_laenge': SUCH_MIN_LAENGE,
+        'felder': {feld: bit for feld, bit in SUCH_FELDER},
+        'stopwords': sorted(SUCH_STOPWORDS),
+        'shards': sorted(shard_namen)
+    }
+    schreibe_wenn_geaendert(manifest_pfad, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')) + '\n')
+    print(f"✅ Suchindex aktualisiert: {len(neu)} Tage indexiert, {len(betroffen)} von {len(shard_namen)} Shards geschrieben")
+
+
+if __name__ == "__main__":
+    aktualisiere_index()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Microbenchmarks für die heißen Helfer
+Misst pro Artikel bzw. pro Bewertung aufgerufene Funktionen mit einem Korpus
+aus dem echten Archiv (docs/newsletter-*.json) und gespeicherten HTML-Seiten:
+- extrahiere_sauberen_titel    Link-Texte der Scraping-Quellen (Titel + Teaser)
+- berechne_titel_aehnlichkeit  Titel-Paare wie im Duplikat-Check
+- apply_learning_boost         alle Artikel mit den aktuellen learning_rules.py
+- extrahiere_volltext          Extraktion aus fetch_full_article() auf HTML-Seiten
+- extrahiere_keywords          weekly_analysis.py, ein Aufruf pro Titel
+
+HTML-Seiten kommen aus Fixture-Verzeichnissen (NEWSLETTER_FIXTURES, z.B. mit
+NEWSLETTER_DIENSTE=aufnehmen live aufgezeichnet) und --html Verzeichnissen mit
+*.html; ohne beides werden Seiten aus den Archiv-Artikeln erzeugt.
+
+Ergebnis als JSON (mit Git-Commit) in benchmarks/micro-<commit>.json -
+mit --vergleiche gegen das Ergebnis eines anderen Commits (Exit-Code 1 bei Regression).
+Aus dem Repository-Verzeichnis starten (learning_rules.py):
+
+    python newsletter_microbench.py
+    python newsletter_microbench.py --nur extrahiere_volltext --wiederholungen 10
+    python newsletter_microbench.py --vergleiche benchmarks/micro-1a2b3c4.json
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import glob
+import argparse
+import statistics
+import contextlib
+import subprocess
+
+from newsletter_archiv import DOCS_VERZEICHNIS, iter_artikel
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+BENCHMARK_VERZEICHNIS = os.environ.get('NEWSLETTER_BENCHMARK_DIR', 'benchmarks')
+BENCHMARK_TOLERANZ = float(os.environ.get('BENCHMARK_TOLERANZ', '0.25'))
+MICRO_WIEDERHOLUNGEN = 5
+MAX_HTML_SEITEN = 500
+
+# Scraping-Quellen liefern Link-Texte mit Teaser statt sauberer Titel
+SCRAPING_QUELLEN = ('kress', 'meedia', 'turi2')
+
+
+# ============================================================================
+# KORPUS
+# ============================================================================
+
+def lade_html_seiten(verzeichnisse, max_seiten=MAX_HTML_SEITEN):
+    """HTML-Seiten aus Fixture-Verzeichnissen (index.json) und Verzeichnissen mit *.html"""
+    seiten = []
+    for verzeichnis in verzeichnisse:
+        index_pfad = os.path.join(verzeichnis, 'index.json')
+        if os.path.exists(index_pfad):
+            with open(index_pfad, encoding='utf-8') as f:
+                index = json.load(f)
+            dateien = [os.path.join(verzeichnis, e['datei']) for _, e in sorted(index.items())
+                       if 'html' in (e.get('content_type') or '') and e.get('status') == 200]
+        else:
+            dateien = sorted(glob.glob(os.path.join(verzeichnis, '**', '*.html'), recursive=True))
+        for pfad in dateien:
+            if len(seiten) >= max_seiten:
+                return seiten
+            with open(pfad, 'rb') as f:
+                seiten.append(f.read())
+    return seiten
+
+
+def erzeuge_html_seiten(artikel_liste, max_seiten=MAX_HTML_SEITEN):
+    """Ersatz-Seiten aus Archiv-Artikeln (Layout wie im End-to-End Benchmark)"""
+    from newsletter_benchmark import artikelseite_html
+
+    return [
+        artikelseite_html({'title': a['title'], 'absaetze': [a.get('summary') or a['title']] * 4})
+        for a in artikel_liste[-max_seiten:]
+    ]
+
+
+def baue_korpus(docs=DOCS_VERZEICHNIS, html_verzeichnisse=(), max_seiten=MAX_HTML_SEITEN):
+    """
+    Eingaben pro Helfer aus dem Archiv - Listen von Argument-Tupeln
+    Returns: (korpus, beschreibung)
+    """
+    artikel_liste = list(iter_artikel(docs))
+    if not artikel_liste:
+        raise SystemExit(f"❌ Keine Newsletter-Dateien in {docs}")
+
+    roh_titel = [
+        (f"{a['title']} {a.get('summary') or ''}"[:400] if a['source'] in SCRAPING_QUELLEN else a['title'],)
+        for a in artikel_liste
+    ]
+
+    # Duplikat-Check vergleicht Titel mit archivierten Titeln derselben URL: neben
+    # fremden Titeln derselben Quelle auch leicht geänderte Fassungen
+    paare = []
+    letzter_titel = {}
+    for artikel in artikel_liste:
+        titel = artikel['title']
+        paare.append((titel, letzter_titel.get(artikel['source'], titel)))
+        paare.append((titel, titel.rsplit(' ', 1)[0] + ' (aktualisiert)'))
+        letzter_titel[artikel['source']] = titel
+
+    boosts = []
+    for nummer, artikel in enumerate(artikel_liste):
+        woerter = (artikel.get('summary') or '').lower().split()
+        boosts.append((3 + nummer % 8, artikel['source'], artikel['title'], [w for w in woerter if len(w) > 5][:10]))
+
+    seiten = lade_html_seiten(html_verzeichnisse, max_seiten)
+    seiten_herkunft = 'gespeichert'
+    if not seiten:
+        seiten = erzeuge_html_seiten(artikel_liste, max_seiten)
+        seiten_herkunft = 'erzeugt'
+
+    korpus = {
+        'extrahiere_sauberen_titel': roh_titel,
+        'berechne_titel_aehnlichkeit': paare,
+        'apply_learning_boost': boosts,
+        'extrahiere_volltext': [(seite,) for seite in seiten],
+        'extrahiere_keywords': [(a['title'],) for a in artikel_liste],
+    }
+    beschreibung = {
+        'tage': len({a['date'] for a in artikel_liste}),
+        'artikel': len(artikel_liste),
+        'html_seiten': len(seiten),
+        'html_herkunft': seiten_herkunft,
+        'html_bytes': sum(len(s) for s in seiten),
+    }
+    return korpus, beschreibung
+
+
+# ============================================================================
+# MESSUNG
+# ============================================================================
+
+def lade_helfer():
+    """Die gemessenen Funktionen - Newsletter ohne Netzwerk, Archiv und Checkpoints importieren"""
+    os.environ.setdefault('NEWSLETTER_DIENSTE', 'offline')
+    os.environ.setdefault('ARCHIV_BACKEND', 'aus')
+    os.environ.setdefault('NEWSLETTER_CHECKPOINTS', '0')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import medien_newsletter_web as newsletter
+    helfer = {
+        'extrahiere_sauberen_titel': newsletter.extrahiere_sauberen_titel,
+        'berechne_titel_aehnlichkeit': newsletter.berechne_titel_aehnlichkeit,
+        'apply_learning_boost': newsletter.apply_learning_boost,
+        'extrahiere_volltext': newsletter.extrahiere_volltext,
+    }
+    try:
+        from weekly_analysis import extrahiere_keywords
+        helfer['extrahiere_keywords'] = extrahiere_keywords
+    except ImportError as e:
+        print(f"⚠️ weekly_analysis nicht importierbar ({e}) - extrahiere_keywords wird übersprungen")
+    return helfer
+
+
+def miss_helfer(funktion, eingaben, wiederholungen=MICRO_WIEDERHOLUNGEN):
+    """Ganzer Korpus pro Wiederholung (nach einem Aufwärmlauf) - bester und mittlerer Durchlauf"""
+    zeiten = []
+    with open(os.devnull, 'w') as stumm, contextlib.redirect_stdout(stumm):
+        for durchlauf in range(wiederholungen + 1):
+            start = time.perf_counter()
+            for argumente in eingaben:
+                funktion(*argumente)
+            if durchlauf:
+                zeiten.append(time.perf_counter() - start)
+    bester = min(zeiten)
+    return {
+        'aufrufe': len(eingaben),
+        'wiederholungen': wiederholungen,
+        'bester_s': round(bester, 5),
+        'median_s': round(statistics.median(zeiten), 5),
+        'us_pro_aufruf': round(bester / len(eingaben) * 1e6, 3),
+        'aufrufe_pro_s': round(len(eingaben) / bester) if bester > 0 else None,
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        geaendert = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                   capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if geaendert else commit
+
+
+def vergleiche(ergebnis, alt, toleranz=BENCHMARK_TOLERANZ):
+    """Regressionen: µs pro Aufruf mehr als `toleranz` über dem alten Ergebnis"""
+    regressionen = []
+    for name, werte in ergebnis['helfer'].items():
+        vorher = alt.get('helfer', {}).get(name)
+        if vorher and werte['us_pro_aufruf'] > vorher['us_pro_aufruf'] * (1 + toleranz):
+            regressionen.append(f"{name}: {vorher['us_pro_aufruf']} → {werte['us_pro_aufruf']} µs/Aufruf")
+    return regressionen
+
+
+def drucke_ergebnis(ergebnis, alt=None):
+    k = ergebnis['korpus']
+    print(f"\n🔬 MICROBENCHMARKS @ {ergebnis['commit'] or '?'} - {k['artikel']} Artikel aus {k['tage']} Tagen, "
+          f"{k['html_seiten']} HTML-Seiten ({k['html_herkunft']}, {k['html_bytes'] // 1024} KB)")
+    print("="*86)
+    print(f"{'Helfer':<30}{'Aufrufe':>9}{'µs/Aufruf':>12}{'Aufrufe/s':>12}{'Median':>10}{'vorher':>12}")
+    for name, werte in ergebnis['helfer'].items():
+        vorher = (alt or {}).get('helfer', {}).get(name)
+        vergleich = f"{vorher['us_pro_aufruf'] / werte['us_pro_aufruf']:>11.2f}×" if vorher else f"{'-':>12}"
+        print(f"{name:<30}{werte['aufrufe']:>9}{werte['us_pro_aufruf']:>12.1f}{werte['aufrufe_pro_s'] or 0:>12}"
+              f"{werte['median_s']:>9.3f}s{vergleich}")
+    if alt:
+        print(f"(vorher = Beschleunigung gegenüber {alt.get('commit') or 'Vergleichsdatei'}, >1 ist schneller)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Microbenchmarks für die heißen Helfer des Newsletters')
+    parser.add_argument('--docs', default=DOCS_VERZEICHNIS, help='Verzeichnis mit newsletter-*.json')
+    parser.add_argument('--html', action='append', default=[],
+                        help='Verzeichnis mit gespeicherten Seiten (*.html oder Fixture-index.json), mehrfach möglich')
+    parser.add_argument('--nur', action='append', help='Nur diese Helfer messen (mehrfach möglich)')
+    parser.add_argument('--wiederholungen', type=int, default=MICRO_WIEDERHOLUNGEN)
+    parser.add_argument('--max-seiten', type=int, default=MAX_HTML_SEITEN)
+    parser.add_argument('--ausgabe', help='JSON-Datei (Standard: benchmarks/micro-<commit>.json)')
+    parser.add_argument('--vergleiche', help='Ergebnis-JSON eines anderen Commits')
+    parser.add_argument('--toleranz', type=float, default=BENCHMARK_TOLERANZ)
+    args = parser.parse_args()
+
+    fixtures = os.environ.get('NEWSLETTER_FIXTURES', os.path.join('offline', 'fixtures'))
+    html_verzeichnisse = args.html or [v for v in (fixtures,) if os.path.isdir(v)]
+    korpus, beschreibung = baue_korpus(args.docs, html_verzeichnisse, args.max_seiten)
+    helfer = lade_helfer()
+
+    ergebnis = {
+        'commit': git_commit(),
+        'zeitpunkt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'korpus': beschreibung,
+        'helfer': {},
+    }
+    for name, funktion in helfer.items():
+        if args.nur and name not in args.nur:
+            continue
+        print(f"⏱️ {name} ({len(korpus[name])} Aufrufe × {args.wiederholungen})...")
+        ergebnis['helfer'][name] = miss_helfer(funktion, korpus[name], args.wiederholungen)
+
+    alt = None
+    if args.vergleiche:
+        with open(args.vergleiche, encoding='utf-8') as f:
+            alt = json.load(f)
+    drucke_ergebnis(ergebnis, alt)
+
+    pfad = args.ausgabe or os.path.join(BENCHMARK_VERZEICHNIS, f"micro-{ergebnis['commit'] or 'unbekannt'}.json")
+    os.makedirs(os.path.dirname(pfad) or '.', exist_ok=True)
+    with open(pfad, 'w', encoding='utf-8') as f:
+        json.dump(ergebnis, f, ensure_ascii=False, indent=2)
+    print(f"💾 Ergebnis: {pfad}")
+
+    if alt:
+        regressionen = vergleiche(ergebnis, alt, args.toleranz)
+        if regressionen:
+            print(f"\n❌ {len(regressionen)} Regression(en):")
+            for meldung in regressionen:
+                print(f"   - {meldung}")
+            sys.exit(1)
+        print(f"✅ Keine Regression (Toleranz {args.toleranz:.0%})")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Pseudonyme Nutzer-IDs für Per-User Daten
+Per-User Boosts (learning_rules.py), Tages-Aggregate (bewertungs_aggregate.json)
+und die Per-Empfänger Reihenfolge in docs/newsletter-*.json liegen im
+öffentlichen Repository. Dort steht deshalb nie eine Email-Adresse, sondern
+
+    nutzer_id('anna@zooproductions.de')  →  'u_3f0c…' (HMAC-SHA256, 16 Hex-Zeichen)
+
+Der Schlüssel (NEWSLETTER_NUTZER_SCHLUESSEL, GitHub Secret) bleibt geheim - ohne
+ihn lässt sich eine ID keiner Adresse zuordnen, auch nicht durch Durchprobieren
+bekannter Adressen. Das ist pseudonym, nicht anonym: wer den Schlüssel hat,
+kann IDs zuordnen. Ohne Schlüssel gibt es keine IDs und damit keine Per-User Daten.
+"""
+
+import os
+import hmac
+import hashlib
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+NUTZER_SCHLUESSEL = os.environ.get('NEWSLETTER_NUTZER_SCHLUESSEL', '')
+NUTZER_ID_PRAEFIX = 'u_'
+
+
+def nutzer_id(email, schluessel=NUTZER_SCHLUESSEL):
+    """Pseudonyme ID einer Email-Adresse - None ohne Schlüssel oder ohne gültige Adresse"""
+    email = (email or '').strip().lower()
+    if not schluessel or '@' not in email:
+        return None
+    digest = hmac.new(schluessel.encode('utf-8'), email.encode('utf-8'), hashlib.sha256).hexdigest()
+    return NUTZER_ID_PRAEFIX + digest[:16]
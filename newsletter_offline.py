@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Kompletter Tageslauf ohne Netzwerk
+Startet main() aus medien_newsletter_web.py mit lokalen Stand-ins für jeden Dienst:
+- Feeds, Startseiten und Artikel aus Fixtures (offline/fixtures, beim ersten Lauf
+  aus den letzten Archiv-Tagen in docs/ erzeugt oder mit NEWSLETTER_DIENSTE=aufnehmen
+  live aufgezeichnet)
+- Claude als deterministischer Stub (gleiche Eingabe → gleiche Scores/Zusammenfassungen)
+- Archiv im Arbeitsspeicher, keine Supabase-Verbindung, keine Checkpoints
+- Emails als .eml-Dateien in offline/emails statt SMTP, Trace in offline/traces
+- Webseite in einer Kopie von docs/ (offline/docs) - das echte docs/ bleibt unberührt
+
+    python newsletter_offline.py
+    python newsletter_offline.py --claude-latenz-ms 800 --http-latenz-ms 150
+    python newsletter_offline.py --neu     # Kopie und Fixtures neu aufbauen
+"""
+
+import os
+import shutil
+import argparse
+
+QUELL_VERZEICHNIS = os.path.dirname(os.path.abspath(__file__))
+OFFLINE_VERZEICHNIS = os.environ.get('NEWSLETTER_OFFLINE_DIR', 'offline')
+
+
+def offline_umgebung(verzeichnis=OFFLINE_VERZEICHNIS, claude_latenz_ms=0, http_latenz_ms=0):
+    """Umgebungsvariablen für den Offline-Lauf - vor dem Import der Newsletter-Module setzen"""
+    werte = {
+        'NEWSLETTER_DIENSTE': 'offline',
+        'NEWSLETTER_FIXTURES': os.path.join(verzeichnis, 'fixtures'),
+        'NEWSLETTER_DOCS_DIR': os.path.join(verzeichnis, 'docs'),
+        'ARCHIV_BACKEND': 'speicher',
+        'EMAIL_AUSGABE_VERZEICHNIS': os.path.join(verzeichnis, 'emails'),
+        'NEWSLETTER_TRACE_DIR': os.path.join(verzeichnis, 'traces'),
+        'NEWSLETTER_PROFIL_DIR': os.path.join(verzeichnis, 'profile'),
+        'NEWSLETTER_CHECKPOINTS': '0',
+        'OFFLINE_CLAUDE_LATENZ_MS': str(claude_latenz_ms),
+        'OFFLINE_HTTP_LATENZ_MS': str(http_latenz_ms),
+    }
+    os.environ.update(werte)
+    return werte
+
+
+def bereite_offline_vor(verzeichnis=OFFLINE_VERZEICHNIS, neu=False):
+    """Kopie von docs/ und Fixtures anlegen (falls noch nicht vorhanden oder neu=True)"""
+    import medien_newsletter_web as newsletter
+    from newsletter_dienste import erzeuge_fixtures
+
+    docs_kopie = os.path.join(verzeichnis, 'docs')
+    if neu and os.path.exists(docs_kopie):
+        shutil.rmtree(docs_kopie)
+    if not os.path.exists(docs_kopie):
+        shutil.copytree(os.path.join(QUELL_VERZEICHNIS, 'docs'), docs_kopie)
+        print(f"📁 docs/ kopiert nach {docs_kopie}")
+
+    fixtures = os.path.join(verzeichnis, 'fixtures')
+    if neu or not os.path.exists(os.path.join(fixtures, 'index.json')):
+        anzahl = erzeuge_fixtures(
+            newsletter.RSS_FEEDS, newsletter.WEB_SCRAPING_SOURCES, fixtures,
+            os.path.join(QUELL_VERZEICHNIS, 'docs')
+        )
+        print(f"📼 {anzahl} Fixtures aus dem Archiv erzeugt in {fixtures}")
+    return newsletter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Kompletter Newsletter-Lauf ohne Netzwerk')
+    parser.add_argument('--verzeichnis', default=OFFLINE_VERZEICHNIS)
+    parser.add_argument('--claude-latenz-ms', type=int, default=0, help='Simulierte Claude-Antwortzeit')
+    parser.add_argument('--http-latenz-ms', type=int, default=0, help='Simulierte Antwortzeit pro Feed/Seite')
+    parser.add_argument('--neu', action='store_true', help='docs-Kopie und Fixtures neu aufbauen')
+    args = parser.parse_args()
+
+    offline_umgebung(args.verzeichnis, args.claude_latenz_ms, args.http_latenz_ms)
+    bereite_offline_vor(args.verzeichnis, args.neu).main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - HTML-Parsing, optional in einem Prozess-Pool
+BeautifulSoup ist reine CPU-Arbeit und hält den GIL - laufen die Abrufe
+gleichzeitig (Streaming-Pipeline), serialisiert sich das Parsen auf einem Kern.
+Mit NEWSLETTER_PARSER=prozesse geben die Abrufer die rohen Bytes an einen
+Prozess-Pool (ein Prozess pro verfügbarem Kern) und bekommen Text bzw. Links zurück:
+
+    starte_parser()                                  # vor dem Start von Threads
+    text = parse(extrahiere_volltext, response.content)
+    links = parse(links_aus_html, response.content)  # [(text, href), ...]
+    texte = parse(texte_aus_html, beschreibungen)    # ein Aufruf pro Feed
+    beende_parser()
+
+Ohne Pool (Standard: NEWSLETTER_PARSER=inline) läuft dieselbe Funktion im
+aufrufenden Thread. Die Parse-Funktionen sind reine Funktionen ohne Zustand
+und brauchen nur bs4 - Worker-Prozesse importieren nur dieses Modul.
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bs4 import BeautifulSoup
+
+from newsletter_trace import span
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+PARSER_MODUS = os.environ.get('NEWSLETTER_PARSER', 'inline')   # 'inline' oder 'prozesse'
+PARSER_PROZESSE = int(os.environ.get('NEWSLETTER_PARSER_PROZESSE', '0'))  # 0 = ein Prozess pro Kern
+
+VOLLTEXT_MAX_ZEICHEN = 3000
+VOLLTEXT_MIN_ZEICHEN = 200
+CONTENT_SELEKTOREN = [
+    'div.article-content',
+    'div.post-content',
+    'div.entry-content',
+    'div.content',
+    'div.story-body',
+    'div.article-body',
+    'main'
+]
+
+_parser = {
+    'pool': None,
+    'prozesse': 0,
+    'sperre': threading.Lock(),
+}
+
+
+# ============================================================================
+# PARSE-FUNKTIONEN (laufen im Worker-Prozess oder inline)
+# ============================================================================
+
+def text_aus_html(html):
+    """Sichtbarer Text eines HTML-Fragments (z.B. Feed-Beschreibung)"""
+    return BeautifulSoup(html, 'html.parser').get_text(separator=' ', strip=True)
+
+
+def texte_aus_html(fragmente):
+    """text_aus_html für eine Liste - leere Einträge bleiben unverändert"""
+    return [text_aus_html(fragment) if fragment else fragment for fragment in fragmente]
+
+
+def links_aus_html(html):
+    """Alle Links einer Seite als [(Linktext, href), ...] in Dokument-Reihenfolge"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [(link.get_text(separator=' ', strip=True), link.get('href')) for link in soup.find_all('a', href=True)]
+
+
+def extrahiere_volltext(html):
+    """
+    Artikeltext aus einer geladenen Seite (Bytes oder str)
+    3-Stufen-Strategie für maximale Erfolgsrate
+    Returns: max. 3000 Zeichen oder None
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Entferne Scripte, Styles, Nav, Footer
+    for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
+        tag.decompose()
+
+    # Strategie 1: Suche nach <article> Tag
+    article = soup.find('article')
+    if article:
+        text = article.get_text(separator=' ', strip=True)
+        if len(text) > VOLLTEXT_MIN_ZEICHEN:
+            return text[:VOLLTEXT_MAX_ZEICHEN]
+
+    # Strategie 2: Suche nach gängigen Content-Klassen
+    for selector in CONTENT_SELEKTOREN:
+        content = soup.select_one(selector)
+        if content:
+            text = content.get_text(separator=' ', strip=True)
+            if len(text) > VOLLTEXT_MIN_ZEICHEN:
+                return text[:VOLLTEXT_MAX_ZEICHEN]
+
+    # Strategie 3: Alle <p> Tags im Body
+    paragraphs = soup.find_all('p')
+    if paragraphs:
+        text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+        if len(text) > VOLLTEXT_MIN_ZEICHEN:
+            return text[:VOLLTEXT_MAX_ZEICHEN]
+
+    return None
+
+
+# ============================================================================
+# PROZESS-POOL
+# ============================================================================
+
+def verfuegbare_kerne():
+    """Kerne, auf denen dieser Prozess laufen darf (CPU-Affinität/Container), sonst alle"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def starte_parser(modus=PARSER_MODUS, prozesse=PARSER_PROZESSE):
+    """
+    Prozess-Pool starten (nur bei modus='prozesse') - Returns: Anzahl Prozesse, 0 = inline
+    Möglichst vor dem Start von Threads aufrufen: unter POSIX werden die Worker
+    per fork erzeugt, und zwar alle sofort
+    """
+    if modus != 'prozesse':
+        return 0
+    with _parser['sperre']:
+        if _parser['pool'] is None:
+            anzahl = prozesse or verfuegbare_kerne()
+            kontext = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+            _parser['pool'] = ProcessPoolExecutor(max_workers=anzahl, mp_context=kontext)
+            _parser['prozesse'] = anzahl
+            # Erster Auftrag startet alle Worker (bei fork sofort, solange noch kein Thread läuft)
+            _parser['pool'].submit(len, b'').result()
+            print(f"⚙️ HTML-Parser: Prozess-Pool mit {anzahl} Prozessen")
+    return _parser['prozesse']
+
+
+def beende_parser():
+    with _parser['sperre']:
+        pool, _parser['pool'], _parser['prozesse'] = _parser['pool'], None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _laenge(daten):
+    if isinstance(daten, (bytes, str)):
+        return len(daten)
+    return sum(len(d) for d in daten if d)
+
+
+def parse(funktion, daten):
+    """
+    funktion(daten) im Prozess-Pool (falls gestartet) oder inline ausführen
+    Fehler der Parse-Funktion werden wie inline weitergereicht
+    """
+    pool = _parser['pool']
+    with span('parsen', funktion.__name__, modus='prozesse' if pool else 'inline') as aktuell:
+        aktuell['bytes'] = _laenge(daten)
+        if pool is None:
+            return funktion(daten)
+        try:
+            return pool.submit(funktion, daten).result()
+        except BrokenProcessPool:
+            print("⚠️ HTML-Parser: Prozess-Pool ausgefallen - parse ab jetzt inline")
+            with _parser['sperre']:
+                if _parser['pool'] is pool:
+                    _parser['pool'], _parser['prozesse'] = None, 0
+            return funktion(daten)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Streaming-Pipeline
+Stufen laufen gleichzeitig in eigenen Threads und sind über begrenzte
+Warteschlangen verbunden - ein Artikel wandert weiter, sobald er fertig ist,
+statt auf das langsamste Element der vorherigen Phase zu warten.
+
+    quelle = starte_quelle('sammeln', erzeuger, worker=4)
+    buendel = starte_buendel('buendeln', quelle, max_elemente=100, max_wartezeit_s=3)
+    bewertet = starte_stufe('bewerten', bewerte, buendel, worker=2)
+    for artikel in sammle_ergebnisse(bewertet): ...
+    drucke_pipeline_bericht([quelle, buendel, bewertet])
+
+Jede Stufe zählt Ein-/Ausgänge, Fehler, Arbeitszeit (inkl. Warten auf einen
+vollen Ausgang) und die maximale Tiefe ihrer Ausgangs-Warteschlange
+(Rückstau = die nächste Stufe ist der Engpass).
+Worker-Threads laufen im Kontext des Aufrufers (z.B. aktueller Trace-Span)
+und heißen pipeline-<stufe>-<n> (Trace, Profiling).
+"""
+
+import os
+import time
+import queue
+import threading
+import contextvars
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+PIPELINE_PUFFER = int(os.environ.get('PIPELINE_PUFFER', '20'))
+
+# Markiert das Ende einer Warteschlange
+ENDE = object()
+
+
+# ============================================================================
+# STUFEN
+# ============================================================================
+
+def _neue_stufe(name, worker):
+    return {
+        'name': name,
+        'worker': worker,
+        'ausgang': queue.Queue(maxsize=PIPELINE_PUFFER),
+        'eingang_anzahl': 0,
+        'ausgang_anzahl': 0,
+        'fehler': 0,
+        'arbeitszeit': 0.0,
+        'max_tiefe': 0,
+        'start': time.perf_counter(),
+        'ende': None,
+        'sperre': threading.Lock(),
+        'aktiv': worker,
+        'threads': [],
+    }
+
+
+def _gib_aus(stufe, element):
+    stufe['ausgang'].put(element)
+    with stufe['sperre']:
+        stufe['ausgang_anzahl'] += 1
+        stufe['max_tiefe'] = max(stufe['max_tiefe'], stufe['ausgang'].qsize())
+
+
+def _worker_fertig(stufe):
+    """Der letzte Worker einer Stufe schließt deren Ausgang"""
+    with stufe['sperre']:
+        stufe['aktiv'] -= 1
+        letzter = stufe['aktiv'] == 0
+        if letzter:
+            stufe['ende'] = time.perf_counter()
+    if letzter:
+        stufe['ausgang'].put(ENDE)
+
+
+def _starte_worker(stufe, lauf):
+    """Worker mit einer Kopie des aktuellen Kontexts (ContextVars) starten"""
+    for _ in range(stufe['worker']):
+        name = f"pipeline-{stufe['name']}-{len(stufe['threads']) + 1}"
+        stufe['threads'].append(threading.Thread(target=contextvars.copy_context().run, args=(lauf,),
+                                                 name=name, daemon=True))
+        stufe['threads'][-1].start()
+
+
+def _verarbeite(stufe, funktion, element):
+    """funktion(element) → Iterable von Ausgaben (oder None); Fehler werden gezählt"""
+    start = time.perf_counter()
+    try:
+        for ergebnis in funktion(element) or ():
+            _gib_aus(stufe, ergebnis)
+    except Exception as e:
+        with stufe['sperre']:
+            stufe['fehler'] += 1
+        print(f"   ❌ Pipeline-Stufe {stufe['name']}: {e}")
+    finally:
+        with stufe['sperre']:
+            stufe['eingang_anzahl'] += 1
+            stufe['arbeitszeit'] += time.perf_counter() - start
+
+
+def starte_quelle(name, aufgaben, worker=1):
+    """
+    Erste Stufe: führt die Aufgaben (Funktionen ohne Argumente, die eine Liste
+    liefern) parallel aus und gibt jedes Ergebnis als Ganzes weiter
+    """
+    stufe = _neue_stufe(name, max(1, min(worker, len(aufgaben))))
+    aufgaben_queue = queue.Queue()
+    for aufgabe in aufgaben:
+        aufgaben_queue.put(aufgabe)
+
+    def lauf():
+        try:
+            while True:
+                try:
+                    aufgabe = aufgaben_queue.get_nowait()
+                except queue.Empty:
+                    return
+                _verarbeite(stufe, lambda a: [a()], aufgabe)
+        finally:
+            _worker_fertig(stufe)
+
+    _starte_worker(stufe, lauf)
+    return stufe
+
+
+def starte_stufe(name, funktion, vorgaenger, worker=1):
+    """
+    Weitere Stufe: liest aus dem Ausgang des Vorgängers
+    funktion(element) → Iterable von Ausgaben (0..n pro Eingang)
+    """
+    stufe = _neue_stufe(name, worker)
+    eingang = vorgaenger['ausgang']
+
+    def lauf():
+        try:
+            while True:
+                element = eingang.get()
+                if element is ENDE:
+                    # Für die anderen Worker dieser Stufe zurücklegen
+                    eingang.put(ENDE)
+                    return
+                _verarbeite(stufe, funktion, element)
+        finally:
+            _worker_fertig(stufe)
+
+    _starte_worker(stufe, lauf)
+    return stufe
+
+
+def starte_buendel(name, vorgaenger, max_elemente, max_wartezeit_s):
+    """
+    Fasst die Listen des Vorgängers zu Bündeln zusammen (ein Worker): ein Bündel
+    geht weiter, sobald es max_elemente hat oder max_wartezeit_s seit seiner
+    ersten Liste vergangen sind - z.B. ein Claude-Aufruf für mehrere Quellen
+    statt einem pro Quelle. Listen werden nie geteilt.
+    """
+    stufe = _neue_stufe(name, 1)
+    eingang = vorgaenger['ausgang']
+
+    def lauf():
+        buendel, frist = [], None
+        try:
+            while True:
+                try:
+                    element = eingang.get(timeout=None if frist is None else max(0.0, frist - time.monotonic()))
+                except queue.Empty:
+                    element = None
+                if element is ENDE:
+                    if buendel:
+                        _gib_aus(stufe, buendel)
+                    return
+                if element is not None:
+                    with stufe['sperre']:
+                        stufe['eingang_anzahl'] += 1
+                    if element:
+                        buendel.extend(element)
+                        if frist is None:
+                            frist = time.monotonic() + max_wartezeit_s
+                if buendel and (len(buendel) >= max_elemente or time.monotonic() >= frist):
+                    _gib_aus(stufe, buendel)
+                    buendel, frist = [], None
+        finally:
+            _worker_fertig(stufe)
+
+    _starte_worker(stufe, lauf)
+    return stufe
+
+
+def taktgeber(min_abstand_s):
+    """
+    Gemeinsames Rate Limit für alle Worker einer Stufe: liefert warte(), das
+    frühestens min_abstand_s nach dem vorherigen Aufruf zurückkehrt (über alle Threads)
+    """
+    zustand = {'naechster': 0.0, 'sperre': threading.Lock()}
+
+    def warte():
+        with zustand['sperre']:
+            jetzt = time.monotonic()
+            start = max(jetzt, zustand['naechster'])
+            zustand['naechster'] = start + min_abstand_s
+        if start > jetzt:
+            time.sleep(start - jetzt)
+
+    return warte
+
+
+def sammle_ergebnisse(stufe):
+    """Generator über die Ausgänge der letzten Stufe (bis alle Stufen fertig sind)"""
+    while True:
+        element = stufe['ausgang'].get()
+        if element is ENDE:
+            return
+        yield element
+
+
+# ============================================================================
+# BERICHT
+# ============================================================================
+
+def pipeline_bericht(stufen):
+    """Kennzahlen pro Stufe als Liste von Dicts (z.B. für Run-Statistiken)"""
+    bericht = []
+    for stufe in stufen:
+        dauer = (stufe['ende'] or time.perf_counter()) - stufe['start']
+        bericht.append({
+            'stufe': stufe['name'],
+            'worker': stufe['worker'],
+            'eingang': stufe['eingang_anzahl'],
+            'ausgang': stufe['ausgang_anzahl'],
+            'fehler': stufe['fehler'],
+            'dauer_s': round(dauer, 2),
+            'arbeitszeit_s': round(stufe['arbeitszeit'], 2),
+            'durchsatz_pro_s': round(stufe['eingang_anzahl'] / dauer, 2) if dauer > 0 else 0.0,
+            'max_warteschlange': stufe['max_tiefe'],
+        })
+    return bericht
+
+
+def drucke_pipeline_bericht(stufen):
+    print(f"\n⏱️ PIPELINE")
+    print("="*70)
+    print(f"{'Stufe':<16}{'Worker':>7}{'Ein':>6}{'Aus':>6}{'Fehler':>7}{'Dauer':>9}{'Arbeit':>9}{'/s':>9}{'Max-Q':>7}")
+    bericht = pipeline_bericht(stufen)
+    for z in bericht:
+        print(f"{z['stufe']:<16}{z['worker']:>7}{z['eingang']:>6}{z['ausgang']:>6}{z['fehler']:>7}"
+              f"{z['dauer_s']:>8.1f}s{z['arbeitszeit_s']:>8.1f}s{z['durchsatz_pro_s']:>9.2f}{z['max_warteschlange']:>7}")
+    return bericht
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Profiling-Modus für CPU- und Speicher-Hotspots
+Mit NEWSLETTER_PROFIL=1 laufen medien_newsletter_web.py und weekly_analysis.py
+unter cProfile und tracemalloc:
+
+    starte_profil('newsletter', '2026-01-15')
+    with profil_stufe('sammeln'):
+        ...
+    beende_profil()   # → profile/newsletter-<datum>-<zeit>/ + Top-N Hotspots
+
+Pro Stufe entsteht ein eigenes CPU-Profil (cpu-<stufe>.prof, lesbar mit
+`python -m pstats` oder snakeviz) und ein Speicher-Vergleich vor/nach der Stufe
+(speicher-<stufe>.txt), dazu cpu-gesamt.prof und profil.json mit der Zusammenfassung.
+Die Zeit wird nach Kategorien aufgeteilt (HTML-Parsing, Regex, Netzwerk-Warten,
+Pausen ...) - so ist sichtbar, ob ein langsamer Lauf an BeautifulSoup, an
+Regex oder am Netzwerk hängt.
+
+Threads werden mitprofiliert: Worker der Streaming-Pipeline (Thread-Name
+pipeline-<stufe>-<n>) zählen zu ihrer Stufe, andere Threads zur Stufe, in der
+sie gestartet wurden. Ab Python 3.12 misst cProfile alle Threads gemeinsam -
+dann landet ihre Zeit in der jeweils laufenden Stufe des Haupt-Threads.
+Ohne NEWSLETTER_PROFIL=1 kosten die Aufrufe nichts.
+"""
+
+import os
+import re
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+PROFIL_AKTIV = os.environ.get('NEWSLETTER_PROFIL', '0') == '1'
+PROFIL_VERZEICHNIS = os.environ.get('NEWSLETTER_PROFIL_DIR', 'profile')
+PROFIL_TOP_N = int(os.environ.get('NEWSLETTER_PROFIL_TOP_N', '15'))
+PROFIL_FRAMES = 5           # Stack-Tiefe der tracemalloc-Einträge
+PROFIL_STUFE_START = 'start'  # Alles außerhalb einer Stufe
+
+# Kategorie → Teilstrings von "<datei>:<funktion>" (erste passende gewinnt, nach Eigenzeit)
+KATEGORIEN = {
+    'html_parsing': ('/bs4/', 'html/parser.py', '_markupbase.py', 'lxml', 'html5lib'),
+    'regex': ("'re.Pattern'", '/re/', 'sre_', '/re.py'),
+    'netzwerk': ('_ssl.', '_socket.', '/socket.py', '/ssl.py', 'select', '/urllib3/', '/requests/',
+                 '/http/client.py', 'getaddrinfo'),
+    'pause': ('time.sleep',),
+    'threads_warten': ("'_thread.lock'", "'_thread.RLock'", '/threading.py', '/queue.py'),
+    'json': ('/json/', '_json.'),
+    'sqlite': ('sqlite3',),
+    'feedparser': ('/feedparser/',),
+}
+
+_profil = None
+_profil_sperre = threading.Lock()
+
+
+# ============================================================================
+# AUFZEICHNUNG
+# ============================================================================
+
+def _starte_cpu(stufe):
+    """Neues cProfile für die Stufe (mehrere pro Stufe möglich, werden zusammengeführt)"""
+    profil = cProfile.Profile()
+    with _profil_sperre:
+        _profil['cpu'].setdefault(stufe, []).append(profil)
+    try:
+        profil.enable()
+    except ValueError:
+        # Python 3.12+: ein Profiler ist bereits global aktiv und misst diesen Thread mit
+        return None
+    return profil
+
+
+def _thread_start(*_):
+    """threading.setprofile-Hook: läuft beim ersten Ereignis eines neuen Threads"""
+    name = threading.current_thread().name
+    treffer = re.match(r'pipeline-(.+)-\d+$', name)
+    _starte_cpu(treffer.group(1) if treffer else _profil['stufe'])
+
+
+def _schnappschuss():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+
+
+def starte_profil(name, lauf, aktiv=PROFIL_AKTIV, verzeichnis=PROFIL_VERZEICHNIS):
+    """Profiling für einen Lauf starten - Returns: Profil-Dict oder None (inaktiv)"""
+    global _profil
+    if not aktiv:
+        _profil = None
+        return None
+    _profil = {
+        'name': name,
+        'lauf': lauf,
+        'verzeichnis': os.path.join(verzeichnis, f"{name}-{lauf}-{datetime.now().strftime('%H%M%S')}"),
+        'start': time.perf_counter(),
+        'stufe': PROFIL_STUFE_START,
+        'cpu': {},
+        'speicher': [],
+        'haupt': None,
+    }
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(PROFIL_FRAMES)
+    _profil['haupt'] = _starte_cpu(PROFIL_STUFE_START)
+    threading.setprofile(_thread_start)
+    print(f"🔬 Profiling aktiv (cProfile + tracemalloc) → {_profil['verzeichnis']}")
+    return _profil
+
+
+@contextmanager
+def profil_stufe(stufe):
+    """
+    Stufe mit eigenem CPU-Profil und Speicher-Schnappschuss vorher/nachher
+    Nur im Haupt-Thread verwenden - Stufen dürfen nicht verschachtelt werden
+    """
+    if _profil is None:
+        yield
+        return
+    vorher_stufe = _profil['stufe']
+    if _profil['haupt']:
+        _profil['haupt'].disable()
+    vorher = _schnappschuss()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    _profil['stufe'] = stufe
+    _profil['haupt'] = _starte_cpu(stufe)
+    try:
+        yield
+    finally:
+        if _profil['haupt']:
+            _profil['haupt'].disable()
+        dauer = time.perf_counter() - start
+        aktuell, spitze = tracemalloc.get_traced_memory()
+        _profil['speicher'].append({
+            'stufe': stufe,
+            'dauer_s': round(dauer, 3),
+            'belegt_mb': round(aktuell / 2**20, 2),
+            'spitze_mb': round(spitze / 2**20, 2),
+            'vergleich': _schnappschuss().compare_to(vorher, 'lineno'),
+        })
+        _profil['stufe'] = vorher_stufe
+        _profil['haupt'] = _starte_cpu(vorher_stufe)
+
+
+# ============================================================================
+# AUSWERTUNG
+# ============================================================================
+
+def _kurzer_pfad(datei):
+    """Projektdateien relativ, Bibliotheken ab site-packages bzw. ab dem Python-Verzeichnis"""
+    if datei.startswith('<'):
+        return datei
+    pfad = os.path.relpath(datei)
+    if not pfad.startswith('..'):
+        return pfad
+    treffer = re.search(r'(?:site-packages|python\d+\.\d+)[/\\](.+)$', datei)
+    return treffer.group(1) if treffer else os.path.basename(datei)
+
+
+def _funktion(schluessel):
+    datei, zeile, funktion = schluessel
+    if datei == '~':
+        return funktion
+    return f"{_kurzer_pfad(datei)}:{zeile}({funktion})"
+
+
+def kategorie(schluessel):
+    datei, _, funktion = schluessel
+    text = f"{datei}:{funktion}".replace(os.sep, '/')
+    return next((name for name, muster in KATEGORIEN.items() if any(m in text for m in muster)), 'sonstiges')
+
+
+def _stats(profile):
+    """Mehrere cProfile-Objekte bzw. pstats.Stats zu einem pstats.Stats zusammenführen (None = leer)"""
+    gesamt = pstats.Stats()
+    for profil in profile:
+        gesamt.add(profil)
+    return gesamt if gesamt.stats else None
+
+
+def _cpu_auswertung(stats, top_n):
+    eintraege = stats.stats.items()
+    kategorien = {}
+    for schluessel, (_, _, eigenzeit, _, _) in eintraege:
+        name = kategorie(schluessel)
+        kategorien[name] = kategorien.get(name, 0.0) + eigenzeit
+    top = sorted(eintraege, key=lambda e: e[1][2], reverse=True)[:top_n]
+    return {
+        'eigenzeit_s': round(sum(kategorien.values()), 3),
+        'kategorien_s': {k: round(v, 3) for k, v in sorted(kategorien.items(), key=lambda k: -k[1])},
+        'top_eigenzeit': [
+            {'funktion': _funktion(schluessel), 'kategorie': kategorie(schluessel), 'aufrufe': aufrufe,
+             'eigenzeit_s': round(eigenzeit, 4), 'gesamtzeit_s': round(gesamtzeit, 4)}
+            for schluessel, (_, aufrufe, eigenzeit, gesamtzeit, _) in top
+        ],
+    }
+
+
+def _speicher_auswertung(vergleich, top_n):
+    return [
+        {'ort': f"{_kurzer_pfad(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+         'zuwachs_kb': round(s.size_diff / 1024, 1), 'bloecke': s.count_diff}
+        for s in sorted(vergleich, key=lambda s: s.size_diff, reverse=True)[:top_n]
+        if s.size_diff > 0
+    ]
+
+
+def beende_profil(top_n=PROFIL_TOP_N):
+    """
+    Profiling stoppen, Artefakte schreiben und Hotspots ausgeben
+    Returns: Zusammenfassung (auch in profil.json) oder None
+    """
+    global _profil
+    if _profil is None:
+        return None
+    profil, _profil = _profil, None
+    threading.setprofile(None)
+    if profil['haupt']:
+        profil['haupt'].disable()
+    os.makedirs(profil['verzeichnis'], exist_ok=True)
+
+    with _profil_sperre:
+        cpu = dict(profil['cpu'])
+    zusammenfassung = {
+        'name': profil['name'],
+        'lauf': profil['lauf'],
+        'dauer_s': round(time.perf_counter() - profil['start'], 2),
+        'stufen': {},
+    }
+    alle = []
+    for stufe, profile in cpu.items():
+        stats = _stats(profile)
+        if stats is None:
+            continue
+        alle.append(stats)
+        stats.dump_stats(os.path.join(profil['verzeichnis'], f"cpu-{stufe}.prof"))
+        zusammenfassung['stufen'][stufe] = {'cpu': _cpu_auswertung(stats, top_n)}
+    gesamt = _stats(alle)
+    if gesamt is not None:
+        gesamt.dump_stats(os.path.join(profil['verzeichnis'], 'cpu-gesamt.prof'))
+        zusammenfassung['cpu'] = _cpu_auswertung(gesamt, top_n)
+
+    for eintrag in profil['speicher']:
+        werte = zusammenfassung['stufen'].setdefault(eintrag['stufe'], {})
+        werte['speicher'] = {
+            'dauer_s': eintrag['dauer_s'],
+            'belegt_mb': eintrag['belegt_mb'],
+            'spitze_mb': eintrag['spitze_mb'],
+            'zuwachs_mb': round(sum(s.size_diff for s in eintrag['vergleich']) / 2**20, 2),
+            'top_zuwachs': _speicher_auswertung(eintrag['vergleich'], top_n),
+        }
+        with open(os.path.join(profil['verzeichnis'], f"speicher-{eintrag['stufe']}.txt"), 'w', encoding='utf-8') as f:
+            for statistik in eintrag['vergleich'][:100]:
+                f.write(f"{statistik}\n")
+    tracemalloc.stop()
+
+    with open(os.path.join(profil['verzeichnis'], 'profil.json'), 'w', encoding='utf-8') as f:
+        json.dump(zusammenfassung, f, ensure_ascii=False, indent=2)
+    drucke_profil(zusammenfassung, profil['verzeichnis'], top_n)
+    return zusammenfassung
+
+
+def drucke_profil(zusammenfassung, verzeichnis, top_n=PROFIL_TOP_N):
+    print(f"\n🔬 PROFIL ({zusammenfassung['dauer_s']:.1f}s, Artefakte in {verzeichnis})")
+    print("="*70)
+    for stufe, werte in zusammenfassung['stufen'].items():
+        cpu = werte.get('cpu', {})
+        speicher = werte.get('speicher')
+        kategorien = ', '.join(f"{k} {v:.1f}s" for k, v in list(cpu.get('kategorien_s', {}).items())[:3])
+        zeile = f"   {stufe:<16}{cpu.get('eigenzeit_s', 0):>8.1f}s"
+        if speicher:
+            zeile += f"  {speicher['zuwachs_mb']:>+7.1f} MB (Spitze {speicher['spitze_mb']:.1f} MB)"
+        print(f"{zeile}  {kategorien}")
+    if 'cpu' not in zusammenfassung:
+        return
+    print(f"\n   🔥 Top {top_n} nach Eigenzeit:")
+    for eintrag in zusammenfassung['cpu']['top_eigenzeit']:
+        print(f"   {eintrag['eigenzeit_s']:>8.2f}s {eintrag['gesamtzeit_s']:>8.2f}s {eintrag['aufrufe']:>8}× "
+              f"[{eintrag['kategorie']}] {eintrag['funktion'][:90]}")
+    speicher = sorted(
+        ((stufe, ort) for stufe, werte in zusammenfassung['stufen'].items()
+         for ort in werte.get('speicher', {}).get('top_zuwachs', [])),
+        key=lambda e: e[1]['zuwachs_kb'], reverse=True
+    )[:top_n]
+    if speicher:
+        print(f"\n   🧠 Top {len(speicher)} Speicher-Zuwachs:")
+        for stufe, ort in speicher:
+            print(f"   {ort['zuwachs_kb']:>10.1f} KB {ort['bloecke']:>8} Blöcke  {stufe:<14} {ort['ort'][:80]}")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Vorgerenderte Tagesseiten
+Erzeugt pro Newsletter-Tag eine statische Seite docs/d/YYYY-MM-DD.html:
+- Artikel-Markup direkt im HTML (kein JS, keine Daten-Requests, keine Datenbank)
+- Gemeinsames Stylesheet newsletter.css mit index.html
+- Bewerten weiterhin über index.html?date=...
+Aufgerufen aus newsletter_index.aktualisiere_index() für neue/geänderte Tage
+"""
+
+import os
+from datetime import datetime
+from html import escape
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+SEITEN_VERZEICHNIS = 'd'
+SEITEN_VERSION = 3  # Erhöhen, wenn sich das Template ändert → alle Seiten neu rendern
+
+WOCHENTAGE = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+MONATE = ['Januar', 'Februar', 'März', 'April', 'Mai', 'Juni', 'Juli',
+          'August', 'September', 'Oktober', 'November', 'Dezember']
+
+# Ab Newsletter-JSON Version 2 hat jeder Artikel eine Region
+REGION_FLAGGEN = {'deutschland': '🇩🇪', 'uk': '🇬🇧', 'usa': '🇺🇸'}
+
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+def seiten_pfad(verzeichnis, datum):
+    return os.path.join(verzeichnis, SEITEN_VERZEICHNIS, f"{datum}.html")
+
+
+def formatiere_datum(datum):
+    """2026-10-17 → Samstag, 17. Oktober 2026"""
+    tag = datetime.strptime(datum, '%Y-%m-%d')
+    return f"{WOCHENTAGE[tag.weekday()]}, {tag.day}. {MONATE[tag.month - 1]} {tag.year}"
+
+
+def sicherer_link(url):
+    """Links aus fremden Feeds nur mit http(s) - sonst '#' (kein javascript: o.ä.)"""
+    url = url or ''
+    return url if url.lower().startswith(('http://', 'https://')) else '#'
+
+
+def rendere_artikel(artikel, index, datum):
+    """Markup eines Artikels - wie renderArticles() in index.html, Bewerten verlinkt"""
+    quelle = f"{REGION_FLAGGEN.get(artikel.get('region'), '')} {artikel.get('source') or ''}".strip()
+    return f"""
+        <div class="article" id="artikel-{index}">
+            <div class="article-header">
+                <span class="article-source">{escape(quelle)}</span>
+                <span class="article-score">Score: {escape(str(artikel.get('score', '')))}/10</span>
+            </div>
+            <h2 class="article-title">{escape(artikel.get('title') or '')}</h2>
+            <p class="article-description">{escape(artikel.get('summary') or '')}</p>
+            <div class="article-actions">
+                <a href="{escape(sicherer_link(artikel.get('link')))}" target="_blank" rel="noopener" class="btn btn-primary">Artikel lesen →</a>
+                <a href="../index.html?date={datum}" class="btn btn-relevant">Bewerten</a>
+            </div>
+        </div>"""
+
+
+def rendere_tagesseite(datum, artikel_liste):
+    """Komplette statische HTML-Seite für einen Newsletter-Tag"""
+    scores = [a['score'] for a in artikel_liste if isinstance(a.get('score'), (int, float))]
+    avg_score = f"{sum(scores) / len(scores):.1f}" if scores else '-'
+
+    if artikel_liste:
+        artikel_html = ''.join(rendere_artikel(a, i, datum) for i, a in enumerate(artikel_liste))
+    else:
+        artikel_html = """
+        <div class="no-articles">
+            <h2>Keine Artikel verfügbar</h2>
+            <p>Für dieses Datum wurden keine relevanten Artikel gefunden.</p>
+        </div>"""
+
+    return f"""<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Zoo Medien Newsletter - {formatiere_datum(datum)}</title>
+    <link rel="stylesheet" href="../newsletter.css">
+</head>
+<body>
+    <div class="container">
+        <header>
+            <div class="header-content">
+                <img src="../logo-icon.png" alt="Zoo Productions" class="logo">
+                <h1>Zoo Medien Newsletter</h1>
+            </div>
+            <p class="subtitle">{formatiere_datum(datum)}</p>
+
+            <div class="nav-menu">
+                <a href="../index.html">Aktueller Newsletter</a>
+                <a href="../archive.html">Archiv</a>
+            </div>
+
+            <div class="stats">
+                <div class="stat-item">
+                    <div class="stat-number">{len(artikel_liste)}</div>
+                    <div class="stat-label">Artikel</div>
+                </div>
+                <div class="stat-item">
+                    <div class="stat-number">{avg_score}</div>
+                    <div class="stat-label">Ø Score</div>
+                </div>
+            </div>
+        </header>
+
+        <div class="articles">{artikel_html}
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def schreibe_tagesseite(verzeichnis, datum, artikel_liste, schreibe):
+    """
+    Rendert und schreibt die Seite eines Tages
+    schreibe: Funktion (pfad, inhalt) → bool, z.B. schreibe_wenn_geaendert
+    """
+    pfad = seiten_pfad(verzeichnis, datum)
+    os.makedirs(os.path.dirname(pfad), exist_ok=True)
+    return schreibe(pfad, rendere_tagesseite(datum, artikel_liste))
+
+
+def entferne_tagesseite(verzeichnis, datum):
+    pfad = seiten_pfad(verzeichnis, datum)
+    if os.path.exists(pfad):
+        os.remove(pfad)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Leichtgewichtiges Tracing für den Tageslauf
+Verschachtelte Spans pro Stufe, Quelle, Artikel und externem Aufruf mit Dauer,
+Bytes und Status:
+
+    starte_trace('2026-01-15')
+    with span('stufe', 'sammeln'):
+        with span('quelle', 'DWDL') as s:
+            s['attribute']['artikel'] = 20
+    zusammenfassung = trace_zusammenfassung()   # → newsletter_runs.timing
+    schreibe_trace()                            # → traces/trace-<datum>-<zeit>.json
+
+Der aktuelle Span liegt in einer ContextVar - Worker-Threads der Pipeline
+(newsletter_pipeline.py) erben ihn. Ohne laufenden Trace kosten Spans fast
+nichts. Die Trace-Datei enthält zusätzlich 'traceEvents' und lässt sich direkt
+in Perfetto / chrome://tracing öffnen.
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+TRACE_VERZEICHNIS = os.environ.get('NEWSLETTER_TRACE_DIR', 'traces')
+TRACE_AKTIV = os.environ.get('NEWSLETTER_TRACE', '1') != '0'
+TRACE_FORMAT_VERSION = 1
+# Einträge pro Liste in der Zusammenfassung (langsamste Artikel/Quellen)
+TRACE_TOP_N = 5
+
+_trace = None
+_aktueller_span = contextvars.ContextVar('newsletter_span', default=None)
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+def starte_trace(lauf, aktiv=TRACE_AKTIV):
+    """Neuer Trace für einen Lauf (ersetzt einen vorherigen)"""
+    global _trace
+    _trace = {
+        'lauf': lauf,
+        'gestartet_am': datetime.now().isoformat(timespec='seconds'),
+        'start': time.perf_counter(),
+        'spans': [],
+        'sperre': threading.Lock(),
+    } if aktiv else None
+    _aktueller_span.set(None)
+    return _trace
+
+
+def _jetzt_ms():
+    return (time.perf_counter() - _trace['start']) * 1000
+
+
+def starte_span(art, name, eltern=None, **attribute):
+    """
+    Span beginnen, ohne ihn zum aktuellen zu machen (z.B. Pipeline-Stufen,
+    die in anderen Threads weiterlaufen). Eltern: explizit oder der aktuelle Span
+    """
+    if _trace is None:
+        return {'attribute': attribute}
+    eltern = eltern if eltern is not None else _aktueller_span.get()
+    with _trace['sperre']:
+        span_id = len(_trace['spans']) + 1
+        neu = {
+            'id': span_id,
+            'eltern': eltern.get('id') if eltern else None,
+            'art': art,
+            'name': name,
+            'thread': threading.current_thread().name,
+            'start_ms': round(_jetzt_ms(), 2),
+            'dauer_ms': None,
+            'status': 'ok',
+            'bytes': None,
+            'attribute': attribute,
+        }
+        _trace['spans'].append(neu)
+    return neu
+
+
+def beende_span(aktuell, status=None, ende=None, **attribute):
+    """Span abschließen - ende als time.perf_counter()-Wert, sonst jetzt"""
+    if _trace is None or 'id' not in aktuell:
+        return
+    ende_ms = (ende - _trace['start']) * 1000 if ende else _jetzt_ms()
+    aktuell['dauer_ms'] = round(max(0.0, ende_ms - aktuell['start_ms']), 2)
+    if status:
+        aktuell['status'] = status
+    aktuell['attribute'].update(attribute)
+
+
+@contextmanager
+def im_span(aktuell):
+    """Einen bestehenden Span zum aktuellen machen (ohne ihn zu beenden)"""
+    token = _aktueller_span.set(aktuell if 'id' in aktuell else None)
+    try:
+        yield aktuell
+    finally:
+        _aktueller_span.reset(token)
+
+
+@contextmanager
+def span(art, name, **attribute):
+    """
+    Span als Kontext - liefert das Span-Dict ('attribute', 'bytes', 'status'
+    dürfen gesetzt werden). Eine Exception setzt status='fehler' und wird weitergereicht.
+    """
+    aktuell = starte_span(art, name, **attribute)
+    token = _aktueller_span.set(aktuell if 'id' in aktuell else None)
+    try:
+        yield aktuell
+    except BaseException as e:
+        aktuell['status'] = 'fehler'
+        aktuell['attribute']['fehler'] = str(e)[:200]
+        raise
+    finally:
+        _aktueller_span.reset(token)
+        beende_span(aktuell)
+
+
+# ============================================================================
+# ZUSAMMENFASSUNG UND EXPORT
+# ============================================================================
+
+def _summe(spans):
+    return {
+        'anzahl': len(spans),
+        'ms': round(sum(s['dauer_ms'] or 0 for s in spans), 1),
+        'bytes': sum(s['bytes'] or 0 for s in spans),
+        'fehler': sum(1 for s in spans if s['status'] != 'ok'),
+    }
+
+
+def trace_zusammenfassung(top_n=TRACE_TOP_N):
+    """
+    Kompakter Timing-Block für newsletter_runs.timing:
+    Dauer pro Stufe und Quelle, externe Aufrufe pro Art und Host, langsamste Artikel
+    """
+    if _trace is None:
+        return None
+    with _trace['sperre']:
+        spans = [dict(s) for s in _trace['spans']]
+
+    nach_art = {}
+    for s in spans:
+        nach_art.setdefault(s['art'], []).append(s)
+
+    extern = {}
+    for s in nach_art.get('extern', []):
+        extern.setdefault(s['name'], []).append(s)
+
+    quellen = {
+        s['name']: {'ms': s['dauer_ms'], 'status': s['status'], 'artikel': s['attribute'].get('artikel')}
+        for s in nach_art.get('quelle', [])
+    }
+    artikel = sorted(nach_art.get('artikel', []), key=lambda s: s['dauer_ms'] or 0, reverse=True)
+
+    return {
+        'format_version': TRACE_FORMAT_VERSION,
+        'gesamt_ms': round(_jetzt_ms(), 1),
+        'stufen': {s['name']: s['dauer_ms'] for s in nach_art.get('stufe', [])},
+        'quellen': quellen,
+        'langsamste_quellen': sorted(quellen, key=lambda q: quellen[q]['ms'] or 0, reverse=True)[:top_n],
+        'extern': {host: _summe(liste) for host, liste in sorted(extern.items())},
+        'artikel': _summe(artikel),
+        'langsamste_artikel': [{'name': s['name'][:80], 'ms': s['dauer_ms']} for s in artikel[:top_n]],
+    }
+
+
+def als_trace_events(spans):
+    """Spans im Chrome/Perfetto Trace-Event-Format (vollständige Events, µs)"""
+    threads = {}
+    events = []
+    for s in spans:
+        tid = threads.setdefault(s['thread'], len(threads) + 1)
+        events.append({
+            'name': s['name'], 'cat': s['art'], 'ph': 'X', 'pid': 1, 'tid': tid,
+            'ts': round(s['start_ms'] * 1000), 'dur': round((s['dauer_ms'] or 0) * 1000),
+            'args': {**s['attribute'], 'status': s['status'], 'bytes': s['bytes']},
+        })
+    events += [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}}
+               for name, tid in threads.items()]
+    return events
+
+
+def schreibe_trace(verzeichnis=TRACE_VERZEICHNIS):
+    """Trace als JSON-Datei - Returns: Pfad oder None"""
+    if _trace is None:
+        return None
+    with _trace['sperre']:
+        spans = [dict(s) for s in _trace['spans']]
+    daten = {
+        'format_version': TRACE_FORMAT_VERSION,
+        'lauf': _trace['lauf'],
+        'gestartet_am': _trace['gestartet_am'],
+        'zusammenfassung': trace_zusammenfassung(),
+        'spans': spans,
+        'traceEvents': als_trace_events(spans),
+    }
+    os.makedirs(verzeichnis, exist_ok=True)
+    pfad = os.path.join(verzeichnis, f"trace-{_trace['lauf']}-{datetime.now().strftime('%H%M%S')}.json")
+    with open(pfad, 'w', encoding='utf-8') as f:
+        json.dump(daten, f, ensure_ascii=False, separators=(',', ':'), default=str)
+    return pfad
+
+
+def drucke_trace_zusammenfassung(zusammenfassung):
+    if not zusammenfassung:
+        return
+    print(f"\n⏱️ TIMING ({zusammenfassung['gesamt_ms'] / 1000:.1f}s gesamt)")
+    print("="*70)
+    for stufe, ms in zusammenfassung['stufen'].items():
+        print(f"   {stufe:<29}{(ms or 0) / 1000:>8.1f}s")
+    for quelle in zusammenfassung['langsamste_quellen']:
+        werte = zusammenfassung['quellen'][quelle]
+        print(f"   🐢 {quelle:<26}{(werte['ms'] or 0) / 1000:>8.1f}s  {werte['status']}")
+    for host, werte in zusammenfassung['extern'].items():
+        print(f"   🌐 {host:<26}{werte['anzahl']:>5}× {werte['ms'] / 1000:>7.1f}s "
+              f"{werte['bytes'] // 1024:>7} KB  {werte['fehler']} Fehler")
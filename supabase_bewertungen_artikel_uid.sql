@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Zoo Medien Newsletter - Stabile Artikel-ID für artikel_bewertungen
+-- ============================================================================
+-- artikel_uid: stabile Artikel-ID aus dem Newsletter-JSON ('id', Hash der URL,
+-- newsletter_archiv.artikel_id). index.html schreibt sie ab jetzt zu jeder
+-- Bewertung und findet bestehende Bewertungen darüber - unabhängig von der
+-- Position im Newsletter. artikel_id (Position) wird weiter geschrieben und
+-- ist der Fallback für alte Zeilen ohne artikel_uid.
+--
+-- Installation: Supabase Dashboard → SQL Editor → Inhalt einfügen → Run
+-- ============================================================================
+
+alter table artikel_bewertungen add column if not exists artikel_uid text;
+
+-- Eine Bewertung pro User und Artikel (Konflikt → index.html aktualisiert die Bewertung)
+create unique index if not exists idx_bewertungen_artikel_uid
+    on artikel_bewertungen (newsletter_datum, artikel_uid, user_email)
+    where artikel_uid is not null;
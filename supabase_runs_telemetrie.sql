@@ -0,0 +1,30 @@
+-- ============================================================================
+-- Zoo Medien Newsletter - Telemetrie-Spalten für newsletter_runs
+-- ============================================================================
+-- timing: Zusammenfassung des Traces eines Laufs (newsletter_trace.py) -
+-- Dauer pro Stufe und Quelle, externe Aufrufe pro Host, langsamste Artikel.
+-- llm_verbrauch: Claude-Aufrufe, Tokens, Kosten, Latenz und Wiederholungen
+-- pro Lauf und Stufe (claude_verbrauch.py).
+-- Ohne diese Spalten speichert medien_newsletter_web.py den Run weiterhin,
+-- nur ohne Telemetrie; supabase_sync.py braucht sie für den Spiegel.
+--
+-- Installation: Supabase Dashboard → SQL Editor → Inhalt einfügen → Run
+-- ============================================================================
+
+alter table newsletter_runs add column if not exists timing jsonb;
+alter table newsletter_runs add column if not exists llm_verbrauch jsonb;
+
+-- Beispiel: langsamste Quellen der letzten 30 Läufe
+-- select run_date, q.key as quelle, (q.value->>'ms')::numeric / 1000 as sekunden
+-- from newsletter_runs, jsonb_each(timing->'quellen') q
+-- where timing is not null
+-- order by run_date desc, sekunden desc
+-- limit 30;
+
+-- Beispiel: Claude-Kosten pro Monat
+-- select date_trunc('month', run_date::date) as monat,
+--        sum((llm_verbrauch->>'kosten_usd')::numeric) as usd,
+--        sum((llm_verbrauch->>'input_tokens')::bigint + (llm_verbrauch->>'output_tokens')::bigint) as tokens
+-- from newsletter_runs
+-- where llm_verbrauch is not null
+-- group by 1 order by 1;
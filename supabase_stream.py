@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Streaming-Reader für Supabase-Tabellen
+Liest Tabellen seitenweise per Range-Pagination statt mit einem einzelnen .execute():
+- Kein stilles Abschneiden am PostgREST Row-Limit (db-max-rows)
+- Konstanter Speicherbedarf (immer nur eine Seite im Speicher)
+- Nur die benötigten Spalten werden übertragen
+- Die nächste Seite wird im Hintergrund vorgeladen, während die aktuelle verarbeitet wird
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+SEITENGROESSE = int(os.environ.get('SUPABASE_SEITENGROESSE', '1000'))
+
+BEWERTUNGS_TABELLE = 'artikel_bewertungen'
+ARCHIV_TABELLE = 'newsletter_articles_archive'
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def _hole_seite(client, tabelle, spalten, filter, sortierung, offset, seitengroesse):
+    """Lädt eine Seite [offset, offset + seitengroesse) einer Tabelle"""
+    query = client.table(tabelle).select(spalten)
+    for methode, spalte, wert in filter:
+        query = getattr(query, methode)(spalte, wert)
+    response = query.order(sortierung).range(offset, offset + seitengroesse - 1).execute()
+    return response.data
+
+
+def streame_zeilen(client, tabelle, spalten='*', filter=(), sortierung='id',
+                   seitengroesse=SEITENGROESSE, vorladen=True):
+    """
+    Generator über alle Zeilen einer Tabelle, Seite für Seite
+
+    filter: Liste von (methode, spalte, wert), z.B. [('gte', 'newsletter_datum', '2025-11-01')]
+    sortierung: Eindeutige Spalte für stabile Pagination (Standard: id)
+
+    Das Ende ist erst bei einer leeren Seite erreicht - liefert der Server wegen
+    seines Row-Limits weniger Zeilen als angefragt, wird einfach weitergeblättert.
+    """
+    filter = list(filter)
+    offset = 0
+
+    if not vorladen:
+        while True:
+            seite = _hole_seite(client, tabelle, spalten, filter, sortierung, offset, seitengroesse)
+            if not seite:
+                return
+            offset += len(seite)
+            yield from seite
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        naechste = executor.submit(_hole_seite, client, tabelle, spalten, filter, sortierung, offset, seitengroesse)
+        while True:
+            seite = naechste.result()
+            if not seite:
+                return
+            offset += len(seite)
+            # Nächste Seite laden, während der Aufrufer diese verarbeitet
+            naechste = executor.submit(_hole_seite, client, tabelle, spalten, filter, sortierung, offset, seitengroesse)
+            yield from seite
+
+
+def streame_bewertungen(client, spalten='*', seit=None, bis=None, **kwargs):
+    """Streamt artikel_bewertungen, optional gefiltert nach newsletter_datum"""
+    filter = []
+    if seit:
+        filter.append(('gte', 'newsletter_datum', str(seit)))
+    if bis:
+        filter.append(('lte', 'newsletter_datum', str(bis)))
+    return streame_zeilen(client, BEWERTUNGS_TABELLE, spalten, filter, **kwargs)
+
+
+def streame_archiv(client, spalten='*', seit=None, bis=None, **kwargs):
+    """Streamt newsletter_articles_archive, optional gefiltert nach first_sent_date"""
+    filter = []
+    if seit:
+        filter.append(('gte', 'first_sent_date', str(seit)))
+    if bis:
+        filter.append(('lte', 'first_sent_date', str(bis)))
+    return streame_zeilen(client, ARCHIV_TABELLE, spalten, filter, **kwargs)
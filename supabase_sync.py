@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoo Medien Newsletter - Lokaler Spiegel der Supabase-Tabellen
+Spiegelt newsletter_articles_archive, newsletter_runs und artikel_bewertungen
+inkrementell in eine lokale SQLite-Datei (Standard: die DB von weekly_analysis.py):
+- Pro Tabelle ein Datums-Watermark (first_sent_date / run_date / newsletter_datum)
+- Pro Lauf nur Zeilen ab Watermark - NACHLAUF_TAGE, seitenweise gestreamt
+- Upsert über die Supabase-id → wiederholte Läufe erzeugen keine Duplikate
+
+Danach laufen Analysen ohne Netzwerk, z.B.:
+    python supabase_sync.py
+    ANALYSE_AGGREGATION=sqlite python weekly_analysis.py
+    sqlite3 bewertungen.sqlite "SELECT source, avg(relevance_score) FROM newsletter_articles_archive GROUP BY 1"
+
+In Supabase gelöschte Zeilen verschwinden lokal erst beim vollen Abgleich (--voll).
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from supabase_stream import streame_zeilen, streame_bewertungen, streame_archiv, BEWERTUNGS_TABELLE
+from archiv_backend import (
+    ARCHIV_TABELLE, RUNS_TABELLE, ARCHIV_SPALTEN, RUNS_SPALTEN,
+    fuege_archivzeile_ein, migriere_archiv_schema, sqlite_wert
+)
+from weekly_analysis import (
+    SQLITE_DB, NACHLAUF_TAGE, BEWERTUNGS_SPALTEN,
+    get_supabase_client, oeffne_sqlite_db, importiere_bewertungen_sqlite
+)
+
+# ============================================================================
+# KONFIGURATION
+# ============================================================================
+
+SYNC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_status (
+    tabelle TEXT PRIMARY KEY,
+    watermark TEXT,
+    zeilen INTEGER,
+    synchronisiert_am TEXT
+);
+"""
+
+# Tabelle → (Datums-Spalte für das Watermark, gespiegelte Spalten ohne id)
+SPIEGEL_TABELLEN = {
+    ARCHIV_TABELLE: ('first_sent_date', ARCHIV_SPALTEN),
+    RUNS_TABELLE: ('run_date', RUNS_SPALTEN),
+}
+
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+def oeffne_spiegel_db(pfad=SQLITE_DB):
+    """Bewertungs-Schema (weekly_analysis) plus Archiv, Runs (archiv_backend) und Sync-Status"""
+    conn = oeffne_sqlite_db(pfad)
+    migriere_archiv_schema(conn)
+    conn.executescript(SYNC_SCHEMA)
+    return conn
+
+
+def lese_watermark(conn, tabelle):
+    zeile = conn.execute('SELECT watermark FROM sync_status WHERE tabelle = ?', (tabelle,)).fetchone()
+    return zeile[0] if zeile else None
+
+
+def setze_watermark(conn, tabelle, watermark, zeilen):
+    conn.execute(
+        'INSERT OR REPLACE INTO sync_status (tabelle, watermark, zeilen, synchronisiert_am) VALUES (?, ?, ?, ?)',
+        (tabelle, watermark, zeilen, datetime.now().isoformat(timespec='seconds'))
+    )
+
+
+def sync_start(conn, tabelle, voll=False):
+    """Startdatum für den nächsten Abgleich (None = alles)"""
+    watermark = None if voll else lese_watermark(conn, tabelle)
+    if not watermark:
+        return None
+    return datetime.strptime(watermark[:10], '%Y-%m-%d').date() - timedelta(days=NACHLAUF_TAGE)
+
+
+def synchronisiere_tabelle(client, conn, tabelle, voll=False):
+    """
+    Spiegelt newsletter_articles_archive oder newsletter_runs ab dem Watermark
+    Returns: Anzahl übertragener Zeilen
+    """
+    datum_spalte, spalten = SPIEGEL_TABELLEN[tabelle]
+    seit = sync_start(conn, tabelle, voll)
+    auswahl = f"id, {', '.join(spalten)}"
+    if tabelle == ARCHIV_TABELLE:
+        zeilen = streame_archiv(client, auswahl, seit=seit)
+    else:
+        zeilen = streame_zeilen(client, tabelle, auswahl, [('gte', datum_spalte, str(seit))] if seit else [])
+
+    sql = (f"INSERT OR REPLACE INTO {tabelle} (id, {', '.join(spalten)}) "
+           f"VALUES ({', '.join('?' * (len(spalten) + 1))})")
+    watermark = lese_watermark(conn, tabelle)
+    anzahl = 0
+    with conn:
+        if voll:
+            # Voller Abgleich: auch in Supabase gelöschte Zeilen verschwinden lokal
+            conn.execute(f'DELETE FROM {tabelle}')
+            watermark = None
+        for zeile in zeilen:
+            if tabelle == ARCHIV_TABELLE:
+                fuege_archivzeile_ein(conn, zeile, ersetzen=True)
+            else:
+                conn.execute(sql, [zeile['id']] + [sqlite_wert(zeile.get(s)) for s in spalten])
+            datum = str(zeile.get(datum_spalte) or '')[:10]
+            if datum and (not watermark or datum > watermark):
+                watermark = datum
+            anzahl += 1
+        setze_watermark(conn, tabelle, watermark, anzahl)
+    return anzahl
+
+
+def synchronisiere_bewertungen(client, conn, voll=False):
+    """Spiegelt artikel_bewertungen (inkl. Keywords/Themen für ANALYSE_AGGREGATION=sqlite)"""
+    seit = sync_start(conn, BEWERTUNGS_TABELLE, voll)
+    watermark = [lese_watermark(conn, BEWERTUNGS_TABELLE)]
+
+    def mit_watermark(bewertungen):
+        for b in bewertungen:
+            datum = str(b.get('newsletter_datum') or '')[:10]
+            if datum and (not watermark[0] or datum > watermark[0]):
+                watermark[0] = datum
+            yield b
+
+    anzahl = importiere_bewertungen_sqlite(
+        conn, mit_watermark(streame_bewertungen(client, f'id, {BEWERTUNGS_SPALTEN}', seit=seit))
+    )
+    with conn:
+        setze_watermark(conn, BEWERTUNGS_TABELLE, watermark[0], anzahl)
+    return anzahl
+
+
+def synchronisiere(client, conn, voll=False):
+    """Spiegelt alle drei Tabellen. Returns: {tabelle: übertragene Zeilen}"""
+    ergebnis = {}
+    for tabelle in SPIEGEL_TABELLEN:
+        ergebnis[tabelle] = synchronisiere_tabelle(client, conn, tabelle, voll)
+    ergebnis[BEWERTUNGS_TABELLE] = synchronisiere_bewertungen(client, conn, voll)
+
+    for tabelle, anzahl in ergebnis.items():
+        gesamt = conn.execute(f'SELECT count(*) FROM {tabelle}').fetchone()[0]
+        print(f"✅ {tabelle}: {anzahl} Zeilen übertragen, {gesamt} lokal "
+              f"(Watermark {lese_watermark(conn, tabelle) or '-'})")
+    return ergebnis
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Spiegelt die Supabase-Tabellen in eine lokale SQLite-Datei')
+    parser.add_argument('--db', default=SQLITE_DB, help=f'SQLite-Datei (Standard: {SQLITE_DB})')
+    parser.add_argument('--voll', action='store_true', help='Alles neu übertragen (ignoriert Watermarks)')
+    args = parser.parse_args()
+
+    client = get_supabase_client()
+    if client is None:
+        print("❌ Supabase nicht installiert!")
+    else:
+        conn = oeffne_spiegel_db(args.db)
+        try:
+            synchronisiere(client, conn, args.voll)
+        finally:
+            conn.close()
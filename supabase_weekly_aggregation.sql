@@ -0,0 +1,157 @@
+-- ============================================================================
+-- Zoo Medien Newsletter - Serverseitige Aggregation für weekly_analysis.py
+-- ============================================================================
+-- Berechnet die Tages-Aggregate (Quellen, Keywords, Paare, Kombis, Themen,
+-- User-Terme) direkt in Postgres. weekly_analysis.py lädt mit
+-- ANALYSE_AGGREGATION=rpc nur noch diese Zähler statt aller Bewertungen:
+-- eine Zeile pro Tag mit dem kompletten Tages-Aggregat als jsonb
+-- (gleiches Format wie aggregiere_bewertungen(), User noch nach Email -
+-- weekly_analysis.py ersetzt sie vor dem Speichern durch die Nutzer-ID).
+-- Ein Aufruf über 7 Tage liefert höchstens 7 Zeilen und bleibt damit weit
+-- unter dem PostgREST Row-Limit (db-max-rows).
+--
+-- Installation: Supabase Dashboard → SQL Editor → Inhalt einfügen → Run
+--
+-- WICHTIG: Stoppwörter und Themen-Begriffe müssen mit STOPWORDS und
+-- THEMEN_KEYWORDS in weekly_analysis.py übereinstimmen!
+-- ============================================================================
+
+-- Rückgabetyp geändert (eine jsonb-Zeile pro Tag) → alte Version zuerst löschen
+drop function if exists bewertungen_tagesaggregate(date, date);
+
+create or replace function bewertungen_tagesaggregate(seit date, bis date)
+returns table (
+    tag date,
+    aggregat jsonb
+)
+language sql
+stable
+as $$
+with b as (
+    select
+        id,
+        newsletter_datum::date as tag,
+        lower(coalesce(artikel_titel, '')) as titel,
+        artikel_quelle as quelle,
+        bewertung = 'relevant' as rel,
+        lower(trim(coalesce(user_email, ''))) as user_key
+    from artikel_bewertungen
+    where newsletter_datum between seit and bis
+),
+-- extrahiere_keywords(): Sonderzeichen raus, Stoppwörter und kurze Wörter filtern
+woerter as (
+    select b.id, w.wort, w.pos
+    from b,
+    lateral regexp_split_to_table(regexp_replace(b.titel, '[^\w\s]', ' ', 'g'), '\s+')
+        with ordinality as w(wort, pos)
+),
+kw as (
+    select id, wort, row_number() over (partition by id order by pos) as nr
+    from woerter
+    where length(wort) > 3
+      and wort not in (
+        'aber', 'als', 'am', 'an', 'auch', 'auf', 'aus', 'bei', 'bis', 'das', 'dem', 'den',
+        'der', 'des', 'die', 'ein', 'eine', 'einem', 'einer', 'für', 'gegen', 'haben', 'hat',
+        'hatte', 'hatten', 'im', 'in', 'ist', 'mehr', 'mit', 'nach', 'nicht', 'noch', 'nur',
+        'oder', 'seit', 'sich', 'sind', 'so', 'um', 'und', 'unter', 'von', 'vor', 'war',
+        'waren', 'werden', 'wie', 'wird', 'wurde', 'wurden', 'während', 'zu', 'zwischen', 'über'
+      )
+),
+-- finde_keyword_paare(): aufeinanderfolgende Keywords
+paare as (
+    select id, wort || ' ' || lead(wort) over (partition by id order by nr) as paar
+    from kw
+),
+-- kategorisiere_thema(): Teilstring-Treffer, eine Kategorie höchstens einmal
+themen as (
+    select distinct b.id, t.kategorie
+    from b
+    join (values
+        ('formate', 'format'), ('formate', 'show'), ('formate', 'serie'), ('formate', 'sendung'),
+        ('formate', 'programm'), ('formate', 'quiz'), ('formate', 'game'),
+        ('streaming', 'netflix'), ('streaming', 'amazon'), ('streaming', 'disney'),
+        ('streaming', 'apple tv'), ('streaming', 'paramount'), ('streaming', 'max'),
+        ('streaming', 'hbo'), ('streaming', 'prime'),
+        ('quoten', 'quote'), ('quoten', 'marktanteil'), ('quoten', 'zuschauer'),
+        ('quoten', 'reichweite'), ('quoten', 'rating'), ('quoten', 'millionen'),
+        ('personal', 'chef'), ('personal', 'ceo'), ('personal', 'geschäftsführer'),
+        ('personal', 'leitung'), ('personal', 'wechsel'), ('personal', 'ernennung'),
+        ('personal', 'personalien'),
+        ('deals', 'übernahme'), ('deals', 'fusion'), ('deals', 'kauf'), ('deals', 'verkauf'),
+        ('deals', 'investment'), ('deals', 'deal'), ('deals', 'beteiligung'),
+        ('produktion', 'produktion'), ('produktion', 'dreh'), ('produktion', 'produktionsfirma'),
+        ('produktion', 'studio'), ('produktion', 'dreht'), ('produktion', 'gedreht'),
+        ('promi', 'promi'), ('promi', 'celebrity'), ('promi', 'star'), ('promi', 'skandal'),
+        ('promi', 'klatsch'), ('promi', 'privatleben')
+    ) as t(kategorie, begriff) on position(t.begriff in b.titel) > 0
+),
+user_terme as (
+    select distinct id, wort as term from kw
+    union
+    select id, 'thema:' || kategorie from themen
+),
+-- Zähler pro (Tag, Dimension, Schlüssel[, User])
+zaehler as (
+    select b.tag, 'anzahl' as dimension, '' as schluessel, '' as user_key,
+           count(*) filter (where b.rel) as relevant, count(*) filter (where not b.rel) as nicht_relevant
+    from b group by b.tag
+    union all
+    select b.tag, 'quellen', b.quelle, '', count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from b group by b.tag, b.quelle
+    union all
+    select b.tag, 'keywords', kw.wort, '', count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from kw join b using (id) group by b.tag, kw.wort
+    union all
+    select b.tag, 'paare', paare.paar, '', count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from paare join b using (id) where paare.paar is not null group by b.tag, paare.paar
+    union all
+    select b.tag, 'kombis', b.quelle || '+' || kw.wort, '', count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from kw join b using (id) where kw.nr <= 3 group by b.tag, b.quelle, kw.wort
+    union all
+    select b.tag, 'themen', themen.kategorie, '', count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from themen join b using (id) group by b.tag, themen.kategorie
+    union all
+    select b.tag, 'user', '', b.user_key, count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from b group by b.tag, b.user_key
+    union all
+    select b.tag, 'user_terme', user_terme.term, b.user_key, count(*) filter (where b.rel), count(*) filter (where not b.rel)
+    from user_terme join b using (id) group by b.tag, b.user_key, user_terme.term
+),
+-- Pro Tag und Dimension ein Objekt {schluessel: [relevant, nicht_relevant]}
+dimensionen as (
+    select z.tag, z.dimension, jsonb_object_agg(z.schluessel, jsonb_build_array(z.relevant, z.nicht_relevant)) as werte
+    from zaehler z
+    where z.dimension in ('quellen', 'keywords', 'paare', 'kombis', 'themen')
+      and z.schluessel is not null
+    group by z.tag, z.dimension
+),
+terme_pro_user as (
+    select z.tag, z.user_key, jsonb_object_agg(z.schluessel, jsonb_build_array(z.relevant, z.nicht_relevant)) as terme
+    from zaehler z
+    where z.dimension = 'user_terme'
+    group by z.tag, z.user_key
+),
+-- {email: {bewertung: [relevant, nicht_relevant], terme: {...}}} - ohne Email keine User-Daten
+user_pro_tag as (
+    select z.tag, jsonb_object_agg(z.user_key, jsonb_build_object(
+        'bewertung', jsonb_build_array(z.relevant, z.nicht_relevant),
+        'terme', coalesce(t.terme, '{}'::jsonb)
+    )) as users
+    from zaehler z
+    left join terme_pro_user t on t.tag = z.tag and t.user_key = z.user_key
+    where z.dimension = 'user' and z.user_key <> ''
+    group by z.tag
+)
+select
+    a.tag,
+    jsonb_build_object(
+        'anzahl', a.relevant + a.nicht_relevant,
+        'quellen', '{}'::jsonb, 'keywords', '{}'::jsonb, 'paare', '{}'::jsonb,
+        'kombis', '{}'::jsonb, 'themen', '{}'::jsonb,
+        'user', coalesce(u.users, '{}'::jsonb)
+    ) || coalesce((select jsonb_object_agg(d.dimension, d.werte) from dimensionen d where d.tag = a.tag), '{}'::jsonb) as aggregat
+from zaehler a
+left join user_pro_tag u on u.tag = a.tag
+where a.dimension = 'anzahl'
+order by a.tag
+$$;
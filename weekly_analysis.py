@@ -7,14 +7,30 @@ Analysiert Bewertungen und generiert intelligente Multi-Faktor-Regeln:
 - Keyword-Paare (2-Wörter)
 - Quellen-Keyword-Kombinationen
 - Themen-Kategorien
+
+Inkrementell: Bewertungen werden als Tages-Aggregate in bewertungs_aggregate.json
+gespeichert, pro Lauf werden nur Bewertungen ab dem Watermark nachgeladen.
+Das Analyse-Fenster (7/30/90 Tage, optional mit Decay) wird aus den Aggregaten berechnet.
+Bewertungen werden seitenweise gestreamt (supabase_stream.py) und nie komplett geladen.
+Optional wird serverseitig (Supabase RPC) oder in einer lokalen SQLite-DB gezählt
+(ANALYSE_AGGREGATION=rpc|sqlite) - dann werden nur noch Zähler übertragen.
 """
 
 import os
 import sys
+import json
+import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import re
 
+import numpy as np
+from scipy import sparse
+
+from supabase_stream import streame_bewertungen
+from newsletter_nutzer import nutzer_id, NUTZER_SCHLUESSEL
+from newsletter_profil import starte_profil, profil_stufe, beende_profil
+
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -35,8 +51,31 @@ MIN_BEWERTUNGEN_QUELLE = 5       # Min. 5 Bewertungen für Quellen-Regeln
 MIN_BEWERTUNGEN_COMBO = 3        # Min. 3 für Kombinationen
 MIN_BEWERTUNGEN_GESAMT = 20      # Min. 20 Gesamtbewertungen für Analyse
 
-RELEVANT_SCHWELLE = 0.70         # 70% = positiv bewerten
-IRRELEVANT_SCHWELLE = 0.30       # 30% = negativ bewerten
+# Schwellen gelten für die Wilson-Grenzen der Relevanz-Quote (nicht die rohe Quote)
+RELEVANT_SCHWELLE = 0.70         # Untere Grenze ≥ 70% = positiv bewerten
+STARK_RELEVANT_SCHWELLE = 0.85   # Untere Grenze ≥ 85% = +2 statt +1
+PAAR_SCHWELLE = 0.80             # Keyword-Paare nur +2 ab 80%
+IRRELEVANT_SCHWELLE = 0.30       # Obere Grenze ≤ 30% = negativ bewerten
+WILSON_Z = 1.0                   # Konfidenz der Wilson-Grenzen (1.0 ≈ 68%)
+MIN_BEWERTUNGEN_USER = 3         # Min. 3 Bewertungen eines Users für einen Per-User Boost
+MAX_USER_REGELN = 30             # Max. Boosts pro User
+
+# Rolling-Window Analyse über persistierte Tages-Aggregate
+AGGREGAT_DATEI = os.environ.get('BEWERTUNGS_AGGREGAT_DATEI', 'bewertungs_aggregate.json')
+AGGREGAT_VERSION = 3             # 3: User nur noch unter pseudonymer Nutzer-ID, ohne Namen
+ANALYSE_FENSTER_TAGE = int(os.environ.get('ANALYSE_FENSTER_TAGE', '7'))             # 7, 30 oder 90
+ANALYSE_HALBWERTSZEIT_TAGE = float(os.environ.get('ANALYSE_HALBWERTSZEIT_TAGE', '0'))  # 0 = kein Decay
+MAX_HISTORIE_TAGE = 365          # Ältere Tages-Aggregate werden verworfen
+NACHLAUF_TAGE = 3                # Späte Bewertungen: letzte Tage vor Watermark neu laden
+
+# Wo gezählt wird: 'stream' (Rohdaten streamen), 'rpc' (Supabase-Funktion, siehe
+# supabase_weekly_aggregation.sql) oder 'sqlite' (lokale DB, offline/Tests)
+ANALYSE_AGGREGATION = os.environ.get('ANALYSE_AGGREGATION', 'stream')
+SQLITE_DB = os.environ.get('ANALYSE_SQLITE_DB', 'bewertungen.sqlite')
+RPC_TAGE_PRO_AUFRUF = 7          # Tage pro RPC-Aufruf (eine jsonb-Zeile pro Tag)
+
+# Nur diese Spalten werden aus artikel_bewertungen geladen
+BEWERTUNGS_SPALTEN = 'newsletter_datum, artikel_titel, artikel_quelle, bewertung, user_name, user_email'
 
 # Stoppwörter (werden bei Keyword-Analyse ignoriert)
 STOPWORDS = {
@@ -115,143 +154,490 @@ def get_supabase_client() -> Client:
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
-def hole_bewertungen_letzte_woche(supabase):
-    """Holt alle Bewertungen der letzten 7 Tage"""
-    heute = datetime.now().date()
-    vor_7_tagen = heute - timedelta(days=7)
+# ============================================================================
+# TAGES-AGGREGATE (PERSISTIERT)
+# ============================================================================
+
+def lade_aggregate(pfad=AGGREGAT_DATEI):
+    """Lädt die gespeicherten Tages-Aggregate inkl. Watermark"""
+    leer = {'version': AGGREGAT_VERSION, 'watermark': None, 'tage': {}}
     
-    try:
-        response = supabase.table('artikel_bewertungen')\
-            .select('*')\
-            .gte('newsletter_datum', vor_7_tagen.isoformat())\
-            .lte('newsletter_datum', heute.isoformat())\
-            .execute()
-        
-        bewertungen = response.data
-        print(f"\n📊 {len(bewertungen)} Bewertungen gefunden ({vor_7_tagen} bis {heute})")
-        
-        return bewertungen, vor_7_tagen, heute
+    if not os.path.exists(pfad):
+        return leer
     
+    try:
+        with open(pfad, 'r', encoding='utf-8') as f:
+            aggregate = json.load(f)
     except Exception as e:
-        print(f"❌ Fehler beim Abrufen der Bewertungen: {e}")
-        return [], vor_7_tagen, heute
+        print(f"⚠️ Konnte {pfad} nicht laden - starte neu: {e}")
+        return leer
+    
+    if aggregate.get('version') != AGGREGAT_VERSION:
+        print(f"⚠️ {pfad} hat altes Format - starte neu")
+        return leer
+    
+    return aggregate
 
 
-# ============================================================================
-# ANALYSE-FUNKTIONEN
-# ============================================================================
+def speichere_aggregate(aggregate, pfad=AGGREGAT_DATEI):
+    """Speichert die Tages-Aggregate (kompakt, sortiert für kleine Git-Diffs)"""
+    with open(pfad, 'w', encoding='utf-8') as f:
+        json.dump(aggregate, f, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    print(f"💾 {len(aggregate['tage'])} Tages-Aggregate gespeichert ({pfad})")
 
-def analysiere_nach_quelle(bewertungen):
-    """Analysiert Bewertungen nach Quelle"""
-    quellen_stats = defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0, 'artikel': []})
+
+def _zaehle(stats, schluessel, relevant):
+    """Erhöht [relevant, nicht_relevant] für einen Schlüssel"""
+    paar = stats.setdefault(schluessel, [0, 0])
+    paar[0 if relevant else 1] += 1
+
+
+def aggregiere_bewertungen(bewertungen):
+    """
+    Verdichtet rohe Bewertungen in einem Durchlauf zu Tages-Aggregaten
+    Returns: {newsletter_datum: {'anzahl', 'quellen', 'keywords', 'paare', 'kombis', 'themen', 'user'}}
+    """
+    tage = {}
     
     for b in bewertungen:
+        tag = tage.setdefault(b['newsletter_datum'][:10], {
+            'anzahl': 0, 'quellen': {}, 'keywords': {}, 'paare': {},
+            'kombis': {}, 'themen': {}, 'user': {}
+        })
+        titel = b['artikel_titel'] or ''
         quelle = b['artikel_quelle']
-        bewertung = b['bewertung']
+        relevant = b['bewertung'] == 'relevant'
+        keywords = extrahiere_keywords(titel)
+        themen = kategorisiere_thema(titel)
         
-        quellen_stats[quelle]['artikel'].append(b['artikel_titel'])
+        tag['anzahl'] += 1
+        _zaehle(tag['quellen'], quelle, relevant)
+        for keyword in keywords:
+            _zaehle(tag['keywords'], keyword, relevant)
+        for paar in finde_keyword_paare(keywords):
+            _zaehle(tag['paare'], paar, relevant)
+        for keyword in keywords[:3]:  # Nur Top-3 Keywords pro Artikel
+            _zaehle(tag['kombis'], f"{quelle}+{keyword}", relevant)
+        for kategorie in themen:
+            _zaehle(tag['themen'], kategorie, relevant)
         
-        if bewertung == 'relevant':
-            quellen_stats[quelle]['relevant'] += 1
-        else:
-            quellen_stats[quelle]['nicht_relevant'] += 1
+        # User-Präferenzen pro Term (Keywords + 'thema:<kategorie>') unter der pseudonymen
+        # Nutzer-ID (newsletter_nutzer.py) - die Datei liegt im öffentlichen Repository
+        user_key = nutzer_id(b.get('user_email'))
+        if not user_key:
+            continue
+        user = tag['user'].setdefault(user_key, {'bewertung': [0, 0], 'terme': {}})
+        user['bewertung'][0 if relevant else 1] += 1
+        for kw in set(keywords):
+            _zaehle(user['terme'], kw, relevant)
+        for thema in themen:
+            _zaehle(user['terme'], f"thema:{thema}", relevant)
     
-    return quellen_stats
+    return tage
 
 
-def analysiere_nach_keywords(bewertungen):
-    """Analysiert Bewertungen nach Keywords"""
-    keyword_stats = defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0, 'artikel': []})
-    
-    for b in bewertungen:
-        titel = b['artikel_titel']
-        bewertung = b['bewertung']
-        keywords = extrahiere_keywords(titel)
-        
-        for keyword in keywords:
-            keyword_stats[keyword]['artikel'].append(titel)
-            
-            if bewertung == 'relevant':
-                keyword_stats[keyword]['relevant'] += 1
+# ============================================================================
+# AGGREGAT-QUELLEN (STREAM / SUPABASE RPC / SQLITE)
+# ============================================================================
+# Alle Quellen liefern dasselbe Format wie aggregiere_bewertungen():
+# {newsletter_datum: Tages-Aggregat}. Die RPC- und SQLite-Varianten zählen
+# dort, wo die Daten liegen. Die RPC liefert pro Tag das fertige Aggregat als
+# jsonb, SQLite Zeilen (tag, dimension, schluessel, user_key, relevant,
+# nicht_relevant). User kommen nach Email und werden vor dem Speichern durch
+# die pseudonyme Nutzer-ID ersetzt.
+
+def tagesaggregate_aus_zeilen(zeilen):
+    """Baut Tages-Aggregate aus vorab gezählten Aggregat-Zeilen (RPC/SQLite)"""
+    tage = {}
+    
+    for tag, dimension, schluessel, user_key, relevant, nicht_relevant in zeilen:
+        werte = tage.setdefault(str(tag)[:10], {
+            'anzahl': 0, 'quellen': {}, 'keywords': {}, 'paare': {},
+            'kombis': {}, 'themen': {}, 'user': {}
+        })
+        if dimension == 'anzahl':
+            werte['anzahl'] = relevant + nicht_relevant
+        elif dimension in ('user', 'user_terme'):
+            # Email → pseudonyme Nutzer-ID, bevor irgendetwas gespeichert wird
+            user_id = nutzer_id(user_key)
+            if not user_id:
+                continue
+            user = werte['user'].setdefault(user_id, {'bewertung': [0, 0], 'terme': {}})
+            if dimension == 'user':
+                user['bewertung'] = [relevant, nicht_relevant]
             else:
-                keyword_stats[keyword]['nicht_relevant'] += 1
+                user['terme'][schluessel] = [relevant, nicht_relevant]
+        else:
+            werte[dimension][schluessel] = [relevant, nicht_relevant]
     
-    return keyword_stats
+    return tage
+
+
+def tagesaggregate_stream(supabase, seit, bis):
+    """Rohe Bewertungen streamen und in Python zählen (Standard)"""
+    return aggregiere_bewertungen(
+        streame_bewertungen(supabase, BEWERTUNGS_SPALTEN, seit=seit.isoformat(), bis=bis.isoformat()))
 
 
-def analysiere_keyword_paare(bewertungen):
-    """Analysiert 2-Wort-Kombinationen"""
-    paar_stats = defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0, 'artikel': []})
+def tagesaggregat_aus_json(aggregat):
+    """Tages-Aggregat aus der RPC (jsonb) - User-Emails werden zu Nutzer-IDs"""
+    user = {}
+    for email, werte in (aggregat.get('user') or {}).items():
+        user_id = nutzer_id(email)
+        if user_id:
+            user[user_id] = {'bewertung': werte['bewertung'], 'terme': werte['terme']}
+    return {**aggregat, 'user': user}
+
+
+def tagesaggregate_rpc(supabase, seit, bis):
+    """
+    Zählt serverseitig über die RPC bewertungen_tagesaggregate
+    (siehe supabase_weekly_aggregation.sql) - übertragen werden nur Zähler,
+    eine Zeile pro Tag. Abschnittsweise (RPC_TAGE_PRO_AUFRUF Tage), damit ein
+    Aufruf klein bleibt und weit unter dem PostgREST Row-Limit liegt.
+    """
+    tage = {}
+    von = seit
+    while von <= bis:
+        abschnitt_bis = min(bis, von + timedelta(days=RPC_TAGE_PRO_AUFRUF - 1))
+        response = supabase.rpc('bewertungen_tagesaggregate', {
+            'seit': von.isoformat(),
+            'bis': abschnitt_bis.isoformat()
+        }).execute()
+        for zeile in response.data:
+            tage[str(zeile['tag'])[:10]] = tagesaggregat_aus_json(zeile['aggregat'])
+        von = abschnitt_bis + timedelta(days=1)
+    return tage
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artikel_bewertungen (
+    id INTEGER PRIMARY KEY,
+    newsletter_datum TEXT NOT NULL,
+    artikel_titel TEXT,
+    artikel_quelle TEXT,
+    bewertung TEXT,
+    user_name TEXT,
+    user_email TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bewertungen_datum ON artikel_bewertungen (newsletter_datum);
+-- Beim Einfügen mit extrahiere_keywords()/kategorisiere_thema() befüllt
+CREATE TABLE IF NOT EXISTS bewertung_keywords (
+    bewertung_id INTEGER NOT NULL REFERENCES artikel_bewertungen (id) ON DELETE CASCADE,
+    nr INTEGER NOT NULL,
+    wort TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_bewertung ON bewertung_keywords (bewertung_id);
+CREATE TABLE IF NOT EXISTS bewertung_themen (
+    bewertung_id INTEGER NOT NULL REFERENCES artikel_bewertungen (id) ON DELETE CASCADE,
+    kategorie TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_themen_bewertung ON bewertung_themen (bewertung_id);
+"""
+
+SQLITE_AGGREGAT_SQL = """
+WITH b AS (
+    SELECT id, substr(newsletter_datum, 1, 10) AS tag, artikel_quelle AS quelle,
+           bewertung = 'relevant' AS rel,
+           lower(trim(coalesce(user_email, ''))) AS user_key
+    FROM artikel_bewertungen
+    WHERE substr(newsletter_datum, 1, 10) BETWEEN :seit AND :bis
+),
+kw AS (
+    SELECT bewertung_id AS id, nr, wort FROM bewertung_keywords WHERE bewertung_id IN (SELECT id FROM b)
+),
+paare AS (
+    SELECT id, wort || ' ' || lead(wort) OVER (PARTITION BY id ORDER BY nr) AS paar FROM kw
+),
+themen AS (
+    SELECT bewertung_id AS id, kategorie FROM bewertung_themen WHERE bewertung_id IN (SELECT id FROM b)
+),
+user_terme AS (
+    SELECT DISTINCT id, wort AS term FROM kw
+    UNION
+    SELECT id, 'thema:' || kategorie FROM themen
+)
+SELECT tag, 'anzahl', '', '', sum(rel), sum(NOT rel) FROM b GROUP BY tag
+UNION ALL
+SELECT tag, 'quellen', quelle, '', sum(rel), sum(NOT rel) FROM b GROUP BY tag, quelle
+UNION ALL
+SELECT b.tag, 'keywords', kw.wort, '', sum(b.rel), sum(NOT b.rel)
+FROM kw JOIN b USING (id) GROUP BY b.tag, kw.wort
+UNION ALL
+SELECT b.tag, 'paare', paare.paar, '', sum(b.rel), sum(NOT b.rel)
+FROM paare JOIN b USING (id) WHERE paare.paar IS NOT NULL GROUP BY b.tag, paare.paar
+UNION ALL
+SELECT b.tag, 'kombis', b.quelle || '+' || kw.wort, '', sum(b.rel), sum(NOT b.rel)
+FROM kw JOIN b USING (id) WHERE kw.nr <= 3 GROUP BY b.tag, b.quelle, kw.wort
+UNION ALL
+SELECT b.tag, 'themen', themen.kategorie, '', sum(b.rel), sum(NOT b.rel)
+FROM themen JOIN b USING (id) GROUP BY b.tag, themen.kategorie
+UNION ALL
+SELECT tag, 'user', '', user_key, sum(rel), sum(NOT rel) FROM b GROUP BY tag, user_key
+UNION ALL
+SELECT b.tag, 'user_terme', user_terme.term, b.user_key, sum(b.rel), sum(NOT b.rel)
+FROM user_terme JOIN b USING (id) GROUP BY b.tag, b.user_key, user_terme.term
+"""
+
+
+def oeffne_sqlite_db(pfad=SQLITE_DB):
+    """Öffnet (und initialisiert) die lokale SQLite-Datenbank für Bewertungen"""
+    conn = sqlite3.connect(pfad)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SQLITE_SCHEMA)
+    return conn
+
+
+def importiere_bewertungen_sqlite(conn, bewertungen):
+    """
+    Schreibt Bewertungen in die lokale SQLite-Datenbank (z.B. aus streame_bewertungen)
+    Keywords und Themen werden beim Einfügen einmalig extrahiert.
+    Returns: Anzahl importierter Bewertungen
+    """
+    anzahl = 0
+    with conn:
+        for b in bewertungen:
+            cursor = conn.execute(
+                'INSERT OR REPLACE INTO artikel_bewertungen '
+                '(id, newsletter_datum, artikel_titel, artikel_quelle, bewertung, user_name, user_email) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (b.get('id'), str(b['newsletter_datum'])[:10], b['artikel_titel'], b['artikel_quelle'],
+                 b['bewertung'], b['user_name'], b.get('user_email'))
+            )
+            bewertung_id = cursor.lastrowid
+            titel = b['artikel_titel'] or ''
+            conn.executemany(
+                'INSERT INTO bewertung_keywords (bewertung_id, nr, wort) VALUES (?, ?, ?)',
+                [(bewertung_id, nr, wort) for nr, wort in enumerate(extrahiere_keywords(titel), 1)]
+            )
+            conn.executemany(
+                'INSERT INTO bewertung_themen (bewertung_id, kategorie) VALUES (?, ?)',
+                [(bewertung_id, kategorie) for kategorie in kategorisiere_thema(titel)]
+            )
+            anzahl += 1
+    return anzahl
+
+
+def tagesaggregate_sqlite(conn, seit, bis):
+    """Zählt in der lokalen SQLite-Datenbank (offline / Tests)"""
+    zeilen = conn.execute(SQLITE_AGGREGAT_SQL, {'seit': seit.isoformat(), 'bis': bis.isoformat()})
+    return tagesaggregate_aus_zeilen(zeilen)
+
+
+def waehle_aggregat_quelle(modus=ANALYSE_AGGREGATION):
+    """
+    Liefert die Aggregat-Quelle als Funktion (seit, bis) -> Tages-Aggregate
+    Modi: 'stream' (Standard), 'rpc' (serverseitig), 'sqlite' (lokal, ohne Netzwerk)
+    Returns: None wenn der Modus nicht nutzbar ist
+    """
+    if modus == 'sqlite':
+        conn = oeffne_sqlite_db()
+        print(f"🗄️ Aggregation: lokale SQLite-Datenbank ({SQLITE_DB})")
+        return lambda seit, bis: tagesaggregate_sqlite(conn, seit, bis)
     
-    for b in bewertungen:
-        titel = b['artikel_titel']
-        bewertung = b['bewertung']
-        keywords = extrahiere_keywords(titel)
-        paare = finde_keyword_paare(keywords)
-        
-        for paar in paare:
-            paar_stats[paar]['artikel'].append(titel)
-            
-            if bewertung == 'relevant':
-                paar_stats[paar]['relevant'] += 1
-            else:
-                paar_stats[paar]['nicht_relevant'] += 1
+    if not SUPABASE_AVAILABLE:
+        print("❌ Supabase nicht installiert!")
+        return None
     
-    return paar_stats
+    supabase = get_supabase_client()
+    if modus == 'rpc':
+        print("🛰️ Aggregation: serverseitig (RPC bewertungen_tagesaggregate)")
+        return lambda seit, bis: tagesaggregate_rpc(supabase, seit, bis)
+    
+    print("📡 Aggregation: Bewertungen streamen")
+    return lambda seit, bis: tagesaggregate_stream(supabase, seit, bis)
 
 
-def analysiere_quelle_keyword_kombis(bewertungen):
-    """Analysiert Kombinationen von Quelle + Keyword"""
-    kombi_stats = defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0, 'artikel': []})
+def aktualisiere_aggregate(aggregat_quelle, aggregate, heute=None):
+    """
+    Lädt nur Bewertungen ab dem Watermark nach und ersetzt die betroffenen Tage
     
-    for b in bewertungen:
-        titel = b['artikel_titel']
-        quelle = b['artikel_quelle']
-        bewertung = b['bewertung']
-        keywords = extrahiere_keywords(titel)
-        
-        for keyword in keywords[:3]:  # Nur Top-3 Keywords pro Artikel
-            kombi = f"{quelle}+{keyword}"
-            kombi_stats[kombi]['artikel'].append(titel)
-            
-            if bewertung == 'relevant':
-                kombi_stats[kombi]['relevant'] += 1
-            else:
-                kombi_stats[kombi]['nicht_relevant'] += 1
+    Bewertungen kommen oft erst Tage nach dem Newsletter rein - deshalb werden
+    die letzten NACHLAUF_TAGE vor dem Watermark immer neu aggregiert.
+    Returns: False wenn die Bewertungen nicht geladen werden konnten
+    """
+    heute = heute or datetime.now().date()
+    
+    if aggregate['watermark']:
+        seit = datetime.strptime(aggregate['watermark'], '%Y-%m-%d').date() - timedelta(days=NACHLAUF_TAGE)
+    else:
+        seit = heute - timedelta(days=MAX_HISTORIE_TAGE)
+        print(f"🆕 Kein Watermark - initialer Import der letzten {MAX_HISTORIE_TAGE} Tage")
     
-    return kombi_stats
+    try:
+        neue_tage = aggregat_quelle(seit, heute)
+    except Exception as e:
+        print(f"❌ Fehler beim Abrufen der Bewertungen: {e}")
+        return False
+    
+    anzahl = sum(tag['anzahl'] for tag in neue_tage.values())
+    print(f"\n📊 {anzahl} neue Bewertungen geladen ({seit} bis {heute})")
+    
+    # Alle nachgeladenen Tage komplett ersetzen (auch Tage ohne Bewertungen mehr)
+    tage = {
+        tag: werte for tag, werte in aggregate['tage'].items()
+        if tag < seit.isoformat()
+        and tag >= (heute - timedelta(days=MAX_HISTORIE_TAGE)).isoformat()
+    }
+    tage.update(neue_tage)
+    
+    aggregate['tage'] = tage
+    aggregate['watermark'] = heute.isoformat()
+    print(f"🔄 {len(neue_tage)} Tage aktualisiert (ab {seit}), {len(tage)} Tage im Speicher")
+    return True
+
 
+def _addiere(ziel, quelle, gewicht):
+    """Addiert gewichtete [relevant, nicht_relevant]-Zähler in Stats-Dicts"""
+    for schluessel, (relevant, nicht_relevant) in quelle.items():
+        stats = ziel[schluessel]
+        stats['relevant'] += relevant * gewicht
+        stats['nicht_relevant'] += nicht_relevant * gewicht
 
-def analysiere_themen(bewertungen):
-    """Analysiert nach Themen-Kategorien"""
-    themen_stats = defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0, 'artikel': []})
+
+def merge_fenster(aggregate, fenster_tage=ANALYSE_FENSTER_TAGE,
+                  halbwertszeit_tage=ANALYSE_HALBWERTSZEIT_TAGE, heute=None):
+    """
+    Führt die Tages-Aggregate eines Zeitfensters zusammen
     
-    for b in bewertungen:
-        titel = b['artikel_titel']
-        bewertung = b['bewertung']
-        kategorien = kategorisiere_thema(titel)
+    Mit halbwertszeit_tage > 0 werden ältere Tage exponentiell abgewertet
+    (Gewicht 0.5 ** (Alter / Halbwertszeit)).
+    Baut dabei im selben Durchlauf die dünnbesetzte User × Term Matrix
+    (stats['user_matrix']) für die Per-User Boost-Tabellen.
+    Returns: (stats dict je Dimension, Anzahl Bewertungen, Start, Ende)
+    """
+    heute = heute or datetime.now().date()
+    start = heute - timedelta(days=fenster_tage)
+    
+    stats = {
+        dimension: defaultdict(lambda: {'relevant': 0, 'nicht_relevant': 0})
+        for dimension in ('quellen', 'keywords', 'paare', 'kombis', 'themen')
+    }
+    user_stats = defaultdict(lambda: {
+        'total': 0,
+        'relevant': 0,
+        'nicht_relevant': 0,
+        'top_keywords': defaultdict(int),
+        'top_themen': defaultdict(int)
+    })
+    # Tripel für die User × Term Matrix (Zeile, Spalte, gewichtete Zähler)
+    user_index, term_index = {}, {}
+    zeilen, spalten, relevant_werte, nicht_relevant_werte = [], [], [], []
+    anzahl = 0
+    
+    for tag, werte in aggregate['tage'].items():
+        datum = datetime.strptime(tag, '%Y-%m-%d').date()
+        if not start <= datum <= heute:
+            continue
+        
+        gewicht = 1
+        if halbwertszeit_tage:
+            gewicht = 0.5 ** ((heute - datum).days / halbwertszeit_tage)
         
-        for kategorie in kategorien:
-            themen_stats[kategorie]['artikel'].append(titel)
+        anzahl += werte['anzahl']
+        for dimension, dim_stats in stats.items():
+            _addiere(dim_stats, werte[dimension], gewicht)
+        
+        for user, u in werte['user'].items():
+            # User-Statistik bleibt ungewichtet (rein informativ)
+            user_stats[user]['relevant'] += u['bewertung'][0]
+            user_stats[user]['nicht_relevant'] += u['bewertung'][1]
+            user_stats[user]['total'] += sum(u['bewertung'])
             
-            if bewertung == 'relevant':
-                themen_stats[kategorie]['relevant'] += 1
-            else:
-                themen_stats[kategorie]['nicht_relevant'] += 1
-    
-    return themen_stats
+            zeile = user_index.setdefault(user, len(user_index))
+            for term, (relevant, nicht_relevant) in u['terme'].items():
+                if relevant and term.startswith('thema:'):
+                    user_stats[user]['top_themen'][term[6:]] += relevant
+                elif relevant:
+                    user_stats[user]['top_keywords'][term] += relevant
+                zeilen.append(zeile)
+                spalten.append(term_index.setdefault(term, len(term_index)))
+                relevant_werte.append(relevant * gewicht)
+                nicht_relevant_werte.append(nicht_relevant * gewicht)
+    
+    # Doppelte (User, Term)-Paare über mehrere Tage werden beim Umwandeln summiert
+    form = (len(user_index), len(term_index))
+    stats['user_matrix'] = {
+        'users': list(user_index),
+        'terme': list(term_index),
+        'relevant': sparse.coo_matrix((relevant_werte, (zeilen, spalten)), shape=form).tocsr(),
+        'nicht_relevant': sparse.coo_matrix((nicht_relevant_werte, (zeilen, spalten)), shape=form).tocsr(),
+    }
+    stats['user'] = user_stats
+    return stats, anzahl, start, heute
 
 
 # ============================================================================
 # REGEL-GENERIERUNG
 # ============================================================================
 
+def _zahl(wert):
+    """Formatiert (ggf. decay-gewichtete) Zähler für die Regel-Begründung"""
+    return int(wert) if float(wert).is_integer() else round(wert, 1)
+
+
+def als_zaehl_arrays(stats):
+    """
+    Wandelt Stats-Dicts ({wert: {'relevant', 'nicht_relevant'}}) in NumPy-Arrays um
+    Returns: (werte, relevant, gesamt) - parallel indiziert über das ganze Vokabular
+    """
+    werte = list(stats.keys())
+    relevant = np.fromiter((s['relevant'] for s in stats.values()), dtype=np.float64, count=len(werte))
+    nicht_relevant = np.fromiter((s['nicht_relevant'] for s in stats.values()), dtype=np.float64, count=len(werte))
+    return werte, relevant, relevant + nicht_relevant
+
+
+def wilson_grenzen(relevant, gesamt, z=WILSON_Z):
+    """
+    Wilson-Konfidenzintervall der Relevanz-Quote, vektorisiert
+    Wenige Bewertungen → breites Intervall → vorsichtigere Boosts
+    Returns: (untere Grenze, obere Grenze) - bei gesamt == 0: (0, 1)
+    """
+    n = np.maximum(gesamt, 1e-12)
+    p = relevant / n
+    z2 = z * z
+    mitte = (p + z2 / (2 * n)) / (1 + z2 / n)
+    breite = z * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    leer = gesamt <= 0
+    return np.where(leer, 0.0, mitte - breite), np.where(leer, 1.0, mitte + breite)
+
+
+def _regel(typ, wert, aktion, relevant, gesamt, untere, obere):
+    """Baut eine Regel inkl. Begründung (Quote + Wilson-Grenze)"""
+    prozent = int(relevant / gesamt * 100)
+    if aktion > 0:
+        grund = f"{prozent}% relevant ({_zahl(relevant)}/{_zahl(gesamt)}, Wilson ≥{int(untere*100)}%)"
+    else:
+        grund = f"nur {prozent}% relevant ({_zahl(relevant)}/{_zahl(gesamt)}, Wilson ≤{int(obere*100)}%)"
+    return {'typ': typ, 'wert': wert, 'aktion': aktion, 'grund': grund}
+
+
+def _bewerte_vokabular(stats, min_bewertungen, positiv_schwelle, negativ_schwelle=None):
+    """
+    Berechnet Kandidaten für ein ganzes Vokabular auf einmal
+    Returns: (werte, relevant, gesamt, untere, obere, positiv-Maske, negativ-Maske)
+    """
+    werte, relevant, gesamt = als_zaehl_arrays(stats)
+    untere, obere = wilson_grenzen(relevant, gesamt)
+    genug = gesamt >= min_bewertungen
+    positiv = genug & (untere >= positiv_schwelle)
+    if negativ_schwelle is None:
+        negativ = np.zeros_like(positiv)
+    else:
+        negativ = genug & ~positiv & (obere <= negativ_schwelle)
+    return werte, relevant, gesamt, untere, obere, positiv, negativ
+
+
 def generiere_regeln(quellen_stats, keyword_stats, paar_stats, kombi_stats, themen_stats):
     """
     Generiert Lern-Regeln basierend auf Statistiken
     
     WICHTIG: Bewertet NUR Inhalte (Keywords, Themen), NICHT Quellen!
     Quellen wie DWDL, Kress, etc. sollen NICHT bewertet werden.
+    
+    Die Schwellen gelten für die Wilson-Grenzen der Relevanz-Quote, nicht für die
+    rohe Quote: positiv nur wenn die untere Grenze hoch genug ist, negativ nur
+    wenn die obere Grenze niedrig genug ist.
     """
     regeln = []
     
@@ -264,61 +650,29 @@ def generiere_regeln(quellen_stats, keyword_stats, paar_stats, kombi_stats, them
     print("   → Quellen werden nicht bewertet, nur Inhalte!")
     
     # 2. KEYWORD-REGELN (Einzelne Themen/Begriffe)
-    print("\n2️⃣ KEYWORD-REGELN (Themen-basiert):")
-    keyword_items = sorted(keyword_stats.items(), key=lambda x: x[1]['relevant'], reverse=True)
-    count = 0
-    for keyword, stats in keyword_items:
-        if count >= 20:  # Max 20 Keyword-Regeln (erhöht von 15)
-            break
-        
-        gesamt = stats['relevant'] + stats['nicht_relevant']
-        
-        if gesamt >= MIN_BEWERTUNGEN_KEYWORD:
-            prozent_relevant = stats['relevant'] / gesamt
-            
-            if prozent_relevant >= RELEVANT_SCHWELLE:
-                boost = 1 if prozent_relevant < 0.85 else 2
-                regeln.append({
-                    'typ': 'keyword',
-                    'wert': keyword,
-                    'aktion': boost,
-                    'grund': f"{int(prozent_relevant*100)}% relevant ({stats['relevant']}/{gesamt})"
-                })
-                print(f"   ✅ '{keyword}': +{boost} ({int(prozent_relevant*100)}%)")
-                count += 1
-            
-            elif prozent_relevant <= IRRELEVANT_SCHWELLE:
-                regeln.append({
-                    'typ': 'keyword',
-                    'wert': keyword,
-                    'aktion': -1,
-                    'grund': f"nur {int(prozent_relevant*100)}% relevant ({stats['relevant']}/{gesamt})"
-                })
-                print(f"   ❌ '{keyword}': -1 ({int(prozent_relevant*100)}%)")
-                count += 1
+    print(f"\n2️⃣ KEYWORD-REGELN (Themen-basiert, {len(keyword_stats)} Keywords):")
+    werte, relevant, gesamt, untere, obere, positiv, negativ = _bewerte_vokabular(
+        keyword_stats, MIN_BEWERTUNGEN_KEYWORD, RELEVANT_SCHWELLE, IRRELEVANT_SCHWELLE)
+    kandidaten = np.flatnonzero(positiv | negativ)
+    # Max 20 Keyword-Regeln, meiste relevante Bewertungen zuerst
+    reihenfolge = kandidaten[np.argsort(-relevant[kandidaten], kind='stable')][:20]
+    for i in reihenfolge:
+        if positiv[i]:
+            boost = 2 if untere[i] >= STARK_RELEVANT_SCHWELLE else 1
+            regeln.append(_regel('keyword', werte[i], boost, relevant[i], gesamt[i], untere[i], obere[i]))
+            print(f"   ✅ '{werte[i]}': +{boost} ({int(relevant[i]/gesamt[i]*100)}%, Wilson ≥{int(untere[i]*100)}%)")
+        else:
+            regeln.append(_regel('keyword', werte[i], -1, relevant[i], gesamt[i], untere[i], obere[i]))
+            print(f"   ❌ '{werte[i]}': -1 ({int(relevant[i]/gesamt[i]*100)}%, Wilson ≤{int(obere[i]*100)}%)")
     
     # 3. KEYWORD-PAAR-REGELN (Spezifischere Themen)
-    print("\n3️⃣ KEYWORD-PAAR-REGELN (Spezifische Themen):")
-    paar_items = sorted(paar_stats.items(), key=lambda x: x[1]['relevant'], reverse=True)
-    count = 0
-    for paar, stats in paar_items:
-        if count >= 15:  # Max 15 Paar-Regeln (erhöht von 10)
-            break
-        
-        gesamt = stats['relevant'] + stats['nicht_relevant']
-        
-        if gesamt >= MIN_BEWERTUNGEN_COMBO:
-            prozent_relevant = stats['relevant'] / gesamt
-            
-            if prozent_relevant >= 0.80:  # Höhere Schwelle für Paare!
-                regeln.append({
-                    'typ': 'keyword_paar',
-                    'wert': paar,
-                    'aktion': 2,
-                    'grund': f"{int(prozent_relevant*100)}% relevant ({stats['relevant']}/{gesamt})"
-                })
-                print(f"   ✅ '{paar}': +2 ({int(prozent_relevant*100)}%)")
-                count += 1
+    print(f"\n3️⃣ KEYWORD-PAAR-REGELN (Spezifische Themen, {len(paar_stats)} Paare):")
+    werte, relevant, gesamt, untere, obere, positiv, _ = _bewerte_vokabular(
+        paar_stats, MIN_BEWERTUNGEN_COMBO, PAAR_SCHWELLE)  # Höhere Schwelle für Paare!
+    kandidaten = np.flatnonzero(positiv)
+    for i in kandidaten[np.argsort(-relevant[kandidaten], kind='stable')][:15]:  # Max 15 Paar-Regeln
+        regeln.append(_regel('keyword_paar', werte[i], 2, relevant[i], gesamt[i], untere[i], obere[i]))
+        print(f"   ✅ '{werte[i]}': +2 ({int(relevant[i]/gesamt[i]*100)}%, Wilson ≥{int(untere[i]*100)}%)")
     
     # 4. QUELLEN-KEYWORD-KOMBINATIONEN → DEAKTIVIERT!
     # Diese waren quellen-abhängig, was wir nicht wollen
@@ -327,42 +681,73 @@ def generiere_regeln(quellen_stats, keyword_stats, paar_stats, kombi_stats, them
     
     # 5. THEMEN-REGELN
     print("\n5️⃣ THEMEN-REGELN:")
-    for thema, stats in sorted(themen_stats.items()):
-        gesamt = stats['relevant'] + stats['nicht_relevant']
-        
-        if gesamt >= MIN_BEWERTUNGEN_KEYWORD:
-            prozent_relevant = stats['relevant'] / gesamt
-            
-            if prozent_relevant >= RELEVANT_SCHWELLE:
-                boost = 1
-                regeln.append({
-                    'typ': 'thema',
-                    'wert': thema,
-                    'aktion': boost,
-                    'grund': f"{int(prozent_relevant*100)}% relevant ({stats['relevant']}/{gesamt})"
-                })
-                print(f"   ✅ Thema '{thema}': +{boost} ({int(prozent_relevant*100)}%)")
-            
-            elif prozent_relevant <= IRRELEVANT_SCHWELLE:
-                regeln.append({
-                    'typ': 'thema',
-                    'wert': thema,
-                    'aktion': -1,
-                    'grund': f"nur {int(prozent_relevant*100)}% relevant ({stats['relevant']}/{gesamt})"
-                })
-                print(f"   ❌ Thema '{thema}': -1 ({int(prozent_relevant*100)}%)")
+    werte, relevant, gesamt, untere, obere, positiv, negativ = _bewerte_vokabular(
+        themen_stats, MIN_BEWERTUNGEN_KEYWORD, RELEVANT_SCHWELLE, IRRELEVANT_SCHWELLE)
+    for i in sorted(np.flatnonzero(positiv | negativ), key=lambda i: werte[i]):
+        if positiv[i]:
+            regeln.append(_regel('thema', werte[i], 1, relevant[i], gesamt[i], untere[i], obere[i]))
+            print(f"   ✅ Thema '{werte[i]}': +1 ({int(relevant[i]/gesamt[i]*100)}%, Wilson ≥{int(untere[i]*100)}%)")
+        else:
+            regeln.append(_regel('thema', werte[i], -1, relevant[i], gesamt[i], untere[i], obere[i]))
+            print(f"   ❌ Thema '{werte[i]}': -1 ({int(relevant[i]/gesamt[i]*100)}%, Wilson ≤{int(obere[i]*100)}%)")
     
     print(f"\n✅ {len(regeln)} Regeln generiert!")
     return regeln
 
 
-def generiere_learning_rules_py(regeln):
+def generiere_user_boosts(user_matrix, max_regeln=MAX_USER_REGELN):
+    """
+    Kompiliert Per-User Boost-Tabellen aus der User × Term Matrix
+    
+    Wilson-Grenzen werden einmal vektorisiert über alle belegten Matrix-Einträge
+    berechnet - gleiche Schwellen wie die Team-Regeln. Themen werden wie im
+    Team-Table auf alle Begriffe der Kategorie expandiert.
+    Returns: {nutzer_id: {keyword: boost}}
+    """
+    users, terme = user_matrix['users'], user_matrix['terme']
+    gesamt = (user_matrix['relevant'] + user_matrix['nicht_relevant']).tocoo()
+    if gesamt.nnz == 0:
+        return {}
+    
+    relevant = np.asarray(user_matrix['relevant'][gesamt.row, gesamt.col]).ravel()
+    untere, obere = wilson_grenzen(relevant, gesamt.data)
+    genug = gesamt.data >= MIN_BEWERTUNGEN_USER
+    positiv = genug & (untere >= RELEVANT_SCHWELLE)
+    negativ = genug & ~positiv & (obere <= IRRELEVANT_SCHWELLE)
+    aktion = np.where(positiv, np.where(untere >= STARK_RELEVANT_SCHWELLE, 2, 1), -1)
+    
+    user_boosts = defaultdict(dict)
+    treffer = np.flatnonzero(positiv | negativ)
+    # Pro User die am häufigsten bewerteten Terme zuerst
+    for i in treffer[np.lexsort((-gesamt.data[treffer], gesamt.row[treffer]))]:
+        user = users[gesamt.row[i]]
+        if len(user_boosts[user]) >= max_regeln:
+            continue
+        term = terme[gesamt.col[i]]
+        if term.startswith('thema:'):
+            for begriff in THEMEN_KEYWORDS.get(term[6:], []):
+                user_boosts[user].setdefault(begriff, int(aktion[i]))
+        else:
+            user_boosts[user][term] = int(aktion[i])
+    
+    print(f"\n👤 PER-USER BOOSTS: {len(user_boosts)} User, "
+          f"{sum(len(b) for b in user_boosts.values())} Einträge "
+          f"(Matrix {len(users)}×{len(terme)}, {gesamt.nnz} belegt)")
+    for user, boosts in sorted(user_boosts.items()):
+        print(f"   {user}: {len(boosts)} Boosts")
+    
+    return dict(user_boosts)
+
+
+def generiere_learning_rules_py(regeln, user_boosts=None):
     """
     Generiert learning_rules.py im Dictionary-Format
     Kompatibel mit medien_newsletter_web.py
     
     WICHTIG: Enthält NUR content-basierte Regeln (Keywords, Themen)
     KEINE quellen-basierten Regeln!
+    Per-User Boosts (user_keyword_boosts) stehen neben der Team-Tabelle,
+    geschlüsselt nach pseudonymer Nutzer-ID - nie nach Email.
     """
     try:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -392,6 +777,13 @@ def generiere_learning_rules_py(regeln):
         for keyword, boost in keyword_boosts.items():
             keyword_lines.append(f"        '{keyword}': {boost},")
         
+        user_lines = []
+        for user, boosts in sorted((user_boosts or {}).items()):
+            user_lines.append(f"        '{user}': {{")
+            for keyword, boost in boosts.items():
+                user_lines.append(f"            '{keyword}': {boost},")
+            user_lines.append("        },")
+        
         code = f"""#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 \"\"\"
@@ -413,12 +805,18 @@ LEARNING_RULES = {{
     }},
     'keyword_boosts': {{
 {chr(10).join(keyword_lines) if keyword_lines else "        # Noch keine Keywords gelernt"}
+    }},
+    'user_keyword_boosts': {{
+        # Per-User Boosts unter pseudonymer Nutzer-ID (newsletter_nutzer.py),
+        # überschreiben Team-Boosts für diesen Empfänger
+{chr(10).join(user_lines) if user_lines else "        # Noch keine User-Präferenzen gelernt"}
     }}
 }}
 
 # Statistik
 ANZAHL_QUELLEN = 0  # Quellen werden nicht mehr bewertet
 ANZAHL_KEYWORDS = {len(keyword_boosts)}
+ANZAHL_USER = {len(user_boosts or {})}
 ANZAHL_REGELN_GESAMT = {len(regeln)}
 """
         
@@ -429,6 +827,7 @@ ANZAHL_REGELN_GESAMT = {len(regeln)}
         print(f"\n✅ learning_rules.py erfolgreich erstellt!")
         print(f"   Quellen-Boosts: 0 (DEAKTIVIERT)")
         print(f"   Keyword-Boosts: {len(keyword_boosts)}")
+        print(f"   User-Tabellen: {len(user_boosts or {})}")
         print(f"   Gesamt: {len(keyword_boosts)} anwendbare Regeln (content-basiert)")
         
     except Exception as e:
@@ -442,90 +841,89 @@ ANZAHL_REGELN_GESAMT = {len(regeln)}
 # ============================================================================
 
 def main():
-    """Hauptfunktion"""
+    """Hauptfunktion - mit NEWSLETTER_PROFIL=1 unter CPU- und Speicher-Profiling (newsletter_profil.py)"""
+    starte_profil('analyse', datetime.now().strftime('%Y-%m-%d'))
+    try:
+        wochen_analyse()
+    finally:
+        beende_profil()
+
+
+def wochen_analyse():
     print("\n" + "="*70)
     print("🤖 ZOO MEDIEN NEWSLETTER - VERBESSERTE WÖCHENTLICHE ANALYSE")
     print("="*70)
     
-    if not SUPABASE_AVAILABLE:
-        print("❌ Supabase nicht installiert!")
-        return
-    
-    # Supabase Client
-    supabase = get_supabase_client()
+    if not NUTZER_SCHLUESSEL:
+        print("⚠️ NEWSLETTER_NUTZER_SCHLUESSEL fehlt - keine Per-User Boosts (nur Team-Regeln)")
     
-    # Bewertungen abrufen
-    bewertungen, start, ende = hole_bewertungen_letzte_woche(supabase)
+    # Aggregat-Quelle (Stream, Supabase RPC oder lokale SQLite-DB)
+    aggregat_quelle = waehle_aggregat_quelle()
+    if aggregat_quelle is None:
+        return
     
-    if len(bewertungen) < MIN_BEWERTUNGEN_GESAMT:
-        print(f"\n⚠️ Zu wenig Bewertungen ({len(bewertungen)}) für eine Analyse")
+    # Tages-Aggregate laden und nur neue Bewertungen nachladen
+    with profil_stufe('aggregate'):
+        aggregate = lade_aggregate()
+        if aktualisiere_aggregate(aggregat_quelle, aggregate):
+            speichere_aggregate(aggregate)
+    
+    # Zeitfenster aus den Tages-Aggregaten zusammenführen
+    with profil_stufe('fenster'):
+        stats, anzahl, start, ende = merge_fenster(aggregate)
+    fenster_info = f"{ANALYSE_FENSTER_TAGE} Tage"
+    if ANALYSE_HALBWERTSZEIT_TAGE:
+        fenster_info += f", Halbwertszeit {ANALYSE_HALBWERTSZEIT_TAGE:g} Tage"
+    print(f"\n📊 {anzahl} Bewertungen im Fenster ({start} bis {ende}, {fenster_info})")
+    
+    if anzahl < MIN_BEWERTUNGEN_GESAMT:
+        print(f"\n⚠️ Zu wenig Bewertungen ({anzahl}) für eine Analyse")
         print(f"   Minimum: {MIN_BEWERTUNGEN_GESAMT} Bewertungen")
         print("   Warte bis nächste Woche!")
         return
     
     print(f"✅ Genug Daten vorhanden - starte Analyse!")
     
-    # Analysen durchführen
+    # Analysen liegen bereits als Zähler vor
     print("\n📊 FÜHRE ANALYSEN DURCH...")
-    quellen_stats = analysiere_nach_quelle(bewertungen)
-    keyword_stats = analysiere_nach_keywords(bewertungen)
-    paar_stats = analysiere_keyword_paare(bewertungen)
-    kombi_stats = analysiere_quelle_keyword_kombis(bewertungen)
-    themen_stats = analysiere_themen(bewertungen)
-    
-    # User-spezifische Analyse (informativ, wird nicht für Regeln verwendet)
-    user_stats = analysiere_pro_user(bewertungen)
-    
-    # Regeln generieren (TEAM-weit, nicht user-spezifisch)
-    regeln = generiere_regeln(quellen_stats, keyword_stats, paar_stats, kombi_stats, themen_stats)
+    quellen_stats = stats['quellen']
+    keyword_stats = stats['keywords']
+    paar_stats = stats['paare']
+    kombi_stats = stats['kombis']
+    themen_stats = stats['themen']
+    
+    with profil_stufe('regeln'):
+        # User-spezifische Analyse
+        user_stats = analysiere_pro_user(stats['user'])
+        
+        # Regeln generieren (TEAM-weit)
+        regeln = generiere_regeln(quellen_stats, keyword_stats, paar_stats, kombi_stats, themen_stats)
+        
+        # Per-User Boost-Tabellen aus der User × Term Matrix
+        user_boosts = generiere_user_boosts(stats['user_matrix'])
     
     if not regeln:
         print("\n⚠️ Keine Regeln generiert - Schwellenwerte nicht erreicht")
         return
     
     # learning_rules.py generieren
-    generiere_learning_rules_py(regeln)
+    with profil_stufe('schreiben'):
+        generiere_learning_rules_py(regeln, user_boosts)
     
     print("\n" + "="*70)
     print("🎉 ANALYSE ABGESCHLOSSEN!")
     print("="*70)
     print(f"📅 Zeitraum: {start} bis {ende}")
-    print(f"📊 Bewertungen: {len(bewertungen)}")
+    print(f"📊 Bewertungen: {anzahl}")
     print(f"🎓 Regeln: {len(regeln)}")
     print("="*70 + "\n")
 
 
-def analysiere_pro_user(bewertungen):
+def analysiere_pro_user(user_stats):
     """
-    Analysiert Bewertungen pro User separat
+    Zeigt die Bewertungen pro User separat (aus merge_fenster)
     Zeigt unterschiedliche Präferenzen der Team-Mitglieder
     """
-    user_stats = defaultdict(lambda: {
-        'total': 0,
-        'relevant': 0,
-        'nicht_relevant': 0,
-        'top_keywords': defaultdict(int),
-        'top_themen': defaultdict(int)
-    })
-    
-    # Sammle Daten pro User
-    for b in bewertungen:
-        user = b['user_name']
-        user_stats[user]['total'] += 1
-        
-        if b['bewertung'] == 'relevant':
-            user_stats[user]['relevant'] += 1
-            # Extrahiere Keywords für relevante Artikel
-            keywords = extrahiere_keywords(b['artikel_titel'])
-            for kw in keywords[:5]:
-                user_stats[user]['top_keywords'][kw] += 1
-            # Themen
-            themen = kategorisiere_thema(b['artikel_titel'])
-            for thema in themen:
-                user_stats[user]['top_themen'][thema] += 1
-        else:
-            user_stats[user]['nicht_relevant'] += 1
-    
     # Ausgabe
     print("\n👥 USER-SPEZIFISCHE PRÄFERENZEN")
     print("=" * 70)
@@ -545,9 +943,8 @@ def analysiere_pro_user(bewertungen):
             top_th = sorted(stats['top_themen'].items(), key=lambda x: x[1], reverse=True)[:3]
             print(f"  📂 Top Themen: {', '.join([f'{th}({cnt})' for th, cnt in top_th])}")
     
-    print("\n💡 HINWEIS: Aktuelles Learning ist TEAM-weit, nicht user-spezifisch!")
-    print("   → Alle Bewertungen aller User werden zusammen analysiert")
-    print("   → Future: Per-User Learning für personalisierte Newsletter?")
+    print("\n💡 HINWEIS: Team-Regeln nutzen die Bewertungen aller User zusammen")
+    print("   → Per-User Boosts (user_keyword_boosts) personalisieren das Ranking pro Empfänger")
     
     return user_stats
 